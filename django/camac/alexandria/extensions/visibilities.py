@@ -6,6 +6,7 @@ from generic_permissions.visibilities import filter_queryset_for
 
 from camac.instance.filters import CalumaInstanceFilterSet
 from camac.instance.mixins import InstanceQuerysetMixin
+from camac.instance.utils import visible_instance_ids
 from camac.user.models import Service
 from camac.utils import filters
 
@@ -33,7 +34,8 @@ class CustomVisibility(InstanceQuerysetMixin):
         Take user's group from a custom HTTP header named `X-CAMAC-GROUP` or use
         default group  to retrieve all Camac instance IDs that are accessible.
 
-        Return a list of instance identifiers.
+        Return a list of instance identifiers, or a queryset to be used as
+        subquery (see `visible_instance_ids()`).
         """
         result = getattr(request, "_visibility_instances_cache", None)
         if result is not None:  # pragma: no cover
@@ -46,7 +48,7 @@ class CustomVisibility(InstanceQuerysetMixin):
             request=request,
         )
 
-        instance_ids = list(filtered.qs.values_list("pk", flat=True))
+        instance_ids = visible_instance_ids(filtered.qs)
 
         setattr(request, "_visibility_instances_cache", instance_ids)
         return instance_ids
@@ -136,6 +136,7 @@ def alexandria_setup(
         FileFactory(document=document, modified_by_group=document.modified_by_group)
 
 
+@pytest.mark.parametrize("optimisations_active", [True, False])
 @pytest.mark.parametrize("type", ["document", "file"])
 @pytest.mark.parametrize(
     "role__name,expected",
@@ -165,7 +166,12 @@ def test_document_and_file_visibility(
     expected,
     role,
     type,
+    application_settings,
+    optimisations_active,
 ):
+    application_settings["VISIBILITY_PERFORMANCE_OPTIMISATIONS_ACTIVE"] = (
+        optimisations_active
+    )
     url = reverse(f"{type}-list")
 
     if type == "file":
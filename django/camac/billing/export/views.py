@@ -1,5 +1,3 @@
-import django_excel as excel
-from rest_framework.exceptions import ErrorDetail
 from rest_framework.generics import ListAPIView
 from rest_framework.renderers import BaseRenderer
 from rest_framework.settings import api_settings
@@ -11,15 +9,17 @@ from camac.billing.filters import (
 )
 from camac.billing.models import BillingV2Entry
 from camac.billing.serializers import BillingV2EntryExportSerializer
+from camac.export import StreamingExportResponse, get_file_format, serializer_rows
 from camac.instance.mixins import InstanceQuerysetMixin
 
 
 class XLSXRenderer(jsonapi_renderers.JSONRenderer, BaseRenderer):
     """
-    Excel output renderer for the REST framework.
+    Excel renderer for the REST framework.
 
-    This formats the data into an Excel table (instead of JSON for example) as part
-    of the regular REST framework infrastructure.
+    The export itself is streamed by the view (see `StreamingExportResponse`),
+    this renderer is only used for content negotiation and renders errors as
+    JSON.
 
     Use this by setting `renderer_classes = [XLSXRenderer]` in your view class.
     """
@@ -28,29 +28,7 @@ class XLSXRenderer(jsonapi_renderers.JSONRenderer, BaseRenderer):
     format = "xlsx"
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
-        view = renderer_context["view"]
-        serializer = view.get_serializer()
-        fields = serializer.get_fields()
-        columns = list(fields)
-
-        is_error = False
-        try:
-            is_error = (
-                isinstance(data[0]["detail"], ErrorDetail) if len(data) else False
-            )
-        except KeyError:
-            pass
-
-        if is_error:
-            return super().render(data)
-
-        header = [field.label or name for name, field in fields.items()]
-
-        rows = [[row[col] for col in columns] for row in data]
-
-        sheet = excel.pe.Sheet([header] + rows)
-
-        return excel.make_response(sheet, file_type="xlsx", file_name="list.xlsx")
+        return super().render(data)
 
 
 class BillingV2EntryExportView(InstanceQuerysetMixin, ListAPIView):
@@ -69,3 +47,11 @@ class BillingV2EntryExportView(InstanceQuerysetMixin, ListAPIView):
 
     def get_queryset_for_public(self):
         return self.queryset.none()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        return StreamingExportResponse(
+            serializer_rows(self.get_serializer(), queryset),
+            file_format=get_file_format(request),
+        )
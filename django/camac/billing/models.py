@@ -1,4 +1,59 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+class BillingV2EntryQuerySet(models.QuerySet):
+    def _total_aggregates(self):
+        aggregates = {}
+
+        for organization in [
+            *[key for key, _ in BillingV2Entry.ORGANIZATION_CHOICES],
+            "all",
+        ]:
+            condition = Q() if organization == "all" else Q(organization=organization)
+
+            for key, filters in [
+                ("total", condition),
+                ("uncharged", condition & Q(date_charged__isnull=True)),
+            ]:
+                aggregates[f"{organization}__{key}"] = Coalesce(
+                    Sum("final_rate", filter=filters or None),
+                    Value(Decimal(0)),
+                    output_field=BillingV2Entry._meta.get_field("final_rate"),
+                )
+
+        return aggregates
+
+    def _nest_totals(self, row):
+        totals = {}
+
+        for key, value in row.items():
+            organization, _, total = key.partition("__")
+            if total:
+                totals.setdefault(organization, {})[total] = value
+
+        return totals
+
+    def totals(self):
+        """Total and uncharged total per organization and over all entries.
+
+        The totals are calculated in a single aggregation query. Entries
+        without a final rate are ignored, entries without an organization are
+        only included in the totals of "all".
+        """
+        return self._nest_totals(self.order_by().aggregate(**self._total_aggregates()))
+
+    def totals_by(self, field):
+        """Totals (see `totals`) per value of `field`, e.g. per instance."""
+        return {
+            row.pop(field): self._nest_totals(row)
+            for row in self.order_by()
+            .values(field)
+            .annotate(**self._total_aggregates())
+        }
 
 
 class BillingV2Entry(models.Model):
@@ -31,6 +86,8 @@ class BillingV2Entry(models.Model):
         "blank": True,
     }
 
+    objects = BillingV2EntryQuerySet.as_manager()
+
     # Structural: Which instance is the item billed to?
     instance = models.ForeignKey("instance.Instance", models.CASCADE, related_name="+")
 
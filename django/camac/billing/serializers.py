@@ -55,9 +55,8 @@ class BillingV2EntrySerializer(serializers.ModelSerializer):
         if many:
             view = self.context.get("view")
             filtered_results = view.filter_queryset(view.get_queryset())
-            ordered = list(filtered_results.values())
 
-            return {"totals": get_totals(ordered)}
+            return {"totals": get_totals(filtered_results)}
 
         return {}
 
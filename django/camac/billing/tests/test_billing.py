@@ -1,4 +1,3 @@
-from collections import OrderedDict
 from decimal import Decimal
 
 import pytest
@@ -69,41 +68,33 @@ def test_add_taxes_to_final_rate():
     assert empty is None
 
 
-def test_get_totals():
+def test_get_totals(db, billing_v2_entry_factory, instance_factory):
+    instance, other_instance = instance_factory.create_batch(2)
     entries = [
-        {
-            "final_rate": "210.05",
-            "organization": BillingV2Entry.MUNICIPAL,
-            "date_charged": None,
-        },
-        {
-            "final_rate": "999.75",
-            "organization": BillingV2Entry.MUNICIPAL,
-            "date_charged": "2023-11-04",
-        },
-        {
-            "final_rate": "12.50",
-            "organization": BillingV2Entry.CANTONAL,
-            "date_charged": None,
-        },
-        {
-            "final_rate": "120.90",
-            "organization": BillingV2Entry.CANTONAL,
-            "date_charged": "2023-11-04",
-        },
-        {
-            "final_rate": "89.25",
-            "organization": None,
-            "date_charged": None,
-        },
-        {
-            "final_rate": "175.55",
-            "organization": None,
-            "date_charged": "2023-11-04",
-        },
+        ("210.05", BillingV2Entry.MUNICIPAL, None),
+        ("999.75", BillingV2Entry.MUNICIPAL, "2023-11-04"),
+        ("12.50", BillingV2Entry.CANTONAL, None),
+        ("120.90", BillingV2Entry.CANTONAL, "2023-11-04"),
+        ("89.25", None, None),
+        ("175.55", None, "2023-11-04"),
     ]
 
-    totals = get_totals([OrderedDict(e) for e in entries])
+    for final_rate, organization, date_charged in entries:
+        billing_v2_entry_factory(
+            instance=instance,
+            final_rate=Decimal(final_rate),
+            organization=organization,
+            date_charged=date_charged,
+        )
+
+    billing_v2_entry_factory(
+        instance=other_instance,
+        final_rate=Decimal("10.00"),
+        organization=BillingV2Entry.CANTONAL,
+    )
+    billing_v2_entry_factory(instance=other_instance, final_rate=None)
+
+    totals = get_totals(BillingV2Entry.objects.filter(instance=instance))
 
     assert totals == {
         "municipal": {"uncharged": "210.05", "total": "1209.80"},
@@ -111,6 +102,33 @@ def test_get_totals():
         "all": {"uncharged": "311.80", "total": "1608.00"},
     }
 
+    assert get_totals(BillingV2Entry.objects.none()) == {
+        "municipal": {"uncharged": "0.00", "total": "0.00"},
+        "cantonal": {"uncharged": "0.00", "total": "0.00"},
+        "all": {"uncharged": "0.00", "total": "0.00"},
+    }
+
+
+def test_totals_by_instance(
+    db, billing_v2_entry_factory, instance_factory, django_assert_num_queries
+):
+    instances = instance_factory.create_batch(3)
+
+    for instance in instances:
+        billing_v2_entry_factory.create_batch(
+            2,
+            instance=instance,
+            final_rate=Decimal("5.50"),
+            organization=BillingV2Entry.MUNICIPAL,
+        )
+
+    with django_assert_num_queries(1):
+        totals = BillingV2Entry.objects.totals_by("instance")
+
+    assert set(totals) == {instance.pk for instance in instances}
+    assert totals[instances[0].pk]["municipal"]["total"] == Decimal("11.00")
+    assert totals[instances[0].pk]["cantonal"]["total"] == Decimal("0")
+
 
 @pytest.mark.parametrize(
     "role__name,expected_status,expected_count",
@@ -1,3 +1,5 @@
+import csv
+import io
 from functools import partial
 
 import pyexcel
@@ -107,8 +109,10 @@ def test_billing_export(
     response = admin_client.get(url, query_params)
 
     assert response.status_code == status.HTTP_200_OK
-    book = pyexcel.get_book(file_content=response.content, file_type="xlsx")
-    sheet = book.get_dict()["pyexcel sheet"]
+    book = pyexcel.get_book(
+        file_content=b"".join(response.streaming_content), file_type="xlsx"
+    )
+    sheet = book.get_dict()["list"]
     assert len(sheet) - 1 == expected_count  # substract header row
     if len(sheet) > 1:
         data = sheet[1]
@@ -117,6 +121,25 @@ def test_billing_export(
         snapshot.assert_match(data)
 
 
+@pytest.mark.parametrize("role__name", ["Municipality"])
+def test_billing_export_csv(
+    admin_client, billing_v2_entry_factory, instance_with_document_for_billing
+):
+    instance, _ = instance_with_document_for_billing
+    billing_v2_entry_factory.create_batch(2, instance=instance)
+
+    url = reverse("billing-export")
+    response = admin_client.get(url, {"instance": instance.pk, "file-format": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/csv")
+    content = b"".join(response.streaming_content).decode()
+    assert len(list(csv.reader(io.StringIO(content)))) == 3  # header and entries
+
+    response = admin_client.get(url, {"instance": instance.pk, "file-format": "pdf"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.fixture
 def instance_with_document_for_billing(
     instance,
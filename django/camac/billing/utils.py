@@ -1,6 +1,7 @@
-from collections import OrderedDict
 from decimal import Decimal
-from typing import List, TypedDict, Union
+from typing import TypedDict, Union
+
+from django.db.models import QuerySet
 
 from camac.billing.models import BillingV2Entry
 
@@ -68,62 +69,14 @@ def add_taxes_to_final_rate(
     return round_decimal(final_rate + final_rate * tax_rate / Decimal(100))
 
 
-def get_totals(entries: List[OrderedDict]) -> BillingTotals:
-    """Get totals for a list of billing entries.
+def get_totals(entries: QuerySet) -> BillingTotals:
+    """Get totals for a queryset of billing entries.
 
     This will return a dict of totals per organization type and over all
     organizations (including entries without an organization).
     """
 
-    totals = {}
-
-    for key, _ in BillingV2Entry.ORGANIZATION_CHOICES:
-        totals[key] = get_totals_for_organization(entries, key)
-
-    totals["all"] = get_totals_for_organization(entries)
-
-    return totals
-
-
-def get_totals_for_organization(
-    entries: List[OrderedDict], organization: Union[str, None] = None
-) -> OrganizationTotals:
-    """Calculate total including uncharged total for an organization."""
-
-    filtered_entries = [
-        entry
-        for entry in entries
-        if not organization or entry["organization"] == organization
-    ]
-
     return {
-        "uncharged": str(
-            round_decimal(
-                Decimal(
-                    sum(
-                        [
-                            Decimal(entry["final_rate"])
-                            for entry in filtered_entries
-                            if entry["date_charged"] is None
-                            and entry["final_rate"]
-                            is not None  # Don't ignore entry when final_rate is 0
-                        ]
-                    )
-                )
-            )
-        ),
-        "total": str(
-            round_decimal(
-                Decimal(
-                    sum(
-                        [
-                            Decimal(entry["final_rate"])
-                            for entry in filtered_entries
-                            if entry["final_rate"]
-                            is not None  # Don't ignore entry when final_rate is 0
-                        ]
-                    )
-                )
-            )
-        ),
+        organization: {key: str(round_decimal(value)) for key, value in totals.items()}
+        for organization, totals in entries.totals().items()
     }
@@ -299,7 +299,7 @@ class Landowners(BaseDataSource):
 
     def _get_data(self, instance_id):
         case = Case.objects.get(instance__pk=instance_id)
-        master_data = MasterData(case)
+        master_data = MasterData.for_case(case)
 
         people = master_data.landowners
 
@@ -23,6 +23,7 @@ from caluma.caluma_workflow.events import (
     pre_complete_work_item,
 )
 from caluma.caluma_workflow.models import Task, Workflow, WorkItem
+from django.apps import apps
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
@@ -41,7 +42,8 @@ from camac.ech0211.signals import (
     circulation_started,
     task_send,
 )
-from camac.notification.utils import send_mail_without_request
+from camac.instance.models import Instance
+from camac.outbox import api as outbox
 from camac.permissions.events import Trigger
 from camac.user.models import Service, User
 
@@ -52,19 +54,52 @@ def send_inquiry_notification(settings_key, inquiry_work_item, user):
     notification_config = settings.DISTRIBUTION["NOTIFICATIONS"].get(settings_key)
 
     if notification_config:
-        send_mail_without_request(
-            notification_config["template_slug"],
-            user.username,
-            user.camac_group,
-            instance={
-                "id": inquiry_work_item.case.family.instance.pk,
-                "type": "instances",
+        instance = inquiry_work_item.case.family.instance
+
+        outbox.enqueue(
+            "camac.notification.utils.send_mail_without_request",
+            {
+                "slug": notification_config["template_slug"],
+                "username": user.username,
+                "group_id": user.camac_group,
+                "instance": {"id": instance.pk, "type": "instances"},
+                "inquiry": {"id": str(inquiry_work_item.pk), "type": "work-items"},
+                "recipient_types": notification_config["recipient_types"],
             },
-            inquiry={"id": inquiry_work_item.pk, "type": "work-items"},
-            recipient_types=notification_config["recipient_types"],
+            instance=instance,
         )
 
 
+def send_ech_task(sender, instance_id, user_pk, group_pk, inquiry_id):
+    """Outbox handler which sends the eCH-0211 task of an inquiry."""
+    task_send.send(
+        sender=sender,
+        instance=Instance.objects.get(pk=instance_id),
+        user_pk=user_pk,
+        group_pk=group_pk,
+        inquiry=WorkItem.objects.get(pk=inquiry_id),
+    )
+
+
+def send_ech_accompanying_report(
+    sender, instance_id, user_pk, group_pk, inquiry_id, documents=None
+):
+    """Outbox handler which sends the eCH-0211 accompanying report of an inquiry."""
+    if documents:
+        documents = apps.get_model(documents["model"]).objects.filter(
+            pk__in=documents["pks"]
+        )
+
+    accompanying_report_send.send(
+        sender=sender,
+        instance=Instance.objects.get(pk=instance_id),
+        user_pk=user_pk,
+        group_pk=group_pk,
+        inquiry=WorkItem.objects.get(pk=inquiry_id),
+        documents=documents,
+    )
+
+
 def get_distribution_settings(settings_keys):
     return filter(
         None,
@@ -400,12 +435,16 @@ def post_resume_inquiry(sender, work_item, user, context=None, **kwargs):
 
     if settings.ECH0211.get("API_LEVEL") == "full":
         camac_user = User.objects.get(username=user.username)
-        task_send.send(
-            sender="post_resume_inquiry",
+        outbox.enqueue(
+            "camac.caluma.extensions.events.distribution.send_ech_task",
+            {
+                "sender": "post_resume_inquiry",
+                "instance_id": work_item.case.family.instance.pk,
+                "user_pk": camac_user.pk,
+                "group_pk": user.camac_group,
+                "inquiry_id": str(work_item.pk),
+            },
             instance=work_item.case.family.instance,
-            user_pk=camac_user.pk,
-            group_pk=user.camac_group,
-            inquiry=work_item,
         )
 
 
@@ -493,13 +532,27 @@ def post_complete_inquiry(sender, work_item, user, context=None, **kwargs):
 
     if settings.ECH0211.get("API_LEVEL") == "full":
         camac_user = User.objects.get(username=user.username)
-        accompanying_report_send.send(
-            sender="post_complete_inquiry",
+        documents = context.get("documents") if context else None
+        outbox.enqueue(
+            "camac.caluma.extensions.events.distribution.send_ech_accompanying_report",
+            {
+                "sender": "post_complete_inquiry",
+                "instance_id": work_item.case.family.instance.pk,
+                "user_pk": camac_user.pk,
+                "group_pk": user.camac_group,
+                "inquiry_id": str(work_item.pk),
+                "documents": (
+                    {
+                        "model": documents.model._meta.label,
+                        "pks": [
+                            str(pk) for pk in documents.values_list("pk", flat=True)
+                        ],
+                    }
+                    if documents
+                    else None
+                ),
+            },
             instance=work_item.case.family.instance,
-            user_pk=camac_user.pk,
-            group_pk=user.camac_group,
-            inquiry=work_item,
-            documents=context.get("documents") if context else None,
         )
 
     if settings.APPLICATION_NAME == "kt_uri":  # pragma: no cover
@@ -126,7 +126,8 @@ def distribution_permission_for(
                         .get(configured_value_name, lambda *_: True)
                     )
 
-                    group = CamacRequest(info).request.group
+                    camac_request = getattr(info.context, "camac_request", None)
+                    group = (camac_request or CamacRequest(info).request).group
 
                     try:
                         return permissions_predicate(group, value, mutation, info)
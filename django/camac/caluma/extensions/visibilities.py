@@ -14,6 +14,7 @@ from camac.caluma.utils import CamacRequest, visible_inquiries_expression
 from camac.constants.kt_bern import DASHBOARD_FORM_SLUG
 from camac.instance.filters import CalumaInstanceFilterSet
 from camac.instance.mixins import InstanceQuerysetMixin
+from camac.instance.utils import visible_instance_ids
 from camac.user.models import Role
 from camac.user.permissions import permission_aware
 from camac.utils import filters, order
@@ -266,20 +267,16 @@ class CustomVisibility(Authenticated, InstanceQuerysetMixin):
         if result is not None:  # pragma: no cover
             return result
 
-        instance_ids = self._visible_instances_qs(info)
+        qs = self._visible_instances_qs(info)
 
-        # For performance reasons we return the instance_ids as a list
-        # if we are in single_instance_mode. Otherwise we return a queryset
-        # which will be evaluated later and result in a subquery during query execution
+        # Unless we're in single_instance_mode, the visible instances are
+        # returned as a queryset which results in a subquery during query
+        # execution (see `visible_instance_ids()`).
         # Note: If the total amount of instances is less than a few thousand, this optimization
         # is not helping much (in fact, it potentially slows down list queries a little bit).
-        # Currently this is only used for Kt. Uri.
-        if getattr(
-            instance_ids, "_single_instance_mode", False
-        ) or not settings.APPLICATION.get(
-            "VISIBILITY_PERFORMANCE_OPTIMISATIONS_ACTIVE"
-        ):
-            instance_ids = list(instance_ids.values_list("pk", flat=True))
+        instance_ids = visible_instance_ids(
+            qs, materialize=getattr(qs, "_single_instance_mode", False)
+        )
 
         setattr(info.context, "_visibility_instances_cache", instance_ids)
         return instance_ids
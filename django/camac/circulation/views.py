@@ -1,4 +1,5 @@
-import django_excel
+from collections import defaultdict
+
 from django.conf import settings
 from django.db import transaction
 from django.db.models import OuterRef, Subquery
@@ -8,6 +9,7 @@ from rest_framework.settings import api_settings
 from rest_framework_json_api import views
 
 from camac.core.models import Activation, Circulation, CirculationState
+from camac.export import StreamingExportResponse, get_file_format, iterate_chunks
 from camac.instance.filters import FormFieldOrdering
 from camac.instance.mixins import InstanceEditableMixin, InstanceQuerysetMixin
 from camac.instance.models import FormField
@@ -146,13 +148,8 @@ class ActivationView(InstanceQuerysetMixin, views.ReadOnlyModelViewSet):
 
         queryset = self.filter_queryset(queryset)
 
-        def applicant_names(activation):
-            overrides = FormField.objects.filter(
-                instance=activation.circulation.instance,
-                name="projektverfasser-planer-override",
-            ).values("value")
-
-            applicants = overrides if len(overrides) else (activation.applicants or [])
+        def applicant_names(activation, overrides):
+            applicants = overrides or activation.applicants or []
 
             return ", ".join(
                 [
@@ -161,27 +158,31 @@ class ActivationView(InstanceQuerysetMixin, views.ReadOnlyModelViewSet):
                 ]
             )
 
-        content = [
-            [
-                activation.circulation.instance.pk,
-                activation.circulation.instance.identifier,
-                activation.circulation.instance.form.description,
-                (
-                    activation.circulation.instance.location
-                    and activation.circulation.instance.location.name
-                ),
-                applicant_names(activation),
-                activation.description,
-                activation.reason,
-                activation.circulation.instance.instance_state.name,
-                activation.circulation.instance.instance_state.description,
-                activation.deadline_date.strftime("%d.%m.%Y"),
-                activation.circulation_state.name,
-            ]
-            for activation in queryset
-        ]
-
-        sheet = django_excel.pe.Sheet(content)
-        return django_excel.make_response(
-            sheet, file_type="xlsx", file_name="list.xlsx"
-        )
+        def rows():
+            for chunk in iterate_chunks(queryset):
+                overrides = defaultdict(list)
+                for field in FormField.objects.filter(
+                    instance__in={
+                        activation.circulation.instance_id for activation in chunk
+                    },
+                    name="projektverfasser-planer-override",
+                ).values("instance_id", "value"):
+                    overrides[field.pop("instance_id")].append(field)
+
+                for activation in chunk:
+                    instance = activation.circulation.instance
+                    yield [
+                        instance.pk,
+                        instance.identifier,
+                        instance.form.description,
+                        instance.location and instance.location.name,
+                        applicant_names(activation, overrides[instance.pk]),
+                        activation.description,
+                        activation.reason,
+                        instance.instance_state.name,
+                        instance.instance_state.description,
+                        activation.deadline_date.strftime("%d.%m.%Y"),
+                        activation.circulation_state.name,
+                    ]
+
+        return StreamingExportResponse(rows(), file_format=get_file_format(request))
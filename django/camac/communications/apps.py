@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CommunicationsConfig(AppConfig):
     name = "camac.communications"
+
+    def ready(self):
+        import camac.communications.signals  # noqa
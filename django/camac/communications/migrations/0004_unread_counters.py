@@ -0,0 +1,70 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:20
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_UNREAD_COUNTERS = """
+INSERT INTO communications_communicationsunreadcounter (topic_id, entity, count)
+SELECT topic.id, entities.entity, COUNT(message.id) FILTER (
+    WHERE NOT EXISTS (
+        SELECT 1 FROM communications_communicationsreadmarker marker
+        WHERE marker.message_id = message.id AND marker.entity = entities.entity
+    )
+)
+FROM communications_communicationstopic topic
+CROSS JOIN LATERAL unnest(topic.involved_entities) AS entities(entity)
+LEFT JOIN communications_communicationsmessage message
+    ON message.topic_id = topic.id
+GROUP BY topic.id, entities.entity
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("communications", "0003_alter_communicationsreadmarker_unique_together"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="communicationstopic",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["involved_entities"], name="communications_topic_entities"
+            ),
+        ),
+        migrations.CreateModel(
+            name="CommunicationsUnreadCounter",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entity", models.CharField(max_length=50)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "topic",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="unread_counters",
+                        to="communications.communicationstopic",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("topic", "entity")},
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("count__gt", 0)),
+                        fields=["entity"],
+                        name="communications_unread_entity",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(POPULATE_UNREAD_COUNTERS, migrations.RunSQL.noop),
+    ]
@@ -3,6 +3,7 @@ import os.path
 from alexandria.core.api import make_signature_components
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.urls import reverse
 
@@ -33,6 +34,62 @@ class CommunicationsTopic(models.Model):
     involved_entities = ArrayField(models.CharField(max_length=50), blank=True)
     initiated_by_entity = models.CharField(max_length=50)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=["involved_entities"], name="communications_topic_entities")
+        ]
+
+
+class CommunicationsUnreadCounter(models.Model):
+    """Number of messages in a topic which an entity has not read yet.
+
+    Maintained by `update_unread_counters`, which is called whenever messages
+    are sent, read or unread.
+    """
+
+    topic = models.ForeignKey(
+        CommunicationsTopic, on_delete=models.CASCADE, related_name="unread_counters"
+    )
+    entity = models.CharField(max_length=50)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = (("topic", "entity"),)
+        indexes = [
+            models.Index(
+                fields=["entity"],
+                condition=models.Q(count__gt=0),
+                name="communications_unread_entity",
+            )
+        ]
+
+
+def update_unread_counters(topic, entities=None):
+    """Recount the unread messages of the given entities in the topic.
+
+    Without entities, the counters of all involved entities are recounted
+    and the ones of no longer involved entities removed.
+    """
+    if entities is None:
+        entities = topic.involved_entities
+        topic.unread_counters.exclude(
+            entity__in=[str(entity) for entity in entities]
+        ).delete()
+
+    CommunicationsUnreadCounter.objects.bulk_create(
+        [
+            CommunicationsUnreadCounter(
+                topic=topic,
+                entity=str(entity),
+                count=topic.messages.exclude(read_by__entity=str(entity)).count(),
+            )
+            for entity in entities
+        ],
+        update_conflicts=True,
+        unique_fields=["topic", "entity"],
+        update_fields=["count"],
+    )
+
 
 class CommunicationsReadMarker(models.Model):
     read_at = models.DateTimeField(auto_now_add=True)
@@ -66,8 +123,18 @@ class CommunicationsMessage(models.Model):
         """
         # created_at__lte=self.created_at includes self, so no
         # explicit marking for "self"
-        for message in self.topic.messages.filter(created_at__lte=self.created_at):
-            message.read_by.get_or_create(entity=entity)
+        unread_messages = self.topic.messages.filter(
+            created_at__lte=self.created_at
+        ).exclude(read_by__entity=entity)
+
+        CommunicationsReadMarker.objects.bulk_create(
+            [
+                CommunicationsReadMarker(message=message, entity=entity)
+                for message in unread_messages
+            ],
+            ignore_conflicts=True,
+        )
+        update_unread_counters(self.topic, [entity])
 
 
 def attachment_path_directory_path(attachment, filename):
@@ -0,0 +1,46 @@
+from django.db.models import QuerySet, signals
+from django.dispatch import receiver
+
+from .models import (
+    CommunicationsMessage,
+    CommunicationsReadMarker,
+    CommunicationsTopic,
+    update_unread_counters,
+)
+
+
+def _is_deleted_directly(origin, model):
+    # objects deleted as a cascade of e.g. their topic don't need recounting
+    return isinstance(origin, model) or (
+        isinstance(origin, QuerySet) and origin.model is model
+    )
+
+
+@receiver(signals.post_save, sender=CommunicationsTopic)
+def update_topic_unread_counters(sender, instance, **kwargs):
+    if not kwargs.get("raw"):
+        update_unread_counters(instance)
+
+
+@receiver(signals.post_save, sender=CommunicationsMessage)
+def update_message_unread_counters(sender, instance, created, **kwargs):
+    if created and not kwargs.get("raw"):
+        update_unread_counters(instance.topic)
+
+
+@receiver(signals.post_delete, sender=CommunicationsMessage)
+def update_deleted_message_unread_counters(sender, instance, origin=None, **kwargs):
+    if _is_deleted_directly(origin, CommunicationsMessage):
+        update_unread_counters(instance.topic)
+
+
+@receiver(signals.post_save, sender=CommunicationsReadMarker)
+def update_read_marker_unread_counters(sender, instance, created, **kwargs):
+    if created and not kwargs.get("raw"):
+        update_unread_counters(instance.message.topic, [instance.entity])
+
+
+@receiver(signals.post_delete, sender=CommunicationsReadMarker)
+def update_deleted_read_marker_unread_counters(sender, instance, origin=None, **kwargs):
+    if _is_deleted_directly(origin, CommunicationsReadMarker):
+        update_unread_counters(instance.message.topic, [instance.entity])
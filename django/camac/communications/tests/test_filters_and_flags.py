@@ -78,6 +78,41 @@ def test_topic_filter_has_unread(
     assert set(received_ids) == set(expected_ids)
 
 
+@pytest.mark.parametrize("role__name", ["Municipality"])
+def test_topic_unread_summary(
+    db,
+    admin_client,
+    be_instance,
+    some_read_and_some_unread_topics,
+    communications_topic_factory,
+    communications_message_factory,
+    instance_service_factory,
+):
+    entities = some_read_and_some_unread_topics[0][0].involved_entities
+
+    # unread message of another visible instance
+    topic = communications_topic_factory(involved_entities=entities)
+    instance_service_factory(
+        instance=topic.instance, service=admin_client.user.groups.first().service
+    )
+    communications_message_factory(topic=topic)
+
+    # unread message of an instance which isn't visible
+    communications_message_factory(topic__involved_entities=entities)
+
+    url = reverse("communications-topic-unread-summary")
+
+    resp = admin_client.get(url)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == {"unread_topics": 3, "unread_messages": 3}
+
+    resp = admin_client.get(url, {"instance": be_instance.pk})
+    assert resp.json() == {"unread_topics": 2, "unread_messages": 2}
+
+    resp = admin_client.get(url, {"instance": "abc"})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.parametrize("role__name", ["Municipality"])
 @pytest.mark.parametrize(
     "filter, expect_set", [(True, "read"), (False, "unread"), (None, "all")]
@@ -123,3 +123,30 @@ def test_attachment_is_replaced(
 )
 def test_attachment_content_type(db, model, expected):
     assert model.content_type == expected
+
+
+def test_unread_counters(
+    db, communications_topic_factory, communications_message_factory
+):
+    topic = communications_topic_factory(involved_entities=["APPLICANT", "1"])
+
+    def counts():
+        return dict(topic.unread_counters.values_list("entity", "count"))
+
+    assert counts() == {"APPLICANT": 0, "1": 0}
+
+    first, second = communications_message_factory.create_batch(2, topic=topic)
+    assert counts() == {"APPLICANT": 2, "1": 2}
+
+    second.mark_as_read_by_entity("1")
+    assert counts() == {"APPLICANT": 2, "1": 0}
+
+    second.read_by.filter(entity="1").delete()
+    assert counts() == {"APPLICANT": 2, "1": 1}
+
+    first.delete()
+    assert counts() == {"APPLICANT": 1, "1": 1}
+
+    topic.involved_entities = ["1"]
+    topic.save()
+    assert counts() == {"1": 1}
@@ -1,7 +1,8 @@
 from alexandria.core.api import verify_signed_components
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Exists, OuterRef
+from django.db.models import Count, Exists, OuterRef, Sum
+from django.db.models.functions import Coalesce
 from django.http import FileResponse
 from django.urls import reverse
 from django.utils.translation import gettext
@@ -9,6 +10,7 @@ from rest_framework import response
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.mixins import CreateModelMixin, ListModelMixin, RetrieveModelMixin
+from rest_framework.renderers import JSONRenderer
 from rest_framework.viewsets import GenericViewSet
 from rest_framework_json_api.views import (
     AutoPrefetchMixin,
@@ -46,11 +48,11 @@ class TopicView(InvolvedInTopicQuerysetMixin, InstanceQuerysetMixin, ModelViewSe
     queryset = models.CommunicationsTopic.objects
 
     def _annotate_has_unread(self, qs):
-        unread_messages = models.CommunicationsMessage.objects.all().exclude(
-            read_by__entity=models.entity_for_current_user(self.request)
+        unread_counters = models.CommunicationsUnreadCounter.objects.filter(
+            entity=models.entity_for_current_user(self.request), count__gt=0
         )
         qs_out = qs.annotate(
-            has_unread=Exists(unread_messages.filter(topic=OuterRef("pk")))
+            has_unread=Exists(unread_counters.filter(topic=OuterRef("pk")))
         )
         return qs_out
 
@@ -65,6 +67,36 @@ class TopicView(InvolvedInTopicQuerysetMixin, InstanceQuerysetMixin, ModelViewSe
         qs = self._annotate_dossier_number(qs)
         return qs
 
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="unread-summary",
+        renderer_classes=[JSONRenderer],
+    )
+    def unread_summary(self, request):
+        """Return the number of unread topics and messages of the entity.
+
+        Only reads the unread counters of the visible topics, so it's cheap
+        enough to be polled. Can be limited to an instance with the `instance`
+        query param.
+        """
+        counters = models.CommunicationsUnreadCounter.objects.filter(
+            entity=models.entity_for_current_user(request),
+            count__gt=0,
+            topic__in=super().get_queryset().values("pk"),
+        )
+
+        if instance := request.query_params.get("instance"):
+            try:
+                counters = counters.filter(topic__instance_id=int(instance))
+            except ValueError:
+                raise ValidationError(gettext("Invalid instance"))
+
+        summary = counters.aggregate(
+            unread_topics=Count("pk"), unread_messages=Coalesce(Sum("count"), 0)
+        )
+        return response.Response(summary)
+
     class Meta:
         model = models.CommunicationsTopic
 
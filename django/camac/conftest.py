@@ -58,6 +58,7 @@ from camac.notification.serializers import (
     PermissionlessNotificationTemplateSendmailSerializer,
 )
 from camac.objection import factories as objection_factories
+from camac.outbox import api as outbox_api
 from camac.permissions import factories as permissions_factories
 from camac.permissions.models import AccessLevel
 from camac.responsible import factories as responsible_factories
@@ -2048,6 +2049,9 @@ def gr_access_levels(gr_permissions_settings, db, access_level_factory, role_fac
 @pytest.fixture(autouse=True)
 def mock_celery(mocker):
     mocker.patch("django.db.transaction.on_commit", side_effect=lambda f: f())
+    mocker.patch(
+        "camac.outbox.api.async_task", side_effect=lambda func: outbox_api.process()
+    )
     mocker.patch(
         "alexandria.core.tasks.set_checksum.delay",
         side_effect=lambda id: alexandria_tasks.set_checksum(id),
@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pyexcel
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.db.models import Q
 
 from camac.user.models import (
@@ -14,6 +15,7 @@ from camac.user.models import (
     ServiceGroup,
     ServiceRelation,
 )
+from camac.user.utils import group_cache
 
 
 class Command(BaseCommand):
@@ -54,6 +56,7 @@ class Command(BaseCommand):
             )
             geometer_groups.update(disabled=1)
             geometer_services.update(disabled=1)
+            transaction.on_commit(group_cache.clear)
 
         if options.get("clear_relations"):
             geometer_relations = ServiceRelation.objects.filter(
@@ -6,6 +6,7 @@ from django.db.models.functions import Replace
 from camac.core.models import Activation
 from camac.document.models import Attachment
 from camac.user.models import Group, Service, ServiceGroup, User, UserGroup
+from camac.user.utils import group_cache
 
 
 class Command(BaseCommand):
@@ -70,6 +71,7 @@ class Command(BaseCommand):
 
         # Disable groups "Gemeinderat interne Pendenz"
         Group.objects.filter(name__contains="interne Pendenz").update(disabled=True)
+        transaction.on_commit(group_cache.clear)
 
         # Delete user group "Gemeinderat interne Pendenz"
         UserGroup.objects.filter(group__name__contains="interne Pendenz").delete()
@@ -17,6 +17,24 @@ def test_max_ebau_nr(db, case_factory, instance_factory, question, chapter):
     assert utils.generate_ebau_nr(None, 2021) == "2021-1"
 
 
+@pytest.mark.freeze_time("2020-10-16")
+def test_reserve_sequence_numbers(db, case_factory):
+    case_factory(meta={"ebau-number": "2020-5"})
+
+    with utils.reserve_sequence_numbers():
+        # numbers handed out before are skipped even though they aren't
+        # committed (here: saved) yet
+        assert utils.generate_ebau_nr(None, 2020) == "2020-6"
+        assert utils.generate_ebau_nr(None, 2020) == "2020-7"
+        assert utils.generate_ebau_nr(None, 2021) == "2021-1"
+
+        case_factory(meta={"ebau-number": "2020-10"})
+        assert utils.generate_ebau_nr(None, 2020) == "2020-11"
+
+    assert utils.generate_ebau_nr(None, 2020) == "2020-11"
+    assert utils.generate_ebau_nr(None, 2020) == "2020-11"
+
+
 @pytest.mark.freeze_time("2020-10-16")
 def test_assign_ebau_nr(
     db,
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+from contextlib import contextmanager
 from functools import wraps
 from typing import TYPE_CHECKING, Callable
 
@@ -39,6 +41,43 @@ def generate_sort_key(special_id: str) -> int:
     return int("".join([*parts, index.zfill(6)]))
 
 
+_reserved_sequence_numbers = None
+_reserved_sequence_numbers_lock = threading.Lock()
+
+
+@contextmanager
+def reserve_sequence_numbers():
+    """Prevent concurrent threads from generating the same sequence number.
+
+    Sequence numbers (e.g. eBau or dossier numbers) are generated by
+    incrementing the highest number in the database, which doesn't contain
+    the numbers of other, not yet committed transactions. While this context
+    is active, the numbers handed out to other threads of this process are
+    skipped as well. This is used by the parallel dossier import.
+    """
+    global _reserved_sequence_numbers
+
+    with _reserved_sequence_numbers_lock:
+        _reserved_sequence_numbers = {}
+    try:
+        yield
+    finally:
+        with _reserved_sequence_numbers_lock:
+            _reserved_sequence_numbers = None
+
+
+def next_sequence_number(sequence: str, last: int) -> int:
+    """Return the number following `last` in the given sequence."""
+    with _reserved_sequence_numbers_lock:
+        if _reserved_sequence_numbers is None:
+            return last + 1
+
+        number = max(last, _reserved_sequence_numbers.get(sequence, 0)) + 1
+        _reserved_sequence_numbers[sequence] = number
+
+        return number
+
+
 def generate_special_id(special_id_key: str, instance, prefix: str) -> str:
     max_increment = (
         Case.objects.exclude(pk=instance.case_id if instance else None)
@@ -58,7 +97,7 @@ def generate_special_id(special_id_key: str, instance, prefix: str) -> str:
         .first()
     ) or 0
 
-    return f"{prefix}{max_increment + 1}"
+    return f"{prefix}{next_sequence_number(special_id_key + prefix, max_increment)}"
 
 
 def generate_ebau_nr(instance, year: int) -> str:
@@ -1,3 +1,4 @@
+import zipfile
 from pathlib import Path
 from uuid import uuid4
 
@@ -5,7 +6,7 @@ import requests
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
 from django.db.models import Exists, F, OuterRef, Q
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.encoding import escape_uri_path, smart_bytes
 from django.utils.module_loading import import_string
 from pyproj import CRS, Transformer
@@ -15,6 +16,7 @@ from rest_framework_json_api import django_filters, filters as json_api_filters
 from rest_framework_json_api.views import ModelViewSet, ReadOnlyModelViewSet
 
 from camac.caluma.api import CalumaApi
+from camac.export import ZipOutput
 from camac.instance.mixins import InstanceQuerysetMixin
 from camac.instance.models import FormField, Instance
 from camac.user.permissions import (
@@ -425,6 +427,68 @@ class SendfileHttpResponse(HttpResponse):
         self["X-Sendfile"] = smart_bytes(str(abs_path))
 
 
+class StreamingZipHttpResponse(StreamingHttpResponse):
+    """
+    Streamed zip archive of the given files.
+
+    The archive is generated on the fly while it's sent to the client, so
+    it never needs to be held in memory (or on disk) as a whole. Files in
+    formats that are already compressed are stored as is, all others are
+    deflated.
+
+    :param filename: Content-Disposition header filename
+    :param files: Iterable of (absolute path, name inside archive) tuples
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    # Deflating those again costs a lot of time for (next to) no gain
+    STORED_EXTENSIONS = {
+        ".7z",
+        ".docx",
+        ".dwg",
+        ".gif",
+        ".gz",
+        ".jpeg",
+        ".jpg",
+        ".mp4",
+        ".pdf",
+        ".png",
+        ".pptx",
+        ".xlsx",
+        ".zip",
+    }
+
+    def __init__(self, filename: str, files):
+        super().__init__(self._generate(files), content_type="application/zip")
+
+        self["Content-Disposition"] = 'attachment; filename="%s"' % escape_uri_path(
+            str(filename)
+        )
+
+    def _generate(self, files):
+        output = ZipOutput()
+
+        with zipfile.ZipFile(output, "w") as archive:
+            for path, arcname in files:
+                info = zipfile.ZipInfo.from_file(path, arcname)
+                info.compress_type = (
+                    zipfile.ZIP_STORED
+                    if Path(path).suffix.lower() in self.STORED_EXTENSIONS
+                    else zipfile.ZIP_DEFLATED
+                )
+
+                with open(path, "rb") as source, archive.open(info, "w") as target:
+                    while chunk := source.read(self.CHUNK_SIZE):
+                        target.write(chunk)
+                        yield output.pop()
+
+                yield output.pop()
+
+        # central directory
+        yield output.pop()
+
+
 class AuthorityView(ReadOnlyModelViewSet):
     """Only used in Kt. UR for 'Leitbehörde'."""
 
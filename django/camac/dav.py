@@ -2,7 +2,6 @@ import os
 from datetime import timedelta
 from logging import getLogger
 from pathlib import Path
-from shutil import copy2
 
 from django.conf import settings
 from django.db import transaction
@@ -139,6 +138,7 @@ def post_write_callback(token):
 @transaction.atomic
 def pre_write_callback(token):
     from camac.base import base36
+    from camac.document.blobs import link_file, store_blob
     from camac.document.models import (
         Attachment,
         AttachmentVersion,
@@ -170,15 +170,19 @@ def pre_write_callback(token):
         path = Path(attachment.path.path)
         name = path.stem
         ext = path.suffix
+        blob = store_blob(path)
         while True:
             suffix = base36.encode(version)
             suffix = suffix.rjust(2, "0")
             new_name = f"{name}_{suffix}{ext}"
             new_path = version_path_directory_path(attachment, new_name)
             version_path = root / new_path
-            if not version_path.exists():  # pragma: no cover
+            version_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                link_file(blob.path, version_path)
                 break
-            version += 1  # pragma: no cover
+            except FileExistsError:  # pragma: no cover
+                version += 1
 
         new = AttachmentVersion(
             name=new_name,
@@ -188,9 +192,8 @@ def pre_write_callback(token):
             created_at=attachment.date,
             created_by_user=attachment.user,
             version=version,
+            blob=blob,
         )
-        version_path.parent.mkdir(parents=True, exist_ok=True)
-        copy2(path, version_path)
         new.save()
         if settings.LOG_FILE_WRITE_SIZES:
             log.info(
@@ -0,0 +1,102 @@
+"""Content addressed storage of attachment versions.
+
+Every distinct content of an attachment version is stored once as a blob
+named after its SHA-256 digest. Version files are hard links to the blob, so
+creating a version of content which was stored before doesn't copy the file
+again.
+
+Attachments themselves are written in place by WebDAV clients, which is why
+blobs are never hard linked to an attachment file but cloned from it (as
+copy-on-write reflink where the file system supports it).
+"""
+
+import fcntl
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from uuid import uuid4
+
+from django.db import transaction
+
+from camac.document.models import AttachmentBlob
+
+# ioctl request to create a reflink of a file on Linux (btrfs, xfs, ...)
+FICLONE = 0x40049409
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def clone_file(source, target):
+    """Copy a file, as reflink if the file system allows it."""
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+    shutil.copystat(source, target)
+
+
+def link_file(source, target):
+    """Hard link a file, fall back to a copy if the file system doesn't allow it.
+
+    Raises `FileExistsError` if the target already exists.
+    """
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        raise
+    except OSError:  # pragma: no cover
+        clone_file(source, target)
+
+
+def place_file(source, target, link=False):
+    """Atomically create or replace the target with a link or clone of the source."""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{uuid4().hex}")
+
+    try:
+        (link_file if link else clone_file)(source, tmp)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+@transaction.atomic
+def store_blob(source, link=False, digest=None):
+    """Store the content of the given file and return its blob.
+
+    The file is only copied (or linked if `link` is set) if its content isn't
+    stored yet.
+    """
+    source = Path(source)
+    digest = digest or file_digest(source)
+
+    blob, created = AttachmentBlob.objects.select_for_update().get_or_create(
+        digest=digest, defaults={"size": source.stat().st_size}
+    )
+
+    if created or not blob.path.exists():
+        place_file(source, blob.path, link=link)
+
+    return blob
+
+
+@transaction.atomic
+def release_blob(blob):
+    """Delete the blob if no version references it anymore."""
+    blob = AttachmentBlob.objects.select_for_update().filter(pk=blob.pk).first()
+
+    if blob and not blob.versions.exists():
+        blob.delete()
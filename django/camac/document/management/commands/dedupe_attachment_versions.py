@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from camac.document.blobs import file_digest, place_file, store_blob
+from camac.document.models import AttachmentBlob, AttachmentVersion
+
+
+class Command(BaseCommand):
+    help = (
+        "Move files of attachment versions into the content addressed blob "
+        "storage and replace duplicates with links"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Only report how many bytes would be reclaimed",
+        )
+
+    def handle(self, *args, **options):
+        digests = set(AttachmentBlob.objects.values_list("digest", flat=True))
+        versions = AttachmentVersion.objects.filter(blob__isnull=True).order_by("pk")
+        moved = missing = reclaimed = 0
+
+        for version in versions.iterator():
+            path = Path(version.path.path)
+
+            if not path.exists():
+                missing += 1
+                continue
+
+            digest = file_digest(path)
+            if digest in digests:
+                reclaimed += path.stat().st_size
+
+            digests.add(digest)
+            moved += 1
+
+            if options["dry_run"]:
+                continue
+
+            with transaction.atomic():
+                # version files are never written in place, so the first
+                # version of a content can become the blob itself
+                blob = store_blob(path, link=True, digest=digest)
+                place_file(blob.path, path, link=True)
+
+                version.blob = blob
+                version.save(update_fields=["blob"])
+
+        self.stdout.write(
+            f"{'Would move' if options['dry_run'] else 'Moved'} {moved} versions "
+            f"({missing} files missing), {reclaimed} bytes reclaimed"
+        )
@@ -1,4 +1,5 @@
 import mimetypes
+from pathlib import Path
 from uuid import uuid4
 
 import reversion
@@ -27,6 +28,10 @@ def version_path_directory_path(attachment_or_version, filename):
     return "attachment-versions/files/{0}/{1}".format(instance_id, filename)
 
 
+def blob_path(digest):
+    return "attachment-versions/blobs/{0}/{1}".format(digest[:2], digest)
+
+
 @reversion.register()
 class Attachment(models.Model):
     attachment_id = models.AutoField(db_column="ATTACHMENT_ID", primary_key=True)
@@ -136,6 +141,23 @@ class Attachment(models.Model):
         db_table = "ATTACHMENT"
 
 
+class AttachmentBlob(models.Model):
+    """Content of attachment versions, stored once per SHA-256 digest.
+
+    Version files are hard links to the blob file (or copies of it if the
+    file system doesn't support hard links). The blob is deleted as soon as
+    no version references it anymore.
+    """
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def path(self):
+        return Path(settings.MEDIA_ROOT, blob_path(self.digest))
+
+
 class AttachmentVersion(models.Model):
     version = models.IntegerField()
     name = models.CharField(max_length=255)
@@ -152,6 +174,13 @@ class AttachmentVersion(models.Model):
         models.PROTECT,
         related_name="version",
     )
+    blob = models.ForeignKey(
+        AttachmentBlob,
+        models.PROTECT,
+        related_name="versions",
+        null=True,
+        blank=True,
+    )
 
     class Meta:
         constraints = [
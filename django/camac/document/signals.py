@@ -4,7 +4,8 @@ from django.db.models import signals
 from django.dispatch import receiver
 from sorl.thumbnail import delete
 
-from .models import Attachment, AttachmentVersion
+from .blobs import release_blob
+from .models import Attachment, AttachmentBlob, AttachmentVersion
 
 logger = logging.getLogger(__name__)
 
@@ -17,3 +18,14 @@ def auto_delete_attachment_file(sender, instance, **kwargs):
             delete(instance.path)
         except FileNotFoundError:  # pragma: no cover
             logger.exception(f"Couldn't delete file {instance.path.path}")
+
+
+@receiver(signals.post_delete, sender=AttachmentVersion)
+def release_attachment_version_blob(sender, instance, **kwargs):
+    if instance.blob_id:
+        release_blob(instance.blob)
+
+
+@receiver(signals.pre_delete, sender=AttachmentBlob)
+def auto_delete_blob_file(sender, instance, **kwargs):
+    instance.path.unlink(missing_ok=True)
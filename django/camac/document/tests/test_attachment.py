@@ -1,5 +1,7 @@
 import io
 import json
+import os
+import zipfile
 from datetime import timedelta
 
 import pytest
@@ -654,6 +656,19 @@ def test_attachment_download(
         response.headers["content-disposition"]
         == f'attachment; filename="{expected_name}"'
     )
+    assert models.AttachmentDownloadHistory.objects.filter(
+        attachment__in=attachments
+    ).count() == len(attachments)
+
+    if multi:
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        assert [info.filename for info in archive.infolist()] == [document] * 2
+        # Already compressed formats (such as PDF and DOCX) are stored as is
+        assert {info.compress_type for info in archive.infolist()} == {
+            zipfile.ZIP_STORED
+        }
+        with open(os.path.join(settings.MEDIA_ROOT, str(attachment1.path)), "rb") as f:
+            assert archive.read(archive.infolist()[0]) == f.read()
 
 
 @pytest.mark.parametrize(
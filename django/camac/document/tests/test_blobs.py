@@ -0,0 +1,35 @@
+from io import StringIO
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from camac.document.models import AttachmentBlob
+
+
+def test_dedupe_attachment_versions(db, attachment_version_factory):
+    versions = [
+        attachment_version_factory(path=ContentFile(content, name="test.docx"))
+        for content in [b"foo", b"foo", b"bar"]
+    ]
+
+    out = StringIO()
+    call_command("dedupe_attachment_versions", "--dry-run", stdout=out)
+    assert "3 bytes reclaimed" in out.getvalue()
+    assert not AttachmentBlob.objects.exists()
+
+    call_command("dedupe_attachment_versions", stdout=StringIO())
+    assert AttachmentBlob.objects.count() == 2
+
+    for version in versions:
+        version.refresh_from_db()
+        assert Path(version.path.path).samefile(version.blob.path)
+
+    # the blob is deleted with the last version referencing it
+    blob = versions[0].blob
+    versions[0].delete()
+    assert blob.path.exists()
+
+    versions[1].delete()
+    assert not blob.path.exists()
+    assert not AttachmentBlob.objects.filter(pk=blob.pk).exists()
@@ -1,8 +1,6 @@
-import io
 import logging
 import mimetypes
 import os
-import zipfile
 
 from django.conf import settings
 from django.db.models import Q
@@ -23,7 +21,7 @@ from sorl.thumbnail import get_thumbnail
 from sorl.thumbnail.engines.convert_engine import EngineError
 
 from camac.communications.models import CommunicationsAttachment
-from camac.core.views import SendfileHttpResponse
+from camac.core.views import SendfileHttpResponse, StreamingZipHttpResponse
 from camac.instance.document_merge_service import DMSHandler
 from camac.instance.mixins import InstanceEditableMixin, InstanceQuerysetMixin
 from camac.instance.models import Instance
@@ -385,7 +383,7 @@ class AttachmentDownloadView(
             and settings.APPLICATION["DOCUMENT_BACKEND"] == "camac-ng"
         )
 
-    def _create_history_entry(self, request, attachment):
+    def _build_history_entry(self, request, attachment):
         fields = {
             "attachment": attachment,
         }
@@ -394,7 +392,12 @@ class AttachmentDownloadView(
             fields["group"] = request.group
         if request.user.is_authenticated:
             fields["user"] = request.user
-        return models.AttachmentDownloadHistory.objects.create(**fields)
+        return models.AttachmentDownloadHistory(**fields)
+
+    def _create_history_entry(self, request, attachment):
+        history_entry = self._build_history_entry(request, attachment)
+        history_entry.save()
+        return history_entry
 
     def _get_mime_type(self, attachment):
         return attachment.mime_type
@@ -436,41 +439,37 @@ class AttachmentDownloadView(
         fs = filters.AttachmentDownloadFilterSet(
             data=request.GET, queryset=self.get_queryset()
         )
-        filtered_qs = fs.qs
+        attachments = list(fs.qs)
 
-        if not filtered_qs:
+        if not attachments:
             raise NotFound()
 
-        for attachment in filtered_qs:
-            self._create_history_entry(request, attachment)
-
-        attachment = filtered_qs.first()
-        download_path = str(attachment.path)
-
-        response = SendfileHttpResponse(
-            content_type=self._get_mime_type(attachment),
-            filename=attachment.name,
-            base_path=settings.MEDIA_ROOT,
-            file_path=f"/{download_path}",
+        models.AttachmentDownloadHistory.objects.bulk_create(
+            [
+                self._build_history_entry(request, attachment)
+                for attachment in attachments
+            ]
         )
-        if filtered_qs.count() > 1:
-            file_obj = io.BytesIO()
-
-            with zipfile.ZipFile(file_obj, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for attachment in filtered_qs:
-                    zipf.write(
-                        os.path.join(settings.MEDIA_ROOT, str(attachment.path)),
-                        arcname=attachment.name,
-                    )
-            file_obj.seek(0)
-
-            response = SendfileHttpResponse(
-                content_type="application/zip",
-                filename="attachments.zip",
-                file_obj=file_obj,
+
+        if len(attachments) == 1:
+            attachment = attachments[0]
+            return SendfileHttpResponse(
+                content_type=self._get_mime_type(attachment),
+                filename=attachment.name,
+                base_path=settings.MEDIA_ROOT,
+                file_path=f"/{attachment.path}",
             )
 
-        return response
+        return StreamingZipHttpResponse(
+            filename="attachments.zip",
+            files=[
+                (
+                    os.path.join(settings.MEDIA_ROOT, str(attachment.path)),
+                    attachment.name,
+                )
+                for attachment in attachments
+            ],
+        )
 
 
 class AttachmentVersionDownloadView(AttachmentDownloadView):
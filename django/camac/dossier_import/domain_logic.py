@@ -1,8 +1,10 @@
 import os
 import re
 import sys
+import threading
 import time
 import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from dataclasses import asdict
 from functools import wraps
 from logging import getLogger
@@ -10,11 +12,12 @@ from logging import getLogger
 import requests
 from caluma.caluma_workflow.models import Case
 from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 from django.utils.module_loading import import_string
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
-from camac.core.utils import generate_ebau_nr
+from camac.core.utils import generate_ebau_nr, reserve_sequence_numbers
 from camac.dossier_import.dossier_classes import (
     Dossier,
 )
@@ -27,13 +30,15 @@ from camac.dossier_import.messages import (
     Severity,
     update_summary,
 )
-from camac.dossier_import.models import DossierImport
+from camac.dossier_import.models import DossierImport, DossierImportResult
 from camac.instance.models import Instance
 from camac.user.models import User
 from camac.utils import build_url
 
 log = getLogger(__name__)
 
+PROGRESS_LOG_INTERVAL = 100
+
 
 def delay_and_refresh(func):
     @wraps(func)
@@ -50,48 +55,147 @@ def delay_and_refresh(func):
     return wrapper
 
 
+def _import_dossier(writer, dossier: Dossier, dossier_import) -> DossierSummary:
+    """Import a single dossier and record its result in the same transaction."""
+    try:
+        with transaction.atomic():
+            message = writer.import_dossier(dossier, str(dossier_import.id))
+            _save_result(dossier_import, message)
+    except Exception as e:  # pragma: no cover  # noqa: B902
+        # We need to catch unhandled exeptions in single dossier imports
+        # and keep it going.
+        tb = traceback.format_exc()
+        log.exception(e)
+        msg = Message(
+            level=Severity.ERROR.value,
+            code=MessageCodes.UNHANDLED_EXCEPTION.value,
+            detail=f"{e}",
+        )
+        debug = Message(
+            level=Severity.DEBUG.value,
+            code=msg.code,
+            detail=f"{msg.detail}\n{tb}",
+        )
+        message = DossierSummary(
+            dossier_id=dossier.id,
+            status=DOSSIER_IMPORT_STATUS_ERROR,
+            details=[msg, debug],
+        )
+        _save_result(dossier_import, message)
+
+    return message
+
+
+def _save_result(dossier_import, message: DossierSummary):
+    DossierImportResult.objects.update_or_create(
+        dossier_import=dossier_import,
+        dossier_id=str(message.dossier_id),
+        defaults={"status": message.status, "summary": asdict(message)},
+    )
+
+
+def _log_progress(dossier_import, count):
+    if count % PROGRESS_LOG_INTERVAL == 0:
+        log.info(
+            f"Dossier import {dossier_import.pk}: "
+            f"{dossier_import.results.count()}/{dossier_import.dossier_count} "
+            "dossiers imported"
+        )
+
+
+def _import_dossiers(dossier_import, dossiers, writer_cls, writer_kwargs):
+    """Import the dossiers with the configured number of workers.
+
+    Every worker thread uses its own writer and database connection. Only a
+    few dossiers per worker are loaded ahead so the open attachments of the
+    whole archive are not held in memory.
+    """
+    workers = settings.DOSSIER_IMPORT.get("WORKERS", 1)
+
+    if workers <= 1:
+        writer = writer_cls(**writer_kwargs)
+        for count, dossier in enumerate(dossiers, 1):
+            _import_dossier(writer, dossier, dossier_import)
+            _log_progress(dossier_import, count)
+        return
+
+    local = threading.local()
+
+    def work(dossier):
+        if not hasattr(local, "writer"):
+            local.writer = writer_cls(**writer_kwargs)
+        return _import_dossier(local.writer, dossier, dossier_import)
+
+    def close_connection(barrier):
+        # the tasks wait for each other, so every worker thread runs one
+        barrier.wait()
+        connection.close()
+
+    count = 0
+    with reserve_sequence_numbers(), ThreadPoolExecutor(workers) as executor:
+        pending = set()
+        for dossier in dossiers:
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                    count += 1
+                    _log_progress(dossier_import, count)
+            pending.add(executor.submit(work, dossier))
+
+        for future in as_completed(pending):
+            future.result()
+            count += 1
+            _log_progress(dossier_import, count)
+
+        barrier = threading.Barrier(workers)
+        for future in [
+            executor.submit(close_connection, barrier) for _ in range(workers)
+        ]:
+            future.result()
+
+
 @delay_and_refresh
 def perform_import(dossier_import):
-    try:
-        configured_writer_cls = import_string(settings.DOSSIER_IMPORT["WRITER_CLASS"])
+    """Import the dossiers of an import session.
 
+    The result of every dossier is stored in its own transaction, so an
+    interrupted import can be started again and continues with the dossiers
+    which don't have a result yet.
+    """
+    try:
         loader = XlsxFileDossierLoader()
+        archive = dossier_import.get_archive()
+        rows = loader.load_rows(archive)
+
+        dossier_import.dossier_count = len(rows)
+        dossier_import.save()
 
-        writer = configured_writer_cls(
-            user_id=User.objects.get(username=settings.DOSSIER_IMPORT["USER"]).pk,
-            group_id=dossier_import.group.pk,
-            location_id=dossier_import.location and dossier_import.location.pk,
+        imported = set(dossier_import.results.values_list("dossier_id", flat=True))
+        if imported:
+            log.info(
+                f"Resuming dossier import {dossier_import.pk}, "
+                f"{len(imported)} dossiers were already imported"
+            )
+
+        _import_dossiers(
+            dossier_import,
+            loader.load_dossiers(archive, rows=rows, skip=imported),
+            import_string(settings.DOSSIER_IMPORT["WRITER_CLASS"]),
+            {
+                "user_id": User.objects.get(
+                    username=settings.DOSSIER_IMPORT["USER"]
+                ).pk,
+                "group_id": dossier_import.group.pk,
+                "location_id": dossier_import.location and dossier_import.location.pk,
+            },
         )
-        dossier_import.messages["import"] = {"details": []}
-        for dossier in loader.load_dossiers(dossier_import.get_archive()):
-            dossier: Dossier
-            try:
-                message = writer.import_dossier(
-                    dossier,
-                    str(dossier_import.id),
-                )
-            except Exception as e:  # pragma: no cover  # noqa: B902
-                # We need to catch unhandled exeptions in single dossier imports
-                # and keep it going.
-                tb = traceback.format_exc()
-                log.exception(e)
-                msg = Message(
-                    level=Severity.ERROR.value,
-                    code=MessageCodes.UNHANDLED_EXCEPTION.value,
-                    detail=f"{e}",
-                )
-                debug = Message(
-                    level=Severity.DEBUG.value,
-                    code=msg.code,
-                    detail=f"{msg.detail}\n{tb}",
-                )
-                message = DossierSummary(
-                    dossier_id=dossier.id,
-                    status=DOSSIER_IMPORT_STATUS_ERROR,
-                    details=[msg, debug],
-                )
-            dossier_import.messages["import"]["details"].append(asdict(message))
-            dossier_import.save()
+
+        dossier_import.messages["import"] = {
+            "details": list(
+                dossier_import.results.order_by("pk").values_list("summary", flat=True)
+            )
+        }
         update_summary(dossier_import)
         dossier_import.messages["import"]["completed"] = timezone.localtime().strftime(
             "%Y-%m-%dT%H:%M:%S%z"
@@ -1,8 +1,9 @@
 import itertools
 import zipfile
+from collections import defaultdict
 from dataclasses import fields
 from enum import Enum
-from typing import Generator, Iterable, List, Optional, Tuple
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
 
 from django.conf import settings
 from django.utils.timezone import datetime
@@ -355,7 +356,7 @@ class XlsxFileDossierLoader:
             )
         return out, messages
 
-    def load_dossiers(self, archive: zipfile.ZipFile) -> Generator[Dossier, None, None]:
+    def load_rows(self, archive: zipfile.ZipFile) -> List[dict]:
         data_file = archive.open("dossiers.xlsx")
 
         try:
@@ -365,26 +366,59 @@ class XlsxFileDossierLoader:
                 _("Meta data file in archive is corrupt or not a valid .xlsx file.")
             )
 
+        return rows
+
+    def load_dossiers(
+        self,
+        archive: zipfile.ZipFile,
+        rows: Optional[List[dict]] = None,
+        skip: Iterable[str] = (),
+    ) -> Generator[Dossier, None, None]:
+        """Load the dossiers of the archive.
+
+        Dossiers whose ID is contained in `skip` (e.g. because they were
+        already imported) are not loaded at all. Rows with the ID of a
+        previous row are ignored, as reported by the validation.
+        """
+        if rows is None:
+            rows = self.load_rows(archive)
+
+        skip = set(skip)
+        attachments = self._index_attachments(archive)
+
         for row in rows:
             dossier = self._load_dossier(row)
             if dossier.id is None:  # pragma: no cover
                 continue
-            dossier = self._load_attachments(dossier, archive)
+            if str(dossier.id) in skip:
+                continue
+            skip.add(str(dossier.id))
+            dossier = self._load_attachments(dossier, archive, attachments)
             yield dossier
 
-    def _load_attachments(self, dossier, archive):
-        for document_name in filter(
-            lambda x: x.filename.startswith(f"{dossier.id}/"), archive.infolist()
-        ):
-            if document_name.filename.endswith("/"):
-                continue
+    def _index_attachments(self, archive) -> Dict[str, List[str]]:
+        """Map the dossier IDs to the files in their directory of the archive.
+
+        The archive is scanned only once instead of once per dossier.
+        """
+        index = defaultdict(list)
+
+        for info in archive.infolist():
+            dossier_id, separator, __ = info.filename.partition("/")
+            if separator and not info.filename.endswith("/"):
+                index[dossier_id].append(info.filename)
+
+        return index
+
+    def _load_attachments(self, dossier, archive, attachments=None):
+        if attachments is None:
+            attachments = self._index_attachments(archive)
+
+        for filename in attachments.get(str(dossier.id), []):
             if not dossier.attachments:
                 dossier.attachments = []
             dossier.attachments.append(
-                Attachment(
-                    file_accessor=archive.open(document_name.filename, "r"),
-                    name=document_name.filename,
-                )
+                Attachment(file_accessor=archive.open(filename, "r"), name=filename)
             )
         return dossier
 
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dossier_import", "0008_add_status_choices_for_async_tasks"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dossierimport",
+            name="dossier_count",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Number of dossiers in the source file", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaldossierimport",
+            name="dossier_count",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Number of dossiers in the source file", null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name="DossierImportResult",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dossier_id", models.CharField(max_length=255)),
+                ("status", models.CharField(max_length=32)),
+                ("summary", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "dossier_import",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="results",
+                        to="dossier_import.dossierimport",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("dossier_import", "dossier_id")},
+            },
+        ),
+    ]
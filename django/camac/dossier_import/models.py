@@ -107,6 +107,10 @@ class DossierImport(UUIDModel):
 
     task_id = models.CharField(max_length=64, null=True, blank=True)
 
+    dossier_count = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Number of dossiers in the source file"
+    )
+
     def filename(self):
         return os.path.basename(self.source_file.name) if self.source_file else None
 
@@ -180,3 +184,24 @@ class DossierImport(UUIDModel):
         file.write(self.source_file.file.file.read())
 
         return zipfile.ZipFile(file, "r")
+
+
+class DossierImportResult(models.Model):
+    """Result of importing a single dossier.
+
+    Results are stored separately from `DossierImport.messages` so the import
+    doesn't have to rewrite the whole messages object after every dossier.
+    They also track the progress of an import and allow it to be resumed
+    after a crash: dossiers with a result are not imported again.
+    """
+
+    dossier_import = models.ForeignKey(
+        DossierImport, models.CASCADE, related_name="results"
+    )
+    dossier_id = models.CharField(max_length=255)
+    status = models.CharField(max_length=32)
+    summary = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("dossier_import", "dossier_id")
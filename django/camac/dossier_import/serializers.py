@@ -18,6 +18,7 @@ class DossierImportSerializer(serializers.ModelSerializer):
     user = CurrentUserFormDataResourceRelatedField()
     group = GroupFormDataResourceRelatedField(default=CurrentGroupDefault())
     location_id = serializers.IntegerField(write_only=True, required=False)
+    progress = serializers.SerializerMethodField()
 
     class Meta:
         model = models.DossierImport
@@ -34,6 +35,7 @@ class DossierImportSerializer(serializers.ModelSerializer):
             "filename",
             "mime_type",
             "dossier_loader_type",
+            "progress",
         )
         read_only_fields = ("id", "created_at", "messages", "status", "filename")
 
@@ -47,6 +49,9 @@ class DossierImportSerializer(serializers.ModelSerializer):
         self._warnings = []
         super().__init__(*args, **kwargs)
 
+    def get_progress(self, obj):
+        return {"total": obj.dossier_count, "imported": obj.results.count()}
+
     def validate_source_file(self, source_file):
         return verify_source_file(source_file)
 
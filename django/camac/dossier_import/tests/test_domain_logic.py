@@ -9,12 +9,14 @@ from caluma.caluma_workflow.models import Case
 from django.utils import timezone
 
 from camac.dossier_import.domain_logic import (
+    _save_result,
     perform_import,
     set_status_callback,
     undo_import,
 )
-from camac.dossier_import.messages import MessageCodes
-from camac.dossier_import.models import DossierImport
+from camac.dossier_import.loaders import XlsxFileDossierLoader
+from camac.dossier_import.messages import DossierSummary, MessageCodes
+from camac.dossier_import.models import DossierImport, DossierImportResult
 from camac.instance.master_data import MasterData
 from camac.settings.modules.master_data import MASTER_DATA
 
@@ -230,6 +232,96 @@ def test_perform_reimport(  # noqa: C901
         assert modified_at == now.date()
 
 
+@pytest.mark.freeze_time("2023-4-1")
+def test_perform_import_resume(
+    db,
+    master_data_is_visible_mock,
+    archive_file,
+    dossier_import_factory,
+    dossier_loader,
+    setup_dossier_writer,
+):
+    writer = setup_dossier_writer("kt_bern")
+    dossier_import = dossier_import_factory(
+        group=writer._group,
+        user=writer._user,
+        source_file=archive_file("import-example-no-errors.zip"),
+        mime_type=mimetypes.types_map[".zip"],
+    )
+    dossier_ids = [
+        str(dossier.id)
+        for dossier in dossier_loader.load_dossiers(dossier_import.get_archive())
+    ]
+
+    # simulate an import which crashed after the first dossier
+    DossierImportResult.objects.create(
+        dossier_import=dossier_import,
+        dossier_id=dossier_ids[0],
+        status="success",
+        summary={"dossier_id": dossier_ids[0], "status": "success", "details": []},
+    )
+
+    assert perform_import(dossier_import) == DossierImport.IMPORT_STATUS_IMPORTED
+
+    # the already imported dossier is skipped
+    assert not writer.existing_dossier(dossier_ids[0])
+    assert all(writer.existing_dossier(dossier_id) for dossier_id in dossier_ids[1:])
+
+    assert dossier_import.dossier_count == len(dossier_ids)
+    assert sorted(
+        dossier_import.results.values_list("dossier_id", flat=True)
+    ) == sorted(dossier_ids)
+    assert sorted(
+        message["dossier_id"]
+        for message in dossier_import.messages["import"]["details"]
+    ) == sorted(dossier_ids)
+
+
+@pytest.mark.freeze_time("2023-4-1")
+def test_perform_import_duplicate_ids(
+    db,
+    mocker,
+    master_data_is_visible_mock,
+    archive_file,
+    dossier_import_factory,
+    dossier_loader,
+    setup_dossier_writer,
+):
+    writer = setup_dossier_writer("kt_bern")
+    dossier_import = dossier_import_factory(
+        group=writer._group,
+        user=writer._user,
+        source_file=archive_file("import-example-no-errors.zip"),
+        mime_type=mimetypes.types_map[".zip"],
+    )
+    rows = dossier_loader.load_rows(dossier_import.get_archive())
+    dossier_ids = [
+        str(dossier.id)
+        for dossier in dossier_loader.load_dossiers(dossier_import.get_archive())
+    ]
+
+    # the first row is contained twice, the second one is ignored
+    mocker.patch.object(
+        XlsxFileDossierLoader, "load_rows", return_value=[*rows, rows[0]]
+    )
+    assert [
+        str(dossier.id)
+        for dossier in dossier_loader.load_dossiers(dossier_import.get_archive())
+    ] == dossier_ids
+
+    assert perform_import(dossier_import) == DossierImport.IMPORT_STATUS_IMPORTED
+    assert sorted(
+        dossier_import.results.values_list("dossier_id", flat=True)
+    ) == sorted(dossier_ids)
+
+    # saving a result again updates it
+    _save_result(
+        dossier_import,
+        DossierSummary(dossier_id=dossier_ids[0], status="error", details=[]),
+    )
+    assert dossier_import.results.get(dossier_id=dossier_ids[0]).status == "error"
+
+
 @pytest.mark.parametrize(
     "dossier_import__status,task_result,did_delete_import,expected_status",
     [
@@ -289,6 +289,14 @@ def test_file_validation(
             status.HTTP_404_NOT_FOUND,
             None,
         ),
+        (
+            "start",
+            "test",
+            "Municipality",
+            DossierImport.IMPORT_STATUS_IMPORT_FAILED,
+            status.HTTP_200_OK,
+            DossierImport.IMPORT_STATUS_IMPORT_IN_PROGRESS,
+        ),
         (
             "start",
             "test",
@@ -87,10 +87,11 @@ class DossierImportView(ModelViewSet):
     @action(methods=["POST"], url_path="start", detail=True)
     def start(self, request, pk=None):
         dossier_import = self.get_object()
-        if (
-            not dossier_import.status
-            == DossierImport.IMPORT_STATUS_VALIDATION_SUCCESSFUL
-        ):
+        # a failed import can be started again, it resumes where it stopped
+        if dossier_import.status not in [
+            DossierImport.IMPORT_STATUS_VALIDATION_SUCCESSFUL,
+            DossierImport.IMPORT_STATUS_IMPORT_FAILED,
+        ]:
             raise ValidationError(
                 "Make sure the uploaded archive validates successfully.",
             )
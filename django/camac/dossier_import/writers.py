@@ -1,3 +1,4 @@
+import copy
 import hashlib
 import logging
 import re
@@ -623,6 +624,9 @@ class DossierWriter:
         for field in fields(dossier):
             writer = getattr(self, field.name, None)
             if writer:
+                # field writers are class attributes, copy them so concurrent
+                # imports don't share their state
+                writer = copy.copy(writer)
                 writer.owner = weakref.proxy(self)
                 writer.context = {"dossier": dossier}
                 writer.write(instance, getattr(dossier, field.name, None))
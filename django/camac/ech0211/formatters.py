@@ -290,7 +290,7 @@ def municipality(md):
 
 def application(instance: Instance, request: HttpRequest):
     """Create and format an application's properties based on the instance's MasterData."""
-    md = MasterData(instance.case)
+    md = MasterData.for_case(instance.case)
     if md.decision_date and not isinstance(
         md.decision_date, datetime.date
     ):  # pragma: no cover
@@ -461,7 +461,7 @@ def office(service, organization_category=None):
 
 
 def permission_application_identification(instance: Instance):
-    dossier_number = MasterData(instance.case).dossier_number or "unknown"
+    dossier_number = MasterData.for_case(instance.case).dossier_number or "unknown"
     return ns_application.planningPermissionApplicationIdentificationType(  # 3.1.1.1
         localID=[
             ns_objektwesen.namedIdType(IdCategory="eBauNr", Id=dossier_number)
@@ -494,7 +494,7 @@ class BaseDeliveryFormatter:
 
         responsible_service = instance.responsible_service(filter_type="municipality")
 
-        md = MasterData(instance.case)
+        md = MasterData.for_case(instance.case)
 
         return ns_application.eventBaseDeliveryType(
             planningPermissionApplicationInformation=[
@@ -521,7 +521,9 @@ def submit(instance: Instance, event_type: str = "submit", request: HttpRequest
     return ns_application.eventSubmitPlanningPermissionApplicationType(
         eventType=ns_application.eventTypeType(event_type),
         planningPermissionApplication=application(instance, request),
-        relationshipToPerson=format_relationships_to_persons(MasterData(instance.case)),
+        relationshipToPerson=format_relationships_to_persons(
+            MasterData.for_case(instance.case)
+        ),
     )
 
 
@@ -795,9 +797,13 @@ class CantonSpecific:
         decision_wi = instance.case.work_items.filter(task_id="make-decision").first()
         if decision_wi:
             if decision_wi.status == WorkItem.STATUS_CANCELED:
-                return ECH_JUDGEMENT_DECLINED, MasterData(instance.case).decision_date
+                return ECH_JUDGEMENT_DECLINED, MasterData.for_case(
+                    instance.case
+                ).decision_date
             if decision_wi.status == WorkItem.STATUS_COMPLETED:
-                return ECH_JUDGEMENT_APPROVED, MasterData(instance.case).decision_date
+                return ECH_JUDGEMENT_APPROVED, MasterData.for_case(
+                    instance.case
+                ).decision_date
 
         # Rejection should only be considered if no positive decision exists
         if instance.case.work_items.filter(  # pragma: no cover
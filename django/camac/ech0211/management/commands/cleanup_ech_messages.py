@@ -0,0 +1,86 @@
+import gzip
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from camac.ech0211.models import Message
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete eCH-0211 messages which were acknowledged by their receiver "
+        "(i.e. a later message was fetched) and are older than the retention period. "
+        "The last acknowledged message of each receiver is kept as it is the "
+        "cursor (`last`) of the receiver."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            default=settings.ECH_MESSAGE_RETENTION_DAYS,
+            type=int,
+            help="Delete only messages older than the specified number of days.",
+        )
+        parser.add_argument(
+            "--archive",
+            type=str,
+            default=None,
+            help="Write the deleted messages to this gzipped JSON lines file.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of messages deleted at once.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Only output the number of messages that would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        later_acknowledged = Message.objects.filter(
+            Q(created_at__gt=OuterRef("created_at"))
+            | Q(created_at=OuterRef("created_at"), pk__gt=OuterRef("pk")),
+            receiver=OuterRef("receiver"),
+            acknowledged_at__isnull=False,
+        )
+        messages = Message.objects.filter(
+            Exists(later_acknowledged),
+            acknowledged_at__isnull=False,
+            created_at__lt=timezone.now() - timedelta(days=options["days"]),
+        ).order_by("created_at", "id")
+
+        if options["dry_run"]:
+            self.stdout.write(f"Would delete {messages.count()} messages")
+            return
+
+        archive = options["archive"] and gzip.open(options["archive"], "at")
+        deleted = 0
+
+        try:
+            while batch := list(
+                messages.values("id", "receiver_id", "created_at", "body")[
+                    : options["batch_size"]
+                ]
+            ):
+                if archive:
+                    for message in batch:
+                        archive.write(json.dumps(message, cls=DjangoJSONEncoder))
+                        archive.write("\n")
+
+                deleted += Message.objects.filter(
+                    pk__in=[message["id"] for message in batch]
+                ).delete()[0]
+        finally:
+            if archive:
+                archive.close()
+
+        self.stdout.write(f"Deleted {deleted} messages")
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+import camac.ech0211.models
+
+
+def compress_bodies(apps, schema_editor):
+    Message = apps.get_model("ech0211", "Message")
+
+    batch = []
+    for message in Message.objects.only("pk", "body").iterator(chunk_size=1000):
+        message.compressed_body = message.body
+        batch.append(message)
+
+        if len(batch) == 1000:
+            Message.objects.bulk_update(batch, ["compressed_body"])
+            batch = []
+
+    Message.objects.bulk_update(batch, ["compressed_body"])
+
+
+def decompress_bodies(apps, schema_editor):
+    Message = apps.get_model("ech0211", "Message")
+
+    batch = []
+    for message in Message.objects.only("pk", "compressed_body").iterator(
+        chunk_size=1000
+    ):
+        message.body = message.compressed_body
+        batch.append(message)
+
+        if len(batch) == 1000:
+            Message.objects.bulk_update(batch, ["body"])
+            batch = []
+
+    Message.objects.bulk_update(batch, ["body"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ech0211", "0002_fix_unknown_message_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="compressed_body",
+            field=camac.ech0211.models.CompressedTextField(
+                help_text="XML body", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="message",
+            name="body",
+            field=models.TextField(help_text="XML body", null=True),
+        ),
+        migrations.RunPython(compress_bodies, decompress_bodies),
+        migrations.RemoveField(
+            model_name="message",
+            name="body",
+        ),
+        migrations.RenameField(
+            model_name="message",
+            old_name="compressed_body",
+            new_name="body",
+        ),
+        migrations.AlterField(
+            model_name="message",
+            name="body",
+            field=camac.ech0211.models.CompressedTextField(help_text="XML body"),
+        ),
+        migrations.AddField(
+            model_name="message",
+            name="acknowledged_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the receiver fetched a message after this one",
+                null=True,
+            ),
+        ),
+        migrations.AlterModelOptions(
+            name="message",
+            options={"managed": True, "ordering": ["created_at", "id"]},
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["receiver", "created_at", "id"],
+                name="ech0211_message_cursor_idx",
+            ),
+        ),
+    ]
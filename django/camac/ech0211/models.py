@@ -1,14 +1,44 @@
 import xml.dom.minidom
+import zlib
 from uuid import uuid4
 
 from django.db import models
 
 
+class CompressedTextField(models.BinaryField):
+    """Text field which is stored zlib compressed.
+
+    The value is compressed when written and decompressed when read, so the
+    field behaves like a `TextField` apart from database lookups.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        return self.to_python(value)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return zlib.decompress(value).decode("utf-8")
+        return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if isinstance(value, str):
+            value = zlib.compress(value.encode("utf-8"))
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+
 class Message(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
-    body = models.TextField(help_text="XML body")
+    body = CompressedTextField(help_text="XML body")
     created_at = models.DateTimeField(auto_now_add=True)
     receiver = models.ForeignKey("user.Service", on_delete=models.PROTECT)
+    acknowledged_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the receiver fetched a message after this one",
+    )
 
     def pretty_print(self):  # pragma: no cover
         """
@@ -21,4 +51,10 @@ class Message(models.Model):
 
     class Meta:
         managed = True
-        ordering = ["created_at"]
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(
+                fields=["receiver", "created_at", "id"],
+                name="ech0211_message_cursor_idx",
+            )
+        ]
@@ -1,5 +1,7 @@
 import datetime
+import gzip
 import json
+import os
 from unittest.mock import Mock
 
 import pytest
@@ -9,7 +11,9 @@ from caluma.caluma_form import models as caluma_form_models
 from caluma.caluma_workflow import api as workflow_api, models as caluma_workflow_models
 from django.conf import settings
 from django.core.management import call_command
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
 from camac.constants.kt_bern import (
@@ -643,6 +647,112 @@ def test_application_retrieve_full_sz(
     assert resp.status_code == status.HTTP_200_OK
 
 
+def test_messages_list(
+    db,
+    admin_user,
+    admin_client,
+    message_factory,
+    service_factory,
+    set_application_be,
+    be_ech0211_settings,
+    reload_ech0211_urls,
+    clear_cache,
+    freezer,
+):
+    receiver = admin_user.groups.first().service
+    message_factory(body="other xml", receiver=service_factory())
+    messages = []
+    for __ in range(3):
+        freezer.tick()
+        messages.append(message_factory(receiver=receiver))
+
+    # same timestamp, the ID is used as tie-breaker
+    freezer.tick()
+    messages += sorted(
+        message_factory.create_batch(2, receiver=receiver), key=lambda m: m.pk
+    )
+
+    url = reverse("messages")
+
+    response = admin_client.get(url, data={"limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [m["id"] for m in data["messages"]] == [str(m.pk) for m in messages[:2]]
+    assert data["messages"][0]["body"] == "some xml"
+    assert data["last"] == str(messages[1].pk)
+    assert data["has_more"]
+    assert not Message.objects.filter(acknowledged_at__isnull=False).exists()
+
+    response = admin_client.get(url, data={"last": data["last"]})
+    data = response.json()
+    assert [m["id"] for m in data["messages"]] == [str(m.pk) for m in messages[2:]]
+    assert not data["has_more"]
+    assert set(
+        Message.objects.filter(acknowledged_at__isnull=False).values_list(
+            "pk", flat=True
+        )
+    ) == {m.pk for m in messages[:2]}
+
+    response = admin_client.get(url, data={"last": data["last"]})
+    data = response.json()
+    assert data["messages"] == []
+    assert data["last"] == str(messages[-1].pk)
+
+    response = admin_client.get(url, data={"limit": "many"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_message_body_compressed(db, message_factory):
+    message = message_factory(body="<xml>" + "a" * 1000 + "</xml>")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT LENGTH(body) FROM ech0211_message WHERE id = %s", [message.pk]
+        )
+        assert cursor.fetchone()[0] < 100
+
+    message = Message.objects.get(pk=message.pk)
+    assert message.body == "<xml>" + "a" * 1000 + "</xml>"
+
+
+@pytest.mark.freeze_time("2024-01-31")
+def test_cleanup_ech_messages(db, message_factory, service_factory, freezer, tmp_path):
+    receiver, other_receiver = service_factory.create_batch(2)
+
+    freezer.move_to("2024-01-01")
+    old_acknowledged = message_factory(
+        receiver=receiver, acknowledged_at=timezone.now()
+    )
+    freezer.tick()
+    # the last acknowledged message of a receiver is its cursor and kept
+    other_cursor = message_factory(
+        receiver=other_receiver, acknowledged_at=timezone.now()
+    )
+    old_unacknowledged = message_factory(receiver=receiver)
+    freezer.move_to("2024-01-31")
+    new_acknowledged = message_factory(
+        receiver=receiver, acknowledged_at=timezone.now()
+    )
+
+    archive = tmp_path / "messages.jsonl.gz"
+    call_command(
+        "cleanup_ech_messages",
+        days=10,
+        archive=str(archive),
+        stdout=open(os.devnull, "w"),
+    )
+
+    assert set(Message.objects.values_list("pk", flat=True)) == {
+        other_cursor.pk,
+        old_unacknowledged.pk,
+        new_acknowledged.pk,
+    }
+    with gzip.open(archive, "rt") as f:
+        archived = [json.loads(line) for line in f]
+    assert [m["id"] for m in archived] == [str(old_acknowledged.pk)]
+    assert archived[0]["body"] == "some xml"
+
+
 def test_message_invalid_last(admin_client, set_application_be, reload_ech0211_urls):
     response = admin_client.get(reverse("message"), data={"last": "invalid-uuid"})
 
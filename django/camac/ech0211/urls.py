@@ -26,6 +26,9 @@ urlpatterns += [
     re_path(
         r"message/$", views.MessageView.as_view({"get": "retrieve"}), name="message"
     ),
+    re_path(
+        r"messages/$", views.MessagesView.as_view({"get": "list"}), name="messages"
+    ),
     re_path(
         r"event/(?P<instance_id>(\d+))/(?P<event_type>(\w+))/?$",
         views.EventView.as_view({"post": "create"}),
@@ -4,7 +4,9 @@ from alexandria.core.models import File
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Q
 from django.http import HttpResponse
+from django.utils import timezone
 from django.utils.decorators import decorator_from_middleware
 from drf_yasg import openapi
 from drf_yasg.inspectors import SwaggerAutoSchema
@@ -43,29 +45,40 @@ from .serializers import ApplicationsSerializer, ECHFileSerializer
 
 logger = logging.getLogger(__name__)
 
+MESSAGES_DEFAULT_LIMIT = 100
+MESSAGES_MAX_LIMIT = 1000
+
 
 last_param = openapi.Parameter(
     "last",
     openapi.IN_QUERY,
     description=(
         "UUID of last message. Can be found in `delivery.deliveryHeader.messageId`. "
-        "If omitted, first message is returned"
+        "If omitted, first message is returned. Passing `last` acknowledges it and "
+        "all messages before it, acknowledged messages are deleted after the "
+        "retention period. No message is returned if `last` doesn't exist"
     ),
     type=openapi.TYPE_STRING,
 )
 
+limit_param = openapi.Parameter(
+    "limit",
+    openapi.IN_QUERY,
+    description=(
+        f"Maximum number of messages to return (default {MESSAGES_DEFAULT_LIMIT}, "
+        f"at most {MESSAGES_MAX_LIMIT})"
+    ),
+    type=openapi.TYPE_INTEGER,
+)
+
 
 class FileSwaggerAutoSchema(SwaggerAutoSchema):
     def get_produces(self):
         return ["*/*"]
 
 
-class MessageView(RetrieveModelMixin, GenericViewSet):
+class MessageQuerysetMixin:
     queryset = Message.objects
-    serializer_class = Serializer
-    renderer_classes = (XMLRenderer,)
-
-    throttle_classes = [ECHMessageThrottle]
 
     @decorator_from_middleware(GeofenceMiddleware)
     def dispatch(self, *args, **kwargs):
@@ -79,22 +92,44 @@ class MessageView(RetrieveModelMixin, GenericViewSet):
         qs = super().get_queryset()
         return qs.filter(receiver=self.request.group.service)
 
-    def get_object(self, last=None):
+    def get_messages_after(self, last=None):
+        """Return the messages following the message `last` in cursor order.
+
+        Messages are ordered by `(created_at, id)`, which is unique and covered
+        by an index per receiver. Fetching the messages after `last`
+        acknowledges `last` and all messages before it. Returns `None` if
+        `last` doesn't exist.
+        """
         queryset = self.get_queryset()
-        next_message = queryset.first()
-        if last:
-            try:
-                last_message = queryset.get(pk=last)
-            except ValidationError:
-                raise ParseError("'last' parameter must be a valid UUID")
-            except Message.DoesNotExist:
-                return
+        if not last:
+            return queryset
+
+        try:
+            last_message = queryset.get(pk=last)
+        except ValidationError:
+            raise ParseError("'last' parameter must be a valid UUID")
+        except Message.DoesNotExist:
+            return None
+
+        is_before = Q(created_at__lt=last_message.created_at) | Q(
+            created_at=last_message.created_at, pk__lte=last_message.pk
+        )
+        queryset.filter(is_before, acknowledged_at__isnull=True).update(
+            acknowledged_at=timezone.now()
+        )
+
+        return queryset.exclude(is_before)
+
+
+class MessageView(MessageQuerysetMixin, RetrieveModelMixin, GenericViewSet):
+    serializer_class = Serializer
+    renderer_classes = (XMLRenderer,)
 
-            next_message = queryset.filter(
-                created_at__gt=last_message.created_at
-            ).first()
+    throttle_classes = [ECHMessageThrottle]
 
-        return next_message
+    def get_object(self, last=None):
+        messages = self.get_messages_after(last)
+        return messages.first() if messages is not None else None
 
     @swagger_auto_schema(
         tags=["eCH-0211"],
@@ -112,6 +147,49 @@ class MessageView(RetrieveModelMixin, GenericViewSet):
         return response
 
 
+class MessagesView(MessageQuerysetMixin, ListModelMixin, GenericViewSet):
+    serializer_class = Serializer
+    renderer_classes = (JSONRenderer,)
+
+    throttle_classes = [ECHMessageThrottle]
+
+    @swagger_auto_schema(
+        tags=["eCH-0211"],
+        manual_parameters=[group_param, last_param, limit_param],
+        operation_summary="Get messages",
+        operation_description=get_operation_description(),
+        responses={
+            "200": (
+                "Up to `limit` eCH-0211 messages following `last`. "
+                "Pass `last` of the response to fetch the following messages."
+            )
+        },
+    )
+    def list(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get("limit", MESSAGES_DEFAULT_LIMIT))
+        except ValueError:
+            raise ParseError("'limit' parameter must be an integer")
+        limit = max(1, min(limit, MESSAGES_MAX_LIMIT))
+
+        last = request.query_params.get("last")
+        messages = self.get_messages_after(last)
+        if messages is None:
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+        messages = list(messages.values("id", "created_at", "body")[: limit + 1])
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+
+        return Response(
+            {
+                "messages": messages,
+                "last": messages[-1]["id"] if messages else last,
+                "has_more": has_more,
+            }
+        )
+
+
 class ApplicationView(ECHInstanceQuerysetMixin, RetrieveModelMixin, GenericViewSet):
     instance_field = None
     serializer_class = Serializer
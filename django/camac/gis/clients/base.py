@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from caluma.caluma_form.models import Question
 from django.http import QueryDict
@@ -9,8 +9,19 @@ from camac.gis.utils import MergeStrategy, concat_values, merge_table
 class GISBaseClient:
     merge_strategy: MergeStrategy = MergeStrategy.MERGE_FIRST
 
-    def __init__(self, params: QueryDict):
+    # Clients which use the data of the previous data sources can't run in
+    # parallel to them and their output can't be cached
+    uses_intermediate_data: bool = False
+
+    # Whether the output of the client is cached per params and config (see
+    # `camac.gis.views.run_data_source`)
+    is_cacheable: bool = True
+
+    def __init__(self, params: QueryDict, question_types: Optional[dict] = None):
         self.params = params
+        # mapping of question slugs to their type which is passed when the client
+        # runs in a thread and therefore shouldn't access the database
+        self.question_types = question_types
 
     @staticmethod
     def get_required_params(data_source):
@@ -28,6 +39,16 @@ class GISBaseClient:
     def process_data_source(self, config: dict, intermediate_data) -> dict:
         raise NotImplementedError()
 
+    def get_question_type(self, question: str) -> Optional[str]:
+        if self.question_types is not None:
+            return self.question_types.get(question)
+
+        return (
+            Question.objects.filter(slug=question)
+            .values_list("type", flat=True)
+            .first()
+        )
+
     def set_question_value(self, data: dict, question: str, value: Any) -> dict:
         if "." in question:
             table_question, row_question = question.split(".")
@@ -42,13 +63,10 @@ class GISBaseClient:
 
             return
 
-        question_obj = Question.objects.filter(slug=question).first()
-        if not question_obj:
+        question_type = self.get_question_type(question)
+        if not question_type:
             raise RuntimeError(f"Unknown question {question} in gis config")
-        if (
-            isinstance(value, list)
-            and question_obj.type != Question.TYPE_MULTIPLE_CHOICE
-        ):
+        if isinstance(value, list) and question_type != Question.TYPE_MULTIPLE_CHOICE:
             value = ", ".join(sorted(set(value)))
 
         if question in data:
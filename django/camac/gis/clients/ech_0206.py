@@ -36,6 +36,8 @@ class Ech0206(GISBaseClient):
     """Process ech0206  data for gebaeude-und-anlagen table."""
 
     merge_strategy: MergeStrategy = MergeStrategy.OVERRIDE
+    uses_intermediate_data: bool = True
+    is_cacheable: bool = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -3,6 +3,9 @@ from camac.gis.utils import cast
 
 
 class ParamGisClient(GISBaseClient):
+    # the data is taken from the params, so there's nothing to gain from caching
+    is_cacheable: bool = False
+
     @staticmethod
     def get_required_params(data_source):
         return [param_config["parameterName"] for param_config in data_source.config]
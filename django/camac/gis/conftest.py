@@ -2,6 +2,12 @@ import pytest
 from syrupy.filters import props
 
 
+@pytest.fixture(autouse=True)
+def clear_gis_cache(clear_cache):
+    # the output of the data sources is cached per params and config
+    pass
+
+
 @pytest.fixture
 def mock_municipalities(mocker):
     def mock(names=[]):
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from caluma.caluma_form.models import Question
 from django.urls import reverse
@@ -5,6 +7,7 @@ from rest_framework import status
 
 from camac.gis.clients.base import GISBaseClient
 from camac.gis.models import GISDataSource
+from camac.gis.views import GISDataView
 
 
 class FakeClient(GISBaseClient):
@@ -71,3 +74,105 @@ def test_view_structure(
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == gis_snapshot
+
+
+class SlowClient(GISBaseClient):
+    calls = []
+
+    def process_data_source(self, config, intermediate_data):
+        # the first data source takes the longest to make sure the merge order
+        # doesn't depend on the order in which the data sources finish
+        time.sleep(config["delay"])
+        self.calls.append(config["value"])
+
+        result = {}
+        self.set_question_value(result, "text-question", config["value"])
+
+        return result
+
+
+class IntermediateClient(GISBaseClient):
+    uses_intermediate_data = True
+
+    def process_data_source(self, config, intermediate_data):
+        return {"intermediate": intermediate_data.get("text-question")}
+
+
+def test_view_parallel_and_cached(
+    db,
+    admin_client,
+    gis_data_source_factory,
+    mocker,
+    question_factory,
+    settings,
+):
+    settings.GIS_MAX_WORKERS = 3
+    question_factory(slug="text-question", type=Question.TYPE_TEXT)
+
+    for sort, (value, delay) in enumerate([("a", 0.2), ("b", 0.1), ("c", 0)]):
+        gis_data_source_factory(
+            client=GISDataSource.CLIENT_ADMIN,
+            config={"value": value, "delay": delay},
+            sort=sort,
+        )
+    gis_data_source_factory(client=GISDataSource.CLIENT_PARAM, sort=3)
+
+    mocker.patch(
+        "camac.gis.views.get_client",
+        side_effect=lambda identifier: (
+            IntermediateClient
+            if identifier == GISDataSource.CLIENT_PARAM
+            else SlowClient
+        ),
+    )
+    mocker.patch("camac.gis.models.GISDataSource.get_required_params", return_value=[])
+    SlowClient.calls = []
+
+    for _ in range(2):
+        response = admin_client.get(reverse("gis-data"), {"egrids": "CH123"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["text-question"]["value"] == "a, b, c"
+        assert data["intermediate"]["value"] == "a, b, c"
+
+    # the second request is served from the cache
+    assert sorted(SlowClient.calls) == ["a", "b", "c"]
+
+    response = admin_client.get(reverse("gis-data"), {"egrids": "CH456"})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(SlowClient.calls) == 6
+
+
+@pytest.mark.parametrize("rows", [1, 20])
+def test_add_labels_queries(
+    db,
+    question_factory,
+    question_option_factory,
+    django_assert_num_queries,
+    rows,
+):
+    question_factory(slug="table", type=Question.TYPE_TABLE)
+    question_factory(slug="choice", type=Question.TYPE_CHOICE)
+    question_factory(slug="multiple", type=Question.TYPE_MULTIPLE_CHOICE)
+    question_option_factory(question_id="choice", option__slug="choice-a")
+    question_option_factory(question_id="multiple", option__slug="multiple-a", sort=1)
+    question_option_factory(question_id="multiple", option__slug="multiple-b", sort=2)
+
+    data = {
+        "table": [{"choice": "a", "multiple": ["a", "b"]} for _ in range(rows)],
+        "unknown": "foo",
+    }
+
+    # one query for the questions and one for the options
+    with django_assert_num_queries(2):
+        labeled = GISDataView().add_labels(data)
+
+    assert len(labeled["table"]["value"]) == rows
+    assert labeled["unknown"] == {"label": None, "value": "foo"}
+    row = labeled["table"]["value"][0]
+    assert row["choice"]["value"] == "choice-a"
+    assert [option["value"] for option in row["multiple"]["value"]] == [
+        "multiple-b",
+        "multiple-a",
+    ]
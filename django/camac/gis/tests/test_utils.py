@@ -42,3 +42,20 @@ def test_concat_values():
     assert utils.concat_values("test  ") == "test"
     assert utils.concat_values(17) == 17
     assert utils.concat_values(None, 12.3) == 12.3
+
+
+def test_get_question_slugs():
+    assert utils.get_question_slugs(
+        {
+            "layers": {
+                "layer-1": {
+                    "properties": [
+                        {"question": "question-1"},
+                        {"question": "table.question-2"},
+                    ]
+                },
+            },
+            "question": "question-3",
+            "other": [{"question": None}, "question"],
+        }
+    ) == {"question-1", "table", "question-3"}
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any, List, Union
+from typing import Any, List, Set, Union
 
 from django.utils.translation import gettext as _
 
@@ -103,3 +103,26 @@ def merge_data(data: dict, new_data: dict, merge_strategy: MergeStrategy) -> dic
                 value = concat_values(data[key], value)
 
         data[key] = value
+
+
+def get_question_slugs(config: Any) -> Set[str]:
+    """Collect the slugs of all questions used in a data source config.
+
+    Questions are referenced with a `question` key on any level of the config.
+    For questions in tables (`table.question`), only the table question is
+    returned.
+    """
+    slugs = set()
+
+    if isinstance(config, dict):
+        question = config.get("question")
+        if isinstance(question, str):
+            slugs.add(question.split(".")[0])
+
+        for value in config.values():
+            slugs |= get_question_slugs(value)
+    elif isinstance(config, list):
+        for value in config:
+            slugs |= get_question_slugs(value)
+
+    return slugs
@@ -1,12 +1,16 @@
+import hashlib
 import itertools
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 from uuid import uuid4
 
 from caluma.caluma_data_source.data_source_handlers import get_data_sources
-from caluma.caluma_form.models import Question
+from caluma.caluma_form.models import Question, QuestionOption
+from django.conf import settings
 from django.core.cache import cache
-from django.utils.translation import get_language, gettext as _
+from django.utils.translation import get_language, gettext as _, override
 from django_q.tasks import async_task, fetch, result
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
@@ -17,7 +21,7 @@ from rest_framework.response import Response
 
 from camac.gis.models import GISDataSource
 from camac.gis.serializers import GISApplySerializer
-from camac.gis.utils import merge_data
+from camac.gis.utils import get_question_slugs, merge_data
 
 logger = logging.getLogger(__name__)
 
@@ -29,23 +33,125 @@ def get_client(identifier):
     return getattr(import_module(".".join(parts)), class_name)
 
 
+def is_table_value(value) -> bool:
+    return bool(value) and isinstance(value, list) and isinstance(value[0], dict)
+
+
+def iterate_answers(data: dict):
+    """Iterate over all question slugs and values including the table rows."""
+    for question_slug, value in data.items():
+        yield question_slug, value
+
+        if is_table_value(value):
+            for row in value:
+                yield from iterate_answers(row)
+
+
+def get_cache_key(gis_data, query_params):
+    """Cache key of the output of a data source for the given params.
+
+    E.g. for the same coordinates or EGRIDs and the same config, the output
+    of a data source is the same.
+    """
+    payload = json.dumps(
+        {
+            "params": sorted(query_params.lists()),
+            "config": gis_data.config,
+            "language": get_language(),
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+    return f"gis-data:{gis_data.client}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def run_data_source(
+    gis_data, query_params, intermediate_data, question_types=None, language=None
+):
+    if language:
+        # threads don't inherit the active language of the request
+        with override(language):
+            return run_data_source(
+                gis_data, query_params, intermediate_data, question_types
+            )
+
+    for required_param in gis_data.get_required_params():
+        if required_param not in query_params.keys():
+            raise ValueError(
+                _("Required parameter %(parameter)s was not passed")
+                % {"parameter": required_param}
+            )
+
+    client_cls = get_client(gis_data.client)
+    client = client_cls(query_params, question_types=question_types)
+
+    if not client_cls.is_cacheable or client_cls.uses_intermediate_data:
+        return (
+            client.merge_strategy,
+            client.process_data_source(gis_data.config, intermediate_data),
+        )
+
+    cache_key = get_cache_key(gis_data, query_params)
+    new_data = cache.get(cache_key)
+
+    if new_data is None:
+        new_data = client.process_data_source(gis_data.config, intermediate_data)
+        cache.set(cache_key, new_data, settings.GIS_CACHE_TIMEOUT)
+
+    return client.merge_strategy, new_data
+
+
 class GISDataView(ListAPIView):
     renderer_classes = [JSONRenderer]
     queryset = GISDataSource.objects.filter(disabled=False).order_by("sort")
 
     def add_labels(self, data: dict) -> dict:
+        """Add the labels of the questions and options to the data.
+
+        All questions and options (also of table rows) are fetched at once
+        beforehand, so the number of queries doesn't grow with the number of
+        rows.
+        """
+        answers = list(iterate_answers(data))
+        questions = {
+            question.pk: question
+            for question in Question.objects.filter(
+                pk__in={slug for slug, _ in answers}
+            ).only("label", "type", "row_form_id", "data_source")
+        }
+
+        option_slugs = set()
+        for slug, value in answers:
+            question = questions.get(slug)
+            if not question:
+                continue
+
+            if question.type == Question.TYPE_CHOICE:
+                option_slugs.add(f"{slug}-{value}")
+            elif question.type == Question.TYPE_MULTIPLE_CHOICE:
+                option_slugs.update(f"{slug}-{v}" for v in value)
+
+        question_options = {
+            (question_option.question_id, question_option.option_id): question_option
+            for question_option in QuestionOption.objects.filter(
+                question__in=questions.keys(), option__in=option_slugs
+            ).select_related("option")
+        }
+
+        return self._add_labels(data, questions, question_options)
+
+    def _add_labels(self, data: dict, questions: dict, question_options: dict) -> dict:
         labeled_data = {}
 
         for question_slug, value in data.items():
-            question = (
-                Question.objects.filter(pk=question_slug)
-                .only("label", "type", "row_form_id")
-                .first()
-            )
+            question = questions.get(question_slug)
 
             # add labels recursively for tables, but not for multiple choice questions
-            if value and isinstance(value, list) and isinstance(value[0], dict):
-                value = [self.add_labels(row) for row in value]
+            if is_table_value(value):
+                value = [
+                    self._add_labels(row, questions, question_options) for row in value
+                ]
 
             labeled_data[question_slug] = {
                 "label": str(question.label) if question else None,
@@ -58,39 +164,66 @@ class GISDataView(ListAPIView):
             if question.type == Question.TYPE_TABLE:
                 labeled_data[question_slug]["form"] = question.row_form_id
             elif question.type == Question.TYPE_CHOICE:
-                option = question.options.filter(
-                    slug=f"{question.slug}-{value}"
-                ).first()
+                option = question_options[
+                    (question.pk, f"{question.slug}-{value}")
+                ].option
                 labeled_data[question_slug]["value"] = option.slug
                 labeled_data[question_slug]["displayValue"] = option.label.translate()
             elif question.type == Question.TYPE_MULTIPLE_CHOICE:
-                options = question.options.filter(
-                    slug__in=[f"{question.slug}-{v}" for v in value]
-                ).order_by("-questionoption__sort")
+                selected = sorted(
+                    filter(
+                        None,
+                        [
+                            question_options.get((question.pk, f"{question.slug}-{v}"))
+                            for v in set(value)
+                        ],
+                    ),
+                    key=lambda question_option: -question_option.sort,
+                )
                 labeled_data[question_slug]["value"] = [
-                    {"value": o.slug, "displayValue": o.label.translate()}
-                    for o in options
+                    {
+                        "value": question_option.option.slug,
+                        "displayValue": question_option.option.label.translate(),
+                    }
+                    for question_option in selected
                 ]
             elif question.type == Question.TYPE_DYNAMIC_CHOICE:
-                # This code only implements one of the possible structures a
-                # caluma data source can have: a list containing a dict with
-                # label and slug where the label is also a dict with a key value
-                # pair for each language. Right now this is the only structure
-                # we use in camac-ng. For more information on how the data
-                # source structure looks like, please check the implementation
-                # in django/camac/caluma/extensions/data_sources.py
-                caluma_user = self.request.caluma_info.context.user
-                data_source = get_data_sources(dic=True)[question.data_source]()
-                mapped = {
-                    label[get_language()]: str(slug)
-                    for slug, label in data_source.get_data(caluma_user, question, {})
-                }
+                mapped = self.get_dynamic_options(question)
 
                 labeled_data[question_slug]["value"] = mapped.get(value)
                 labeled_data[question_slug]["displayValue"] = value
 
         return labeled_data
 
+    def get_dynamic_options(self, question: Question) -> dict:
+        """Map the labels of a dynamic question's options to their slugs.
+
+        This code only implements one of the possible structures a caluma
+        data source can have: a list containing a dict with label and slug
+        where the label is also a dict with a key value pair for each
+        language. Right now this is the only structure we use in camac-ng.
+        For more information on how the data source structure looks like,
+        please check the implementation in
+        django/camac/caluma/extensions/data_sources.py
+
+        The result is memoised for the current request as building the data
+        source can be expensive.
+        """
+        if not hasattr(self, "_dynamic_options"):
+            self._dynamic_options = {}
+
+        key = (question.data_source, question.pk, get_language())
+
+        if key not in self._dynamic_options:
+            caluma_user = self.request.caluma_info.context.user
+            data_source = get_data_sources(dic=True)[question.data_source]()
+            self._dynamic_options[key] = {
+                label[get_language()]: str(slug)
+                for slug, label in data_source.get_data(caluma_user, question, {})
+            }
+
+        return self._dynamic_options[key]
+
     def add_hidden(self, data):
         """Attach the hidden field to the view response."""
         hidden_questions = self.extract_hidden(self.get_queryset())
@@ -119,30 +252,60 @@ class GISDataView(ListAPIView):
 
     @staticmethod
     def process_data_sources(queryset, query_params, data, errors):
-        for gis_data in queryset:
-            try:
-                for required_param in gis_data.get_required_params():
-                    if required_param not in query_params.keys():
-                        raise ValueError(
-                            _("Required parameter %(parameter)s was not passed")
-                            % {"parameter": required_param}
-                        )
-                client = get_client(gis_data.client)(query_params)
-                new_data = client.process_data_source(gis_data.config, data)
-
-                merge_data(data, new_data, client.merge_strategy)
+        """Run all data sources and merge their data in order.
+
+        Data sources which don't depend on the data of the previous ones are
+        started in parallel up front, the others run as soon as all previous
+        data sources are merged. The merge itself always happens in the order
+        of the data sources, so the result is the same as if they ran one
+        after another.
+        """
+        data_sources = list(queryset)
+        language = get_language()
+        question_types = dict(
+            Question.objects.filter(
+                pk__in=get_question_slugs(
+                    [gis_data.config for gis_data in data_sources]
+                )
+            ).values_list("pk", "type")
+        )
 
-            except RuntimeError as e:
-                errors.append(
-                    {
-                        "detail": str(e),
-                        "client": gis_data.client,
-                        "data_source_id": gis_data.pk,
-                        "data_source_description": gis_data.description,
-                    }
+        with ThreadPoolExecutor(max_workers=settings.GIS_MAX_WORKERS) as executor:
+            futures = {
+                gis_data.pk: executor.submit(
+                    run_data_source,
+                    gis_data,
+                    query_params,
+                    {},
+                    question_types,
+                    language,
                 )
-            except ValueError as e:
-                raise ValidationError(e)
+                for gis_data in data_sources
+                if not get_client(gis_data.client).uses_intermediate_data
+            }
+
+            for gis_data in data_sources:
+                try:
+                    future = futures.get(gis_data.pk)
+                    merge_strategy, new_data = (
+                        future.result()
+                        if future
+                        else run_data_source(gis_data, query_params, data)
+                    )
+
+                    merge_data(data, new_data, merge_strategy)
+
+                except RuntimeError as e:
+                    errors.append(
+                        {
+                            "detail": str(e),
+                            "client": gis_data.client,
+                            "data_source_id": gis_data.pk,
+                            "data_source_description": gis_data.description,
+                        }
+                    )
+                except ValueError as e:
+                    raise ValidationError(e)
         return data, errors
 
     def _process_response(self, data, errors):
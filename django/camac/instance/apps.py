@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DefaultConfig(AppConfig):
     name = "camac.instance"
+
+    def ready(self):
+        from camac.instance import projection, publication, search  # noqa: F401
@@ -1,27 +1,37 @@
+import io
 import json
 import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from importlib import import_module
 from os.path import splitext
+from uuid import uuid4
 
 import requests
 from alexandria.core import models as alexandria_models
 from caluma.caluma_form.models import Document, Question
 from caluma.caluma_form.validators import CustomValidationError, DocumentValidator
+from caluma.caluma_user.models import BaseUser
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import OuterRef
 from django.utils.text import slugify
 from django.utils.timezone import get_current_timezone, localtime
 from django.utils.translation import get_language, gettext as _
+from django_q.tasks import async_task
+from requests.adapters import HTTPAdapter
 from rest_framework import exceptions, status
 from rest_framework.authentication import get_authorization_header
+from urllib3.util.retry import Retry
 
 from camac.instance.master_data import MasterData
 from camac.instance.models import Instance
 from camac.instance.placeholders.utils import enrich_personal_data, get_person_name
 from camac.instance.utils import build_document_prefetch_statements
-from camac.user.models import Service
+from camac.user.models import Group, Service, User
 from camac.utils import build_url, clean_join, get_dict_item
 
 
@@ -113,16 +123,19 @@ class DMSHandler:
     def get_files(self, instance):
         files = []
 
-        master_data = MasterData(instance.case)
+        master_data = MasterData.for_case(instance.case)
         municipality = Service.objects.filter(pk=master_data.municipality_slug).first()
 
         if municipality and municipality.logo:
-            files.append(("files", ("municipality_logo", municipality.logo.file.file)))
+            # read the logo into memory so the request can be retried, sent
+            # from another thread or serialized for a background task
+            with municipality.logo.open("rb") as logo:
+                files.append(("files", ("municipality_logo", logo.read())))
 
         return files
 
     def get_meta_data(self, instance, document, service):
-        master_data = MasterData(instance.case)
+        master_data = MasterData.for_case(instance.case)
         timezone = get_current_timezone()
 
         generated_at = localtime()
@@ -354,15 +367,22 @@ class DMSHandler:
 
         return f"{filename}.pdf"
 
-    def generate_pdf(
+    def get_merge_job(
         self,
         instance_id,
-        request,
+        user,
+        group,
         form_slug=None,
         document_id=None,
         template=None,
         for_additional_demand=None,
     ):
+        """Collect everything needed to merge the PDF of an instance.
+
+        `user` is the caluma user and `group` the camac group the data is
+        collected for. The returned job only consists of plain data so it can
+        be passed to `DMSClient.merge` directly or to another thread.
+        """
         instance, document = self.get_instance_and_document(
             instance_id, form_slug, document_id
         )
@@ -376,33 +396,78 @@ class DMSHandler:
                 % {"form_slug": document.form.slug}
             )
 
-        # merge pdf and store as attachment
-        auth = get_authorization_header(request)
-        dms_client = DMSClient(auth)
-        pdf = dms_client.merge(
-            self.get_data(
+        return {
+            "filename": self.get_filename(
+                instance_id,
+                str(document.form.name),
+                template,
+                for_additional_demand,
+            ),
+            "data": self.get_data(
                 instance,
                 document,
-                request.caluma_info.context.user,
-                request.group.service,
+                user,
+                group.service,
                 for_additional_demand=for_additional_demand,
             ),
-            template,
-            self.get_files(instance),
-            add_headers={"x-camac-group": str(request.group.pk)},
-        )
+            "template": template,
+            "files": self.get_files(instance),
+            "add_headers": {"x-camac-group": str(group.pk)},
+        }
 
-        filename = self.get_filename(
+    def generate_pdf(self, instance_id, request, *args, **kwargs):
+        job = self.get_merge_job(
             instance_id,
-            str(document.form.name),
-            template,
-            for_additional_demand,
+            request.caluma_info.context.user,
+            request.group,
+            *args,
+            **kwargs,
         )
+        filename = job.pop("filename")
+
+        # merge pdf and store as attachment
+        dms_client = DMSClient(get_authorization_header(request))
+
+        return pdf_file(dms_client.merge(**job), filename)
+
+    def generate_pdfs(self, instance_ids, request, **kwargs):
+        """Generate the PDFs of multiple instances concurrently.
 
-        _file = ContentFile(pdf, filename)
-        _file.content_type = "application/pdf"
+        The data of all instances is collected in the current thread while
+        only the requests to the document merge service run in parallel.
+        """
+        jobs = [
+            self.get_merge_job(
+                instance_id,
+                request.caluma_info.context.user,
+                request.group,
+                **kwargs,
+            )
+            for instance_id in instance_ids
+        ]
 
-        return _file
+        return [
+            pdf_file(pdf, filename)
+            for filename, pdf in merge_pdfs(get_authorization_header(request), jobs)
+        ]
+
+    def start_generate_pdfs(self, instance_ids, request, form_slug=None, template=None):
+        """Generate the PDFs of multiple instances in a django-q task.
+
+        Only the IDs are passed to the task which collects the data itself
+        (see `generate_pdfs_task`). Returns the ID of the task whose result is
+        the path of the ZIP archive in the default storage.
+        """
+        return async_task(
+            GENERATE_PDFS_TASK,
+            list(instance_ids),
+            request.user.pk,
+            request.group.pk,
+            form_slug=form_slug,
+            template=template,
+            group="DMS",
+            task_name=get_generate_pdfs_task_name(request),
+        )
 
     def convert_docx_to_pdf(self, request, attachment):
         auth = get_authorization_header(request)
@@ -411,10 +476,113 @@ class DMSHandler:
 
         filename = splitext(attachment.name)[0]
 
-        _file = ContentFile(pdf_binary, f"{filename}.pdf")
-        _file.content_type = "application/pdf"
+        return pdf_file(pdf_binary, f"{filename}.pdf")
+
+
+def pdf_file(content, filename):
+    _file = ContentFile(content, filename)
+    _file.content_type = "application/pdf"
+
+    return _file
+
+
+def merge_pdfs(auth_token, jobs):
+    """Merge the given jobs (see `DMSHandler.get_merge_job`) concurrently."""
+    jobs = [{**job} for job in jobs]
+    filenames = [job.pop("filename") for job in jobs]
+
+    return list(zip(filenames, DMSClient(auth_token).merge_many(jobs)))
 
-        return _file
+
+def zip_pdfs(pdfs):
+    """Pack the given `(filename, pdf)` tuples into a ZIP archive."""
+    buffer = io.BytesIO()
+
+    # PDFs are compressed already
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for filename, pdf in pdfs:
+            archive.writestr(filename, pdf)
+
+    return buffer.getvalue()
+
+
+GENERATE_PDFS_TASK = "camac.instance.document_merge_service.generate_pdfs_task"
+GENERATED_PDFS_DIR = "generated-pdfs"
+
+
+def get_generate_pdfs_task_name(request):
+    """Name of the PDF generation task, used to check who may fetch it."""
+    return f"generate-pdfs-{request.user.pk}-{request.group.pk}"
+
+
+def get_service_token():
+    response = requests.post(
+        settings.KEYCLOAK_OIDC_TOKEN_URL,
+        {
+            "grant_type": "client_credentials",
+            "client_id": settings.DOCUMENT_MERGE_SERVICE_CLIENT_ID,
+            "client_secret": settings.DOCUMENT_MERGE_SERVICE_CLIENT_SECRET,
+        },
+    )
+    response.raise_for_status()
+
+    return f"Bearer {response.json()['access_token']}"
+
+
+def generate_pdfs_task(instance_ids, user_id, group_id, form_slug=None, template=None):
+    """Generate the PDFs of the given instances and store them as ZIP archive.
+
+    The data is collected as the given user and group. The task authenticates
+    with its own client, so no token of the user is persisted in the task
+    queue. Returns the path of the archive in the default storage.
+    """
+    user = User.objects.get(pk=user_id)
+    group = Group.objects.select_related("service").get(pk=group_id)
+    caluma_user = BaseUser(username=user.username, group=group.service_id)
+    caluma_user.camac_group = group.pk
+
+    handler = DMSHandler()
+    jobs = [
+        handler.get_merge_job(
+            instance_id, caluma_user, group, form_slug=form_slug, template=template
+        )
+        for instance_id in instance_ids
+    ]
+    pdfs = merge_pdfs(get_service_token(), jobs)
+
+    return default_storage.save(
+        f"{GENERATED_PDFS_DIR}/{uuid4()}.zip", ContentFile(zip_pdfs(pdfs))
+    )
+
+
+@lru_cache(maxsize=None)
+def get_session():
+    """Return a shared session to the document merge service.
+
+    The session keeps connections alive and retries failed requests with an
+    exponential backoff. Merging a document has no side effects, so retrying
+    POST requests is safe.
+    """
+    retry = Retry(
+        total=settings.DOCUMENT_MERGE_SERVICE_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=[
+            status.HTTP_502_BAD_GATEWAY,
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            status.HTTP_504_GATEWAY_TIMEOUT,
+        ],
+        allowed_methods=["POST"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_maxsize=settings.DOCUMENT_MERGE_SERVICE_MAX_WORKERS, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
 
 
 class DMSClient:
@@ -423,11 +591,12 @@ class DMSClient:
         self.url = url
 
     def _make_dms_request(self, url, **kwargs):
-        response = requests.post(
+        response = get_session().post(
             url,
             data=kwargs.get("data", None),
             headers=kwargs.get("headers", None),
             files=kwargs.get("files", None),
+            timeout=settings.DOCUMENT_MERGE_SERVICE_TIMEOUT,
         )
 
         if response.status_code == status.HTTP_401_UNAUTHORIZED:
@@ -451,6 +620,17 @@ class DMSClient:
             files=files,
         )
 
+    def merge_many(self, jobs, max_workers=None):
+        """Merge multiple documents with a bounded number of parallel requests.
+
+        Each job is a dict of keyword arguments to `merge`. The results are
+        returned in the same order as the jobs.
+        """
+        with ThreadPoolExecutor(
+            max_workers=max_workers or settings.DOCUMENT_MERGE_SERVICE_MAX_WORKERS
+        ) as executor:
+            return list(executor.map(lambda job: self.merge(**job), jobs))
+
     def convert_docx_to_pdf(self, file):
         headers = {"authorization": self.auth_token}
         url = build_url(self.url, "/convert", trailing=False)
@@ -22,6 +22,7 @@ from camac.core.utils import (
     generate_dossier_nr,
     generate_sort_key,
     generate_special_id,
+    next_sequence_number,
 )
 from camac.instance.models import Instance, InstanceGroup
 from camac.permissions.events import Trigger
@@ -212,7 +213,9 @@ class CreateInstanceLogic:
                 [
                     str(identifier_start),
                     str(year).zfill(2),
-                    str(last_position + 1).zfill(seq_zero_padding),
+                    str(next_sequence_number(start, last_position)).zfill(
+                        seq_zero_padding
+                    ),
                 ]
             )
 
@@ -262,7 +265,9 @@ class CreateInstanceLogic:
                         str(identifier_start),
                         str(service_id),
                         str(year).zfill(2),
-                        str(last_position + 1).zfill(seq_zero_padding),
+                        str(next_sequence_number(start, last_position)).zfill(
+                            seq_zero_padding
+                        ),
                     ]
                 )
 
@@ -278,7 +283,9 @@ class CreateInstanceLogic:
                     [
                         str(identifier_start),
                         str(year).zfill(2),
-                        str(last_position + 1).zfill(seq_zero_padding),
+                        str(next_sequence_number(start, last_position)).zfill(
+                            seq_zero_padding
+                        ),
                     ]
                 )
 
@@ -1,7 +1,7 @@
-import django_excel
 from django.conf import settings
 from rest_framework.generics import ListAPIView
 
+from camac.export import StreamingExportResponse, get_file_format, serializer_rows
 from camac.instance.export.filters import (
     InstanceExportFilterBackend,
     InstanceExportFilterBackendBE,
@@ -47,6 +47,9 @@ class InstanceExportView(InstanceQuerysetMixin, ListAPIView):
 
     def get(self, request):
         queryset = self.filter_queryset(self.get_queryset())
-        data = self.get_serializer(queryset, many=True).data
 
-        return django_excel.make_response(django_excel.pe.Sheet(data), file_type="xlsx")
+        return StreamingExportResponse(
+            serializer_rows(self.get_serializer(), queryset),
+            filename="export",
+            file_format=get_file_format(request),
+        )
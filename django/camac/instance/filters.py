@@ -2,27 +2,21 @@ import re
 from functools import reduce
 
 from caluma.caluma_form.filters import SearchAnswersFilter
-from caluma.caluma_form.models import Answer, Document, Option
+from caluma.caluma_form.models import Answer, Document
 from caluma.caluma_workflow.models import Case, WorkItem
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import EMPTY_VALUES
 from django.db.models import (
-    Case as DjangoCase,
     Exists,
     F,
-    Func,
     OuterRef,
     Q,
     Subquery,
-    Value,
-    When,
 )
 from django.db.models.constants import LOOKUP_SEP
 from django.db.models.expressions import RawSQL
-from django.db.models.fields import CharField, TextField
-from django.db.models.functions import Cast, Coalesce, Replace
-from django.utils.translation import get_language
+from django.db.models.fields import TextField
 from django_filters.rest_framework import (
     BaseInFilter,
     BooleanFilter,
@@ -34,14 +28,12 @@ from django_filters.rest_framework import (
 )
 from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
-from camac.caluma.utils import visible_inquiries_expression
 from camac.constants import kt_uri as uri_constants
 from camac.filters import (
     CharMultiValueFilter,
     JSONFieldMultiValueFilter,
     NumberMultiValueFilter,
 )
-from camac.instance.export.filters import StringAggSubquery
 
 from ..core import models as core_models
 from ..responsible import models as responsible_models
@@ -227,153 +219,12 @@ class FormFieldListValueFilter(Filter):
 
 
 class InstanceKeywordSearchFilter(CharFilter):
-    def get_processed_form_fields(self):
-        # The form fields are converted to a text field,
-        # concatenated and then stripped of certain content
-        # to make the keyword search more accurate.
-
-        # Remove uuid key / value pairs, which occur in table fields
-        regex_uuid = Value(r'(, )?"uuid": "(\w|-)+"')
-        # Remove keys which occur in table fields
-        regex_keys = Value(r'"(\w|-)+": ')
-        # Remove null values in table fields that are casted
-        # to the string "null"
-        regex_null = Value(r"null")
-        # Remove escaping of quotes that are casted to \\"
-        regex_escaped_quotes = Value(r'\\"')
-        regex_flags = Value("gm")
-
-        regex_replacement_mapping = [
-            (regex_uuid, Value(r"")),
-            (regex_keys, Value(r"")),
-            (regex_null, Value(r'""')),
-            (regex_escaped_quotes, Value(r'"')),
-        ]
-
-        def regexp_replace(value, regex, replacement):
-            return Func(
-                value,
-                regex,
-                replacement,
-                regex_flags,
-                function="REGEXP_REPLACE",
-                output_field=TextField(),
-            )
-
-        processed_form_fields = Coalesce(
-            StringAggSubquery(
-                models.FormField.objects.get_queryset()
-                .filter(
-                    instance=OuterRef("pk"),
-                    value__isnull=False,
-                )
-                .visible_for(self.parent.request)
-                .annotate(value_as_text=Cast(F("value"), TextField()))
-                .values("value_as_text"),
-                column_name="value_as_text",
-                delimiter="|",
-            ),
-            Value(""),
-            output_field=TextField(),
-        )
-
-        # Apply all regex replacements to form field query
-        for regex, replacement in regex_replacement_mapping:
-            processed_form_fields = regexp_replace(
-                processed_form_fields, regex, replacement
-            )
-
-        return processed_form_fields
-
-    def get_processed_journal_entries(self):
-        return Coalesce(
-            StringAggSubquery(
-                models.JournalEntry.objects.filter(
-                    instance=OuterRef("pk"),
-                    text__isnull=False,
-                )
-                .visible_for(self.parent.request)
-                .values("text"),
-                column_name="text",
-                delimiter="|",
-            ),
-            Value(""),
-            output_field=TextField(),
-        )
-
-    def get_processed_inquiry_answers(self):
-        return Coalesce(
-            StringAggSubquery(
-                WorkItem.objects.filter(
-                    visible_inquiries_expression(self.parent.request.group),
-                    case__family__instance=OuterRef("pk"),
-                    status=WorkItem.STATUS_COMPLETED,
-                )
-                .annotate(
-                    answers=StringAggSubquery(
-                        Answer.objects.filter(
-                            question_id__in=[
-                                settings.DISTRIBUTION["QUESTIONS"]["STATUS"],
-                                settings.DISTRIBUTION["QUESTIONS"]["REQUEST"],
-                                settings.DISTRIBUTION["QUESTIONS"]["ANCILLARY_CLAUSES"],
-                                settings.DISTRIBUTION["QUESTIONS"]["REASON"],
-                                settings.DISTRIBUTION["QUESTIONS"]["RECOMMENDATION"],
-                                settings.DISTRIBUTION["QUESTIONS"]["HINT"],
-                            ],
-                            document=OuterRef("child_case__document"),
-                        )
-                        .annotate(
-                            value_as_text=DjangoCase(
-                                When(
-                                    question_id=settings.DISTRIBUTION["QUESTIONS"][
-                                        "STATUS"
-                                    ],
-                                    then=Option.objects.filter(
-                                        # `value` is a JSONBField that when casted to a
-                                        # CharField will add double quotes around the value. In
-                                        # order to properly match it with an option we need to
-                                        # remove those double quotes.
-                                        pk=Replace(
-                                            Cast(
-                                                OuterRef("value"),
-                                                output_field=CharField(),
-                                            ),
-                                            Value('"'),
-                                            Value(""),
-                                        )
-                                    ).values(f"label__{get_language()}")[:1],
-                                ),
-                                default=Cast(F("value"), TextField()),
-                            )
-                        )
-                        .values("value_as_text"),
-                        column_name="value_as_text",
-                        delimiter="|",
-                    ),
-                )
-                .values("answers"),
-                column_name="answers",
-                delimiter="|",
-            ),
-            Value(""),
-            output_field=TextField(),
-        )
+    def get_search_entries(self):
+        """Search entries (see `camac.instance.search`) visible to the user."""
+        return models.InstanceSearchEntry.objects.visible_for(self.parent.request)
 
-    def get_processed_issues(self):
-        return Coalesce(
-            StringAggSubquery(
-                models.Issue.objects.filter(
-                    instance=OuterRef("pk"),
-                    text__isnull=False,
-                )
-                .visible_for(self.parent.request)
-                .values("text"),
-                column_name="text",
-                delimiter="|",
-            ),
-            Value(""),
-            output_field=TextField(),
-        )
+    def contains(self, entries, value):
+        return Exists(entries.filter(instance=OuterRef("pk"), text__icontains=value))
 
     def filter(self, queryset, value, *args, **kwargs):
         if value in EMPTY_VALUES:
@@ -394,22 +245,12 @@ class InstanceKeywordSearchFilter(CharFilter):
 
     def filter_queryset(self, processed_values, queryset, value):
         # All search terms must be contained in either
-        # the form, journal entries or inquiry answers
-        filters = Q()
-        for val in processed_values:
-            filters &= (
-                Q(processed_form_fields__icontains=val)
-                | Q(processed_journal_entries__icontains=val)
-                | Q(processed_inquiry_answers__icontains=val)
-                | Q(processed_issues__icontains=val)
-            )
+        # the form, journal entries, inquiry answers or issues
+        entries = self.get_search_entries()
 
-        return queryset.annotate(
-            processed_form_fields=self.get_processed_form_fields(),
-            processed_journal_entries=self.get_processed_journal_entries(),
-            processed_inquiry_answers=self.get_processed_inquiry_answers(),
-            processed_issues=self.get_processed_issues(),
-        ).filter(filters)
+        return queryset.filter(
+            *[self.contains(entries, val) for val in processed_values]
+        )
 
 
 class CalumaInstanceKeywordSearchFilter(InstanceKeywordSearchFilter):
@@ -429,15 +270,15 @@ class CalumaInstanceKeywordSearchFilter(InstanceKeywordSearchFilter):
         # All search terms must be contained in either
         # the issues,  journal entries or inquiry answers
         filtered_documents = self.get_answers(queryset, value)
+        entries = self.get_search_entries().filter(
+            source=models.InstanceSearchEntry.SOURCE_JOURNAL_ENTRY
+        )
+
         filters = Q()
         for val in processed_values:
-            filters &= Q(processed_journal_entries__icontains=val)
-
-        filters = filters | Q(case__document__in=filtered_documents)
+            filters &= Q(self.contains(entries, val))
 
-        return queryset.annotate(
-            processed_journal_entries=self.get_processed_journal_entries(),
-        ).filter(filters)
+        return queryset.filter(filters | Q(case__document__in=filtered_documents))
 
 
 class InstanceSubmitDateFilter(DateFilter):
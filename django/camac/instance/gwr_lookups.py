@@ -69,7 +69,7 @@ def dwelling_data(dwelling):
 class GwrSerializer(serializers.Serializer):
     def __init__(self, case, *args, **kwargs):
         super().__init__(case, *args, **kwargs)
-        self.master_data = MasterData(case)
+        self.master_data = MasterData.for_case(case)
 
     officialConstructionProjectFileNo = serializers.SerializerMethodField()
 
@@ -0,0 +1,55 @@
+from statistics import median
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from camac.instance import validators
+from camac.instance.models import Instance
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure compiling the active expressions of the form config and "
+        "evaluating the active questions of camac-ng instances"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--instances", type=int, default=50, help="Number of instances to evaluate"
+        )
+        parser.add_argument(
+            "--runs", type=int, default=3, help="Number of runs per instance"
+        )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        compiled = validators.CompiledFormConfig(settings.FORM_CONFIG)
+        self.stdout.write(
+            f"compiled {len(compiled.expressions)} active expressions in "
+            f"{(perf_counter() - start) * 1000:.1f} ms"
+        )
+
+        instances = Instance.objects.filter(
+            form__name__in=settings.FORM_CONFIG["forms"].keys()
+        ).select_related("form")[: options["instances"]]
+
+        timings = []
+        for instance in instances:
+            validator = validators.FormDataValidator(instance)
+
+            for _ in range(options["runs"]):
+                validator.active_question_cache = {}
+                start = perf_counter()
+                validator.get_active_modules_questions()
+                timings.append(perf_counter() - start)
+
+        if not timings:  # pragma: no cover
+            self.stdout.write("No instances found")
+            return
+
+        self.stdout.write(
+            f"evaluated {len(instances)} instances: "
+            f"median {median(timings) * 1000:8.1f} ms, "
+            f"max {max(timings) * 1000:8.1f} ms"
+        )
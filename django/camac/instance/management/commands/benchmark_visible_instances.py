@@ -0,0 +1,99 @@
+from statistics import median
+from time import perf_counter
+
+from alexandria.core.models import Document as AlexandriaDocument
+from caluma.caluma_form.models import Document
+from caluma.caluma_workflow.models import Case, WorkItem
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.http import HttpRequest, QueryDict
+from django.test.utils import override_settings
+
+from camac.alexandria.extensions.visibilities import CustomVisibility
+from camac.instance.filters import CalumaInstanceFilterSet
+from camac.instance.utils import visible_instance_ids
+from camac.user.models import Group, User
+
+TARGETS = {
+    "caluma case": lambda ids: Case.objects.filter(family__instance__pk__in=ids),
+    "caluma document": lambda ids: Document.objects.filter(
+        Q(family__case__family__instance__pk__in=ids)
+        | Q(family__work_item__case__family__instance__pk__in=ids)
+    ),
+    "caluma work item": lambda ids: WorkItem.objects.filter(
+        case__family__instance__pk__in=ids
+    ),
+    "alexandria document": lambda ids: AlexandriaDocument.objects.filter(
+        instance_document__instance__in=ids
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the visible instances filter of the Caluma and Alexandria "
+        "visibilities as materialised ID list vs. as subquery"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("user", type=str, help="Username of the requesting user")
+        parser.add_argument("group", type=int, help="ID of the requesting group")
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Number of runs per measurement"
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            default=False,
+            help="Output the query plans (EXPLAIN ANALYZE) as well",
+        )
+
+    def handle(self, *args, **options):
+        request = HttpRequest()
+        request.user = User.objects.get(username=options["user"])
+        request.group = Group.objects.select_related("role", "service").get(
+            pk=options["group"]
+        )
+        request.query_params = QueryDict()
+
+        visibility = CustomVisibility()
+        visibility.request = request
+
+        visible_instances = CalumaInstanceFilterSet(
+            data={}, queryset=visibility.get_queryset(), request=request
+        ).qs
+
+        self.stdout.write(f"Visible instances: {visible_instances.count()}")
+
+        for name, build_queryset in TARGETS.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+
+            for mode, materialize in [("list", True), ("subquery", False)]:
+                # the subquery is only used with the optimisations enabled
+                with override_settings(
+                    APPLICATION={
+                        **settings.APPLICATION,
+                        "VISIBILITY_PERFORMANCE_OPTIMISATIONS_ACTIVE": True,
+                    }
+                ):
+                    self._measure(
+                        visible_instances, build_queryset, mode, materialize, options
+                    )
+
+    def _measure(self, visible_instances, build_queryset, mode, materialize, options):
+        timings = []
+        for _ in range(options["runs"]):
+            start = perf_counter()
+            ids = visible_instance_ids(visible_instances, materialize)
+            build_queryset(ids).count()
+            timings.append(perf_counter() - start)
+
+        self.stdout.write(
+            f"  {mode:<10} median {median(timings) * 1000:8.1f} ms, "
+            f"min {min(timings) * 1000:8.1f} ms"
+        )
+
+        if options["explain"]:
+            ids = visible_instance_ids(visible_instances, materialize)
+            self.stdout.write(build_queryset(ids).explain(analyze=True))
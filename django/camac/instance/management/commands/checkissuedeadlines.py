@@ -5,6 +5,7 @@ from django.core.mail import EmailMessage, get_connection
 from django.core.management.base import BaseCommand, CommandError
 
 from camac.instance.models import Issue
+from camac.jinja import get_template
 from camac.notification.models import NotificationTemplate
 from camac.notification.serializers import IssueMergeSerializer
 
@@ -24,7 +25,7 @@ class Command(BaseCommand):
 
     def _merge(self, value, issue):
         try:
-            value_template = jinja2.Template(value)
+            value_template = get_template(value)
             data = IssueMergeSerializer(issue).data
             return value_template.render(data)
         except jinja2.TemplateError as e:
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from camac.instance.document_merge_service import GENERATED_PDFS_DIR
+
+
+class Command(BaseCommand):
+    help = "Delete generated PDF archives which were never fetched"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=24,
+            help="Only delete archives older than the given number of hours",
+        )
+
+    def handle(self, *args, **options):
+        if not default_storage.exists(GENERATED_PDFS_DIR):
+            return
+
+        threshold = timezone.now() - timedelta(hours=options["hours"])
+        _, filenames = default_storage.listdir(GENERATED_PDFS_DIR)
+        deleted = 0
+
+        for filename in filenames:
+            path = f"{GENERATED_PDFS_DIR}/{filename}"
+
+            if default_storage.get_modified_time(path) < threshold:
+                default_storage.delete(path)
+                deleted += 1
+
+        self.stdout.write(f"Deleted {deleted} generated PDF archives")
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from camac.instance.models import Instance
+from camac.instance.projection import update_projections
+
+
+class Command(BaseCommand):
+    help = "(Re-)compute the list projection of all instances"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of instances to update per batch",
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            default=False,
+            help="Only compute projections of instances without one",
+        )
+
+    def handle(self, *args, **options):
+        instances = Instance.objects.order_by("pk")
+
+        if options["missing"]:
+            instances = instances.filter(list_projection__isnull=True)
+
+        ids = list(instances.values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+
+        for offset in range(0, len(ids), batch_size):
+            update_projections(ids[offset : offset + batch_size])
+
+        self.stdout.write(f"Updated projections of {len(ids)} instances")
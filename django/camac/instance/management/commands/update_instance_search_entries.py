@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from camac.instance.models import Instance
+from camac.instance.search import update_search_entries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search entries of the keyword search of all instances"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of instances to update per batch",
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            default=False,
+            help="Only build the search entries of instances without any",
+        )
+
+    def handle(self, *args, **options):
+        instances = Instance.objects.order_by("pk")
+
+        if options["missing"]:
+            instances = instances.filter(search_entries__isnull=True)
+
+        ids = list(instances.values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+
+        for offset in range(0, len(ids), batch_size):
+            update_search_entries(ids[offset : offset + batch_size])
+
+        self.stdout.write(f"Updated search entries of {len(ids)} instances")
@@ -0,0 +1,35 @@
+from caluma.caluma_workflow.models import WorkItem
+from django.core.management.base import BaseCommand
+
+from camac.instance.models import PublicationIndexEntry
+from camac.instance.publication import (
+    NEIGHBORS_TASK,
+    PUBLICATION_TASK,
+    invalidate_public_list_cache,
+    is_enabled,
+    update_publication_index,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild the publication index of the public instance list"
+
+    def handle(self, *args, **options):
+        if not is_enabled():  # pragma: no cover
+            self.stdout.write("Publications are not managed in Caluma")
+            return
+
+        work_items = WorkItem.objects.filter(
+            task_id__in=[PUBLICATION_TASK, NEIGHBORS_TASK]
+        ).select_related("case")
+
+        PublicationIndexEntry.objects.exclude(work_item__in=work_items).delete()
+
+        for work_item in work_items.iterator():
+            update_publication_index(work_item)
+
+        invalidate_public_list_cache()
+
+        self.stdout.write(
+            f"Indexed {PublicationIndexEntry.objects.count()} publication ranges"
+        )
@@ -1,3 +1,6 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from operator import attrgetter
 
@@ -5,10 +8,116 @@ from caluma.caluma_form import models as form_models
 from caluma.caluma_form.validators import DocumentValidator
 from dateutil.parser import ParserError, parse as dateutil_parse
 from django.conf import settings
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import get_language
 
 from camac.core.models import MultilingualModel
-from camac.utils import get_dict_item
+
+# master data objects per case pk, shared within a `master_data_scope`
+_scope = ContextVar("master_data_scope", default=None)
+
+
+@contextmanager
+def master_data_scope():
+    """Share master data objects per case within the block.
+
+    Every request runs in a scope (see `MasterDataMiddleware`), jobs outside
+    of a request can open their own. Nested scopes reuse the outer one.
+    """
+    if _scope.get() is not None:
+        yield
+        return
+
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_master_data_scope(sender, **kwargs):
+    # resolved values may depend on any model, so every write invalidates
+    # the objects shared in the current scope
+    if scope := _scope.get():
+        scope.clear()
+
+
+def _get_config(lookup_key):
+    config = settings.MASTER_DATA["CONFIG"].get(lookup_key)
+
+    if not config:
+        raise AttributeError(
+            f"Key '{lookup_key}' is not configured in master data config. Available keys are: {', '.join(settings.MASTER_DATA['CONFIG'].keys())}"
+        )
+
+    return config
+
+
+def _get_parser_prefetch_lookups(options, prefix):
+    parser = options.get("value_parser")
+    parser_name = parser[0] if isinstance(parser, tuple) else parser
+
+    if parser_name == "option":
+        return {f"{prefix}__answers__question__options"}
+    elif parser_name == "dynamic_option":
+        return {f"{prefix}__dynamicoption_set"}
+
+    return set()
+
+
+def _get_prefetch_lookups(config, prefix=None):
+    """Get the lookups to prefetch on a case to resolve the given config."""
+    resolver, *args = config
+    options = args[1] if len(args) > 1 else {}
+
+    if resolver in ["answer", "table", "baukontrolle"]:
+        if prefix is None:
+            prefix = (
+                "work_items__document"
+                if resolver == "baukontrolle" or options.get("document_from_work_item")
+                else "document"
+            )
+
+        lookups = {f"{prefix}__answers"} | _get_parser_prefetch_lookups(options, prefix)
+
+        if resolver == "answer":
+            return lookups
+
+        row_prefix = f"{prefix}__answers__answerdocument_set__document"
+        column_mapping = (
+            {"value": (args[0], {})}
+            if resolver == "baukontrolle"
+            else options.get("column_mapping", {})
+        )
+
+        for lookup_config in column_mapping.values():
+            if lookup_config == "pk":
+                continue
+
+            lookup, cell_options = (
+                lookup_config
+                if isinstance(lookup_config, tuple)
+                else (lookup_config, {})
+            )
+            lookups |= _get_prefetch_lookups(
+                ("answer", lookup, cell_options), row_prefix
+            )
+
+        return lookups
+
+    return {
+        "first_workflow_entry": {"instance__workflowentry_set"},
+        "last_workflow_entry": {"instance__workflowentry_set"},
+        "php_answer": {"instance__answers"},
+        "ng_answer": {"instance__fields"},
+        "ng_table": {"instance__fields"},
+        "instance_property": {"instance"},
+        "form_name": {"document__form"},
+    }.get(resolver, set())
 
 
 @dataclass
@@ -17,18 +126,59 @@ class MasterData(object):
     visible_questions: dict = field(default_factory=dict)
     validation_context: dict = field(default_factory=dict)
     disable_answer_visibility: bool = field(default=False)
+    _resolved: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _answers: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def for_case(cls, case):
+        """Get the master data of the case, shared within a `master_data_scope`."""
+        scope = _scope.get()
+
+        if scope is None:
+            return cls(case)
+
+        if case.pk not in scope:
+            scope[case.pk] = cls(case)
+
+        return scope[case.pk]
+
+    @classmethod
+    def for_cases(cls, cases, keys=None):
+        """Get the master data of multiple cases.
+
+        Everything needed to resolve the given keys (all configured keys if
+        not given) is prefetched for all cases at once.
+        """
+        cases = list(cases)
+        lookups = set()
+
+        for key in keys or settings.MASTER_DATA["CONFIG"].keys():
+            lookups |= _get_prefetch_lookups(_get_config(key))
+
+        prefetch_related_objects(cases, *sorted(lookups))
+
+        scope = _scope.get()
+        master_data = [cls(case) for case in cases]
+
+        if scope is not None:
+            scope.update({md.case.pk: md for md in master_data})
+
+        return master_data
 
     def __getattr__(self, lookup_key):
-        config = get_dict_item(
-            settings.MASTER_DATA, f"CONFIG.{lookup_key}", default=None
-        )
+        if lookup_key.startswith("_"):
+            raise AttributeError(lookup_key)
 
-        if not config:
-            raise AttributeError(
-                f"Key '{lookup_key}' is not configured in master data config. Available keys are: {', '.join(settings.MASTER_DATA['CONFIG'].keys())}"
-            )
+        # resolved values may be translated
+        cache_key = (lookup_key, get_language())
+
+        if cache_key not in self._resolved:
+            self._resolved[cache_key] = self._resolve(lookup_key)
 
-        resolver, *args = config
+        return self._resolved[cache_key]
+
+    def _resolve(self, lookup_key):
+        resolver, *args = _get_config(lookup_key)
         fn = getattr(self, f"{resolver}_resolver", None)
 
         if not fn:
@@ -44,6 +194,28 @@ class MasterData(object):
 
         return fn(lookup, **kwargs)
 
+    def _get_answers(self, document, lookup):
+        """Get the answers to the given questions in the order of the document."""
+        index = self._answers.get(document.pk)
+
+        if index is None:
+            index = defaultdict(list)
+            for position, answer in enumerate(document.answers.all()):
+                index[answer.question_id].append((position, answer))
+
+            self._answers[document.pk] = index
+
+        if len(lookup) == 1:
+            return [answer for _, answer in index.get(lookup[0], [])]
+
+        return [
+            answer
+            for _, answer in sorted(
+                (entry for slug in lookup for entry in index.get(slug, [])),
+                key=lambda entry: entry[0],
+            )
+        ]
+
     def _parse_value(
         self, value, default=None, value_parser=None, answer=None, **kwargs
     ):
@@ -213,9 +385,8 @@ class MasterData(object):
 
         answer = next(
             filter(
-                lambda answer: answer.question_id in lookup
-                and self._answer_is_visible(answer),
-                document.answers.all() if document else [],
+                self._answer_is_visible,
+                self._get_answers(document, lookup) if document else [],
             ),
             None,
         )
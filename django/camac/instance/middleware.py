@@ -0,0 +1,12 @@
+from camac.instance.master_data import master_data_scope
+
+
+class MasterDataMiddleware(object):
+    """Middleware sharing master data objects per case within a request."""
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with master_data_scope():
+            return self.get_response(request)
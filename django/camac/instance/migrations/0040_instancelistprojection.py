@@ -0,0 +1,49 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("instance", "0039_instance_rejection_feedback"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InstanceListProjection",
+            fields=[
+                (
+                    "instance",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="list_projection",
+                        serialize=False,
+                        to="instance.instance",
+                    ),
+                ),
+                ("is_paper", models.BooleanField(default=False)),
+                ("is_modification", models.BooleanField(default=False)),
+                ("is_coordinated", models.BooleanField(default=False)),
+                (
+                    "migration_type",
+                    models.CharField(
+                        blank=True, help_text="Option slug", max_length=255, null=True
+                    ),
+                ),
+                (
+                    "import_type",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "decision",
+                    models.CharField(
+                        blank=True, help_text="Option slug", max_length=255, null=True
+                    ),
+                ),
+                ("decision_date", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.16 on 2026-10-18 15:40
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def populate_search_entries(apps, schema_editor):
+    # the entries are built by the same code which maintains them afterwards
+    from camac.instance.search import update_search_entries
+
+    Instance = apps.get_model("instance", "Instance")
+    ids = list(Instance.objects.order_by("pk").values_list("pk", flat=True))
+
+    for offset in range(0, len(ids), 500):
+        update_search_entries(ids[offset : offset + 500])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("caluma_workflow", "0027_add_modified_by_user_group"),
+        ("user", "0028_service_slug"),
+        ("instance", "0040_instancelistprojection"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name="InstanceSearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("form_field", "Form field"),
+                            ("journal_entry", "Journal entry"),
+                            ("issue", "Issue"),
+                            ("inquiry", "Inquiry"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("key", models.CharField(max_length=500)),
+                ("text", models.TextField()),
+                ("visibility", models.CharField(max_length=16, null=True)),
+                (
+                    "instance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_entries",
+                        to="instance.instance",
+                    ),
+                ),
+                (
+                    "service",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="user.service",
+                    ),
+                ),
+                (
+                    "work_item",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="caluma_workflow.workitem",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["text"],
+                        name="instance_search_text_trgm",
+                        opclasses=["gin_trgm_ops"],
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="instancesearchentry",
+            constraint=models.UniqueConstraint(
+                fields=("instance", "source", "key"),
+                name="unique_instance_search_entry",
+            ),
+        ),
+        migrations.RunPython(populate_search_entries, migrations.RunPython.noop),
+    ]
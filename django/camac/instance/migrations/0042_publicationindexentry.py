@@ -0,0 +1,79 @@
+# Generated by Django 4.2.16 on 2026-10-18 17:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_publication_index(apps, schema_editor):
+    # the index is built by the same code which maintains it afterwards
+    from caluma.caluma_workflow.models import WorkItem
+
+    from camac.instance import publication
+
+    if not publication.is_enabled():
+        return
+
+    work_items = WorkItem.objects.filter(
+        task_id__in=[publication.PUBLICATION_TASK, publication.NEIGHBORS_TASK],
+        status=WorkItem.STATUS_COMPLETED,
+    ).select_related("case")
+
+    for work_item in work_items.iterator():
+        publication.update_publication_index(work_item)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("caluma_workflow", "0027_add_modified_by_user_group"),
+        ("instance", "0041_instancesearchentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublicationIndexEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                ("access_key", models.CharField(max_length=255, null=True)),
+                (
+                    "instance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="publication_index_entries",
+                        to="instance.instance",
+                    ),
+                ),
+                (
+                    "work_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="caluma_workflow.workitem",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["start_date", "end_date"],
+                        name="publication_index_dates",
+                    ),
+                    models.Index(
+                        fields=["access_key"],
+                        name="publication_index_access_key",
+                        opclasses=["varchar_pattern_ops"],
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_publication_index, migrations.RunPython.noop),
+    ]
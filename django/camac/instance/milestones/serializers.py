@@ -95,7 +95,7 @@ class MilestonesSerializer(serializers.Serializer):
     def __init__(self, instance, *args, **kwargs):
         super().__init__(instance, *args, **kwargs)
 
-        instance._master_data = MasterData(instance.case)
+        instance._master_data = MasterData.for_case(instance.case)
         instance._child_cases = list(Case.objects.filter(family=instance.case))
         instance._work_items = list(
             WorkItem.objects.filter(case=instance.case).prefetch_related(
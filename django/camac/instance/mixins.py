@@ -1,9 +1,8 @@
 import logging
 
-from caluma.caluma_form.models import Answer
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
-from django.db.models import Exists, OuterRef, Q
+from django.db.models import Q
 from django.db.models.constants import LOOKUP_SEP
 from django.utils import timezone
 from django.utils.translation import gettext as _
@@ -279,59 +278,16 @@ class InstanceQuerysetMixin(object):
             public_access_key = self._get_request().META.get(
                 "HTTP_X_CAMAC_PUBLIC_ACCESS_KEY"
             )
+            published = models.PublicationIndexEntry.objects.published(
+                public_access_key
+            )
 
-            filters = {
-                "task_id": "fill-publication",
-                "meta__is-published": True,
-                "status": WorkItem.STATUS_COMPLETED,
-            }
-            ranges = settings.PUBLICATION.get("RANGE_QUESTIONS")
-            publish_question = settings.PUBLICATION.get("PUBLISH_QUESTION")
-
-            if public_access_key:
-                filters.update(
-                    {
-                        "task_id": "information-of-neighbors",
-                        "document__pk__startswith": public_access_key,
-                    }
-                )
-                ranges = [
-                    (
-                        "information-of-neighbors-start-date",
-                        "information-of-neighbors-end-date",
-                    )
-                ]
-
-            range_filters = Q()
-            for start_question, end_question in ranges:
-                range_filters |= Q(
-                    Exists(
-                        Answer.objects.filter(
-                            document_id=OuterRef("document_id"),
-                            question_id=start_question,
-                            date__lte=timezone.now(),
-                        )
-                    )
-                    & Exists(
-                        Answer.objects.filter(
-                            document_id=OuterRef("document_id"),
-                            question_id=end_question,
-                            date__gte=timezone.now(),
-                        )
-                    )
-                )
-
-            public_cases = WorkItem.objects.filter(**filters).filter(range_filters)
-
-            if publish_question:
-                public_cases = public_cases.filter(
-                    document__answers__question_id=publish_question,
-                    document__answers__value=settings.PUBLICATION.get("PUBLISH_ANSWER"),
-                )
-
-            public_cases = list(public_cases.values_list("case__family", flat=True))
             return queryset.filter(
-                **{self._get_instance_filter_expr("case__pk__in"): public_cases}
+                **{
+                    self._get_instance_filter_expr("pk", "in"): published.values(
+                        "instance_id"
+                    )
+                }
             )
         elif settings.PUBLICATION.get("BACKEND") == "camac-ng":
             return (
@@ -4,8 +4,10 @@ from functools import cached_property
 import reversion
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import Q
+from django.utils import timezone
 
 from camac.core.models import HistoryActionConfig
 from camac.core.utils import canton_aware
@@ -334,7 +336,7 @@ class Instance(models.Model):
 
     @cached_property
     def municipality(self):
-        md = MasterData(self.case)
+        md = MasterData.for_case(self.case)
 
         if settings.APPLICATION_NAME == "kt_uri":
             communal_federal_number = md.municipality_slug
@@ -376,6 +378,173 @@ class InstanceAlexandriaDocument(models.Model):
         unique_together = (("instance", "document"),)
 
 
+class InstanceListProjection(models.Model):
+    """Derived values of an instance displayed in the instance list.
+
+    The values are computed from the Caluma case and the services of the
+    instance and don't depend on the requesting user or language. They are
+    maintained by `camac.instance.projection`.
+    """
+
+    instance = models.OneToOneField(
+        Instance, models.CASCADE, primary_key=True, related_name="list_projection"
+    )
+    is_paper = models.BooleanField(default=False)
+    is_modification = models.BooleanField(default=False)
+    is_coordinated = models.BooleanField(default=False)
+    migration_type = models.CharField(
+        max_length=255, null=True, blank=True, help_text="Option slug"
+    )
+    import_type = models.CharField(max_length=255, null=True, blank=True)
+    decision = models.CharField(
+        max_length=255, null=True, blank=True, help_text="Option slug"
+    )
+    decision_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class InstanceSearchEntryQuerySet(models.QuerySet):
+    def visible_for(self, request):
+        """Entries visible to the group of the request.
+
+        Applies the same visibility as the sources of the entries (see
+        `visible_for` of form fields, journal entries and issues and
+        `visible_inquiries_expression`).
+        """
+        group = request.group
+        role = get_role_name(group)
+
+        query_filter = models.Q(
+            source=InstanceSearchEntry.SOURCE_FORM_FIELD,
+            key__in=visible_form_field_names(group),
+        )
+
+        if journal_filter := journal_entry_visibility_filter(group):
+            query_filter |= (
+                models.Q(source=InstanceSearchEntry.SOURCE_JOURNAL_ENTRY)
+                & journal_filter
+            )
+
+        if role and role != "public":
+            query_filter |= models.Q(
+                source=InstanceSearchEntry.SOURCE_ISSUE, service=group.service
+            )
+
+        if group and group.service:
+            from camac.caluma.utils import visible_inquiries_expression
+
+            query_filter |= models.Q(
+                source=InstanceSearchEntry.SOURCE_INQUIRY,
+                work_item__in=WorkItem.objects.filter(
+                    visible_inquiries_expression(group)
+                ).values("pk"),
+            )
+
+        return self.filter(query_filter)
+
+
+class InstanceSearchEntry(models.Model):
+    """Searchable text of an instance for the keyword search.
+
+    Every form field, journal entry, issue and completed inquiry of an
+    instance has an entry with its text and the attributes needed to apply
+    the visibility of its source. The entries are maintained by
+    `camac.instance.search`.
+    """
+
+    SOURCE_FORM_FIELD = "form_field"
+    SOURCE_JOURNAL_ENTRY = "journal_entry"
+    SOURCE_ISSUE = "issue"
+    SOURCE_INQUIRY = "inquiry"
+    SOURCE_CHOICES = (
+        (SOURCE_FORM_FIELD, "Form field"),
+        (SOURCE_JOURNAL_ENTRY, "Journal entry"),
+        (SOURCE_ISSUE, "Issue"),
+        (SOURCE_INQUIRY, "Inquiry"),
+    )
+
+    instance = models.ForeignKey(
+        Instance, models.CASCADE, related_name="search_entries"
+    )
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    # name of the form field or primary key of the source
+    key = models.CharField(max_length=500)
+    text = models.TextField()
+    service = models.ForeignKey(
+        "user.Service", models.DO_NOTHING, related_name="+", null=True
+    )
+    visibility = models.CharField(max_length=16, null=True)
+    work_item = models.ForeignKey(
+        "caluma_workflow.WorkItem", models.CASCADE, related_name="+", null=True
+    )
+    objects = InstanceSearchEntryQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["instance", "source", "key"],
+                name="unique_instance_search_entry",
+            )
+        ]
+        indexes = [
+            GinIndex(
+                fields=["text"],
+                name="instance_search_text_trgm",
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
+
+
+class PublicationIndexEntryQuerySet(models.QuerySet):
+    def published(self, access_key=None):
+        """Entries of currently running publications.
+
+        Without an access key, only the public publications are returned.
+        With an access key, only the information of neighbors whose document
+        starts with the given key is returned.
+        """
+        today = timezone.localdate()
+        queryset = self.filter(start_date__lte=today, end_date__gte=today)
+
+        if access_key:
+            return queryset.filter(access_key__startswith=access_key)
+
+        return queryset.filter(access_key__isnull=True)
+
+
+class PublicationIndexEntry(models.Model):
+    """Date range of a published Caluma publication of an instance.
+
+    Every completed and published publication work item has an entry per
+    configured range of start and end date. The entries are maintained by
+    `camac.instance.publication`.
+    """
+
+    instance = models.ForeignKey(
+        Instance, models.CASCADE, related_name="publication_index_entries"
+    )
+    work_item = models.ForeignKey(
+        "caluma_workflow.WorkItem", models.CASCADE, related_name="+"
+    )
+    start_date = models.DateField()
+    end_date = models.DateField()
+    # primary key of the document of an information of neighbors
+    access_key = models.CharField(max_length=255, null=True)
+    objects = PublicationIndexEntryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["start_date", "end_date"], name="publication_index_dates"
+            ),
+            models.Index(
+                fields=["access_key"],
+                name="publication_index_access_key",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
+
 class InstanceResponsibility(models.Model):
     instance = models.ForeignKey(
         Instance, models.CASCADE, related_name="responsibilities"
@@ -430,22 +599,26 @@ class JournalEntryQuerySet(models.QuerySet):
         associated instance is handled in the instance queryset mixin.
         """
 
-        group = request.group
-        role = get_role_name(group)
-        # TODO applicants or public users currently don't have access to journal entries at all.
-        # Giving them access might require a dedicated "applicant" role in our permission layer?
-        if not role or role == "public":
-            return self.none()
+        query_filter = journal_entry_visibility_filter(request.group)
 
-        query_filter = models.Q(visibility="all")
+        return self.filter(query_filter) if query_filter else self.none()
 
-        if group != settings.APPLICATION["PORTAL_GROUP"]:
-            query_filter |= models.Q(
-                visibility="own_organization", service=group.service
-            )
-            query_filter |= models.Q(visibility="authorities")
 
-        return self.filter(query_filter)
+def journal_entry_visibility_filter(group):
+    """Filter for journal entries (or search entries of them) visible to the group."""
+    role = get_role_name(group)
+    # TODO applicants or public users currently don't have access to journal entries at all.
+    # Giving them access might require a dedicated "applicant" role in our permission layer?
+    if not role or role == "public":
+        return None
+
+    query_filter = models.Q(visibility="all")
+
+    if group != settings.APPLICATION["PORTAL_GROUP"]:
+        query_filter |= models.Q(visibility="own_organization", service=group.service)
+        query_filter |= models.Q(visibility="authorities")
+
+    return query_filter
 
 
 class HistoryEntry(core_models.MultilingualModel, models.Model):
@@ -574,24 +747,29 @@ class FormFieldQuerySet(models.QuerySet):
         on the form field. General visibility logic regarding the associated
         instance is handled in the instance queryset mixin.
         """
-        role = get_role_name(request.group) or "applicant"
-        questions = [
-            question
-            for question, value in settings.FORM_CONFIG["questions"].items()
-            # all permissions may read per default once they have access to instance
-            if role
-            in value.get(
-                "restrict",
-                [
-                    "applicant",
-                    "public_reader",
-                    "reader",
-                    "canton",
-                    "municipality",
-                    "service",
-                    "support",
-                    "public",
-                ],
-            )
-        ]
-        return self.filter(name__in=questions)
+        return self.filter(name__in=visible_form_field_names(request.group))
+
+
+def visible_form_field_names(group):
+    """Names of the form fields the role of the group may read."""
+    role = get_role_name(group) or "applicant"
+
+    return [
+        question
+        for question, value in settings.FORM_CONFIG["questions"].items()
+        # all permissions may read per default once they have access to instance
+        if role
+        in value.get(
+            "restrict",
+            [
+                "applicant",
+                "public_reader",
+                "reader",
+                "canton",
+                "municipality",
+                "service",
+                "support",
+                "public",
+            ],
+        )
+    ]
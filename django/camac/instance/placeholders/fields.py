@@ -7,7 +7,7 @@ from alexandria.core import models as alexandria_models
 from caluma.caluma_form.models import Answer, AnswerDocument, Document, Question
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
-from django.db.models import Exists, OuterRef, Q, Sum
+from django.db.models import Exists, OuterRef, Q
 from django.db.models.fields.files import ImageFieldFile
 from django.utils import timezone
 from django.utils.timezone import get_current_timezone
@@ -203,11 +203,7 @@ class BillingEntriesField(AliasedMixin, serializers.ReadOnlyField):
 
     def to_representation(self, value):
         if self.total:
-            return self.format_rate(
-                value.aggregate(Sum("final_rate")).get("final_rate__sum")
-                if value
-                else 0
-            )
+            return self.format_rate(value.totals()["all"]["total"])
 
         data = []
 
@@ -1,8 +1,10 @@
+import copy
 import csv
 import itertools
 import json
 import re
 from collections import OrderedDict
+from functools import lru_cache
 
 from caluma.caluma_form.models import Answer
 from caluma.caluma_workflow.models import WorkItem
@@ -12,7 +14,10 @@ from django.utils.translation import get_language, gettext_noop as _
 from rest_framework import serializers
 
 from camac.caluma.api import CalumaApi
-from camac.core.translations import get_translations_canton_aware
+from camac.core.translations import (
+    get_available_languages,
+    get_translations_canton_aware,
+)
 from camac.user.models import Service
 from camac.utils import build_url, clean_join
 
@@ -29,11 +34,94 @@ def sanitize_value(value):
     return value if value is not None else ""
 
 
+@lru_cache(maxsize=None)
+def _get_aliases(serializer_class, application_name, short_name, languages):
+    aliases = {}
+
+    for name, field in serializer_class._declared_fields.items():
+        if name in serializer_class.Meta.exclude:
+            continue
+
+        keys = {name.upper()}
+        for alias_config in field.aliases:
+            for alias in get_translations_canton_aware(alias_config).values():
+                keys.add(alias.upper())
+
+        nested_aliases = {
+            key: list(
+                itertools.chain(
+                    *[
+                        get_translations_canton_aware(alias).values()
+                        for alias in alias_config
+                    ]
+                )
+            )
+            for key, alias_config in field.nested_aliases.items()
+        }
+
+        aliases[name] = (sorted(keys), nested_aliases)
+
+    return aliases
+
+
+def get_placeholder_name(placeholder):
+    """Name of the top level placeholder of e.g. `EINSPRECHENDE[].ADRESSE`."""
+    return re.split(r"[\[.]", placeholder.strip(), maxsplit=1)[0].upper()
+
+
 class DMSPlaceholdersSerializer(serializers.Serializer):
-    def __init__(self, instance, *args, **kwargs):
+    """Placeholders of an instance for the document merge service.
+
+    If `placeholders` is given, only the fields needed for those placeholders
+    (referenced by any of their aliases) are computed.
+    """
+
+    def __init__(self, instance, *args, placeholders=None, **kwargs):
         super().__init__(instance, *args, **kwargs)
 
-        instance._master_data = MasterData(instance.case)
+        instance._master_data = MasterData.for_case(instance.case)
+
+        self.placeholder_fields = (
+            self.get_field_names(placeholders) if placeholders is not None else None
+        )
+
+    @classmethod
+    def get_aliases(cls):
+        """Uppercase aliases and parsed nested aliases per field name.
+
+        Computed once per process for every configuration.
+        """
+        return _get_aliases(
+            cls,
+            settings.APPLICATION_NAME,
+            settings.APPLICATION["SHORT_NAME"],
+            tuple(code for code, _name in get_available_languages()),
+        )
+
+    @classmethod
+    def get_field_names(cls, placeholders):
+        """Names of the fields needed to fill the given placeholders."""
+        fields = {
+            alias: name
+            for name, (keys, _nested_aliases) in cls.get_aliases().items()
+            for alias in keys
+        }
+
+        return {
+            fields[key]
+            for key in map(get_placeholder_name, placeholders)
+            if key in fields
+        }
+
+    def get_fields(self):
+        if self.placeholder_fields is None:
+            return super().get_fields()
+
+        return {
+            name: copy.deepcopy(field)
+            for name, field in self._declared_fields.items()
+            if name in self.placeholder_fields
+        }
 
     def get_aliased_collection(self, collection):
         return OrderedDict(
@@ -48,32 +136,15 @@ class DMSPlaceholdersSerializer(serializers.Serializer):
         )
 
     def get_aliased_field(self, key, value):
-        field = self.fields[key]
-        keys = {key.upper()}
+        keys, nested_aliases = self.get_aliases()[key]
 
-        for alias_config in field.aliases:
-            for alias in get_translations_canton_aware(alias_config).values():
-                keys.add(alias.upper())
-
-        if field.nested_aliases:
-            value = self.get_aliased_value(value, field.nested_aliases)
+        if nested_aliases:
+            value = self.get_aliased_value(value, nested_aliases)
 
         return [(name, value) for name in keys]
 
     def get_aliased_value(self, value, aliases):
-        parsed_aliases = {
-            key: list(
-                itertools.chain(
-                    *[
-                        get_translations_canton_aware(alias).values()
-                        for alias in alias_config
-                    ]
-                )
-            )
-            for key, alias_config in aliases.items()
-        }
-
-        return [self.get_aliased_value_item(item, parsed_aliases) for item in value]
+        return [self.get_aliased_value_item(item, aliases) for item in value]
 
     def get_aliased_value_item(self, item, aliases):
         """Recursively enrich complex placeholder data.
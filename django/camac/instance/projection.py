@@ -0,0 +1,175 @@
+"""Maintain the list projection of instances.
+
+The instance list shows values which are derived from answers and work items
+of the Caluma case (e.g. whether an instance is a paper dossier or its
+decision). Computing them for every row needs several queries per instance,
+so they are stored in `InstanceListProjection` and updated whenever the data
+they are derived from changes.
+"""
+
+from caluma.caluma_form.models import Answer, Document
+from caluma.caluma_workflow.models import WorkItem
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from camac.core.models import InstanceService
+from camac.instance.models import Instance, InstanceListProjection
+
+MAIN_QUESTIONS = {
+    "is-paper": "is_paper",
+    "projektaenderung": "is_modification",
+    "geschaeftstyp": "migration_type",
+    "geschaeftstyp-import": "import_type",
+}
+
+DECISION_STATUSES = [WorkItem.STATUS_COMPLETED, WorkItem.STATUS_SKIPPED]
+
+
+def _get_decision_questions():
+    if not settings.DECISION:  # pragma: no cover
+        return {}
+
+    return {
+        settings.DECISION["QUESTIONS"]["DECISION"]: "decision",
+        settings.DECISION["QUESTIONS"]["DATE"]: "decision_date",
+    }
+
+
+def _get_main_answers(instance_ids):
+    return Answer.objects.filter(
+        document__case__instance__pk__in=instance_ids,
+        question_id__in=MAIN_QUESTIONS.keys(),
+    ).values_list("document__case__instance__pk", "question_id", "value")
+
+
+def _get_decision_answers(instance_ids):
+    """Answers of the latest closed decision work item of each instance."""
+    instance_field = "document__work_item__case__family__instance__pk"
+
+    for question_id, field in _get_decision_questions().items():
+        answers = (
+            Answer.objects.filter(
+                **{f"{instance_field}__in": instance_ids},
+                question_id=question_id,
+                document__work_item__task_id=settings.DECISION["TASK"],
+                document__work_item__status__in=DECISION_STATUSES,
+            )
+            .order_by(instance_field, "-document__work_item__closed_at")
+            .distinct(instance_field)
+            .values_list(instance_field, "value", "date")
+        )
+
+        for instance_id, value, date in answers:
+            yield instance_id, field, date if field == "decision_date" else value
+
+
+def update_projections(instance_ids):
+    """Compute the list projection of the given instances in bulk.
+
+    Returns the updated projections.
+    """
+    projections = {
+        instance_id: InstanceListProjection(instance_id=instance_id)
+        for instance_id in Instance.objects.filter(pk__in=instance_ids).values_list(
+            "pk", flat=True
+        )
+    }
+
+    for instance_id, question_id, value in _get_main_answers(list(projections)):
+        field = MAIN_QUESTIONS[question_id]
+        if field == "is_paper":
+            value = value == "is-paper-yes"
+        elif field == "is_modification":
+            value = value == "projektaenderung-ja"
+        setattr(projections[instance_id], field, value)
+
+    for instance_id, field, value in _get_decision_answers(list(projections)):
+        if isinstance(value, list):  # pragma: no cover
+            value = value[0] if value else None
+        setattr(projections[instance_id], field, value)
+
+    for instance_id in InstanceService.objects.filter(
+        instance_id__in=list(projections),
+        service__service_group__name="lead-service",
+        active=1,
+    ).values_list("instance_id", flat=True):
+        projections[instance_id].is_coordinated = True
+
+    return InstanceListProjection.objects.bulk_create(
+        projections.values(),
+        update_conflicts=True,
+        unique_fields=["instance"],
+        update_fields=[
+            "is_paper",
+            "is_modification",
+            "is_coordinated",
+            "migration_type",
+            "import_type",
+            "decision",
+            "decision_date",
+            "updated_at",
+        ],
+    )
+
+
+def get_projection(instance):
+    """Return the projection of the instance, compute it if it doesn't exist."""
+    try:
+        return instance.list_projection
+    except InstanceListProjection.DoesNotExist:
+        projections = update_projections([instance.pk])
+        instance.list_projection = projections[0]
+        return projections[0]
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def update_projection_for_answer(sender, instance, **kwargs):
+    if kwargs.get("raw"):  # pragma: no cover
+        return
+
+    if instance.question_id in MAIN_QUESTIONS:
+        field = "case__instance"
+    elif instance.question_id in _get_decision_questions():
+        field = "work_item__case__family__instance"
+    else:
+        return
+
+    instance_ids = Document.objects.filter(
+        pk=instance.document_id, **{f"{field}__isnull": False}
+    ).values_list(field, flat=True)
+
+    if instance_ids:
+        update_projections(instance_ids)
+
+
+@receiver(post_save, sender=WorkItem)
+def update_projection_for_decision(sender, instance, **kwargs):
+    if kwargs.get("raw"):  # pragma: no cover
+        return
+
+    if settings.DECISION and instance.task_id == settings.DECISION["TASK"]:
+        update_projections(
+            Instance.objects.filter(case__pk=instance.case.family_id).values_list(
+                "pk", flat=True
+            )
+        )
+
+
+@receiver(post_save, sender=InstanceService)
+@receiver(post_delete, sender=InstanceService)
+def update_projection_for_instance_service(sender, instance, origin=None, **kwargs):
+    if kwargs.get("raw") or isinstance(origin, Instance):
+        # fixture loading or the instance itself is being deleted
+        return
+
+    update_projections([instance.instance_id])
+
+
+@receiver(post_save, sender=Instance)
+def update_projection_for_instance(sender, instance, **kwargs):
+    if kwargs.get("raw"):  # pragma: no cover
+        return
+
+    update_projections([instance.pk])
@@ -0,0 +1,181 @@
+"""Maintain the publication index of the public instance list.
+
+Which instances are published is determined by the date answers of the
+completed publication work items. Instead of evaluating these answers on
+every anonymous request, the date ranges are stored as
+`PublicationIndexEntry` whenever a publication work item or one of its
+answers is written. The index can be rebuilt with the
+`update_publication_index` command.
+
+Responses of the public list are cached per version of the index. The
+version changes whenever the index does.
+"""
+
+import hashlib
+from uuid import uuid4
+
+from caluma.caluma_form.models import Answer
+from caluma.caluma_workflow.models import WorkItem
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone, translation
+
+from camac.instance.models import Instance, PublicationIndexEntry
+
+PUBLICATION_TASK = "fill-publication"
+NEIGHBORS_TASK = "information-of-neighbors"
+NEIGHBORS_RANGE = (
+    "information-of-neighbors-start-date",
+    "information-of-neighbors-end-date",
+)
+
+VERSION_CACHE_KEY = "publication-index-version"
+
+
+def is_enabled():
+    return settings.PUBLICATION.get("BACKEND") == "caluma"
+
+
+def _get_ranges(task_id):
+    if task_id == NEIGHBORS_TASK:
+        return [NEIGHBORS_RANGE]
+
+    return settings.PUBLICATION.get("RANGE_QUESTIONS") or []
+
+
+def _get_questions():
+    questions = {
+        question
+        for task_id in [PUBLICATION_TASK, NEIGHBORS_TASK]
+        for question_range in _get_ranges(task_id)
+        for question in question_range
+    }
+
+    if publish_question := settings.PUBLICATION.get("PUBLISH_QUESTION"):
+        questions.add(publish_question)
+
+    return questions
+
+
+def _is_published(work_item, answers):
+    if (
+        work_item.status != WorkItem.STATUS_COMPLETED
+        or (work_item.meta or {}).get("is-published") is not True
+    ):
+        return False
+
+    publish_question = settings.PUBLICATION.get("PUBLISH_QUESTION")
+    if not publish_question:
+        return True
+
+    answer = answers.get(publish_question)
+    return bool(answer) and answer.value == settings.PUBLICATION.get("PUBLISH_ANSWER")
+
+
+def _index_entries(work_item):
+    if not work_item.document_id:  # pragma: no cover
+        return []
+
+    answers = {
+        answer.question_id: answer
+        for answer in Answer.objects.filter(
+            document_id=work_item.document_id, question_id__in=_get_questions()
+        )
+    }
+
+    if not _is_published(work_item, answers):
+        return []
+
+    instance_id = (
+        Instance.objects.filter(case__pk=work_item.case.family_id)
+        .values_list("pk", flat=True)
+        .first()
+    )
+
+    if not instance_id:  # pragma: no cover
+        return []
+
+    access_key = (
+        str(work_item.document_id) if work_item.task_id == NEIGHBORS_TASK else None
+    )
+
+    return [
+        PublicationIndexEntry(
+            instance_id=instance_id,
+            work_item=work_item,
+            start_date=answers[start_question].date,
+            end_date=answers[end_question].date,
+            access_key=access_key,
+        )
+        for start_question, end_question in _get_ranges(work_item.task_id)
+        if getattr(answers.get(start_question), "date", None)
+        and getattr(answers.get(end_question), "date", None)
+    ]
+
+
+def _entry_values(entry):
+    return (entry.instance_id, entry.start_date, entry.end_date, entry.access_key)
+
+
+def invalidate_public_list_cache():
+    transaction.on_commit(lambda: cache.set(VERSION_CACHE_KEY, uuid4().hex, None))
+
+
+@transaction.atomic
+def update_publication_index(work_item):
+    """Update the index entries of the given publication work item."""
+    entries = _index_entries(work_item)
+    existing = PublicationIndexEntry.objects.filter(work_item=work_item)
+
+    if set(map(_entry_values, existing)) == set(map(_entry_values, entries)):
+        return
+
+    existing.delete()
+    PublicationIndexEntry.objects.bulk_create(entries)
+    invalidate_public_list_cache()
+
+
+def get_public_list_cache_key(request):
+    """Cache key of the public list response, `None` if it's not cacheable."""
+    if not settings.PUBLICATION_CACHE_TIMEOUT or not is_enabled() or request.group:
+        return None
+
+    version = cache.get_or_set(VERSION_CACHE_KEY, lambda: uuid4().hex, None)
+    parts = [
+        version,
+        timezone.localdate().isoformat(),
+        translation.get_language(),
+        request.META.get("HTTP_X_CAMAC_PUBLIC_ACCESS_KEY", ""),
+        request.build_absolute_uri(),
+    ]
+
+    return "public-instances-" + hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+@receiver(post_save, sender=WorkItem)
+def update_publication_index_for_work_item(sender, instance, **kwargs):
+    if kwargs.get("raw") or not is_enabled():
+        return
+
+    if instance.task_id in [PUBLICATION_TASK, NEIGHBORS_TASK]:
+        update_publication_index(instance)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def update_publication_index_for_answer(sender, instance, **kwargs):
+    if (
+        kwargs.get("raw")
+        or not is_enabled()
+        or instance.question_id not in _get_questions()
+    ):
+        return
+
+    for work_item in WorkItem.objects.filter(
+        document_id=instance.document_id,
+        task_id__in=[PUBLICATION_TASK, NEIGHBORS_TASK],
+    ).select_related("case"):
+        update_publication_index(work_item)
@@ -0,0 +1,291 @@
+"""Maintain the search entries of the keyword search.
+
+The keyword search looks for terms in the form fields, journal entries,
+issues and completed inquiries of an instance. Instead of aggregating their
+texts for every instance on every search, each of them is stored as an
+`InstanceSearchEntry` with a trigram index on its text. The entries are
+updated whenever their source is written and can be rebuilt with the
+`update_instance_search_entries` command.
+"""
+
+import json
+import re
+from collections import defaultdict
+
+from caluma.caluma_form.models import Answer, Option
+from caluma.caluma_workflow.models import WorkItem
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from camac.instance.models import (
+    FormField,
+    Instance,
+    InstanceSearchEntry,
+    Issue,
+    JournalEntry,
+)
+
+# Same clean up of the JSON values of form fields as the keyword search did
+# on the database before: table rows are reduced to their values.
+FORM_FIELD_REPLACEMENTS = [
+    # uuid key / value pairs, which occur in table fields
+    (re.compile(r'(, )?"uuid": "(\w|-)+"'), ""),
+    # keys which occur in table fields
+    (re.compile(r'"(\w|-)+": '), ""),
+    # null values in table fields
+    (re.compile(r"null"), '""'),
+    # escaped quotes
+    (re.compile(r'\\"'), '"'),
+]
+
+UPDATE_FIELDS = ["text", "service", "visibility", "work_item"]
+
+
+def _get_inquiry_questions():
+    if not settings.DISTRIBUTION:  # pragma: no cover
+        return []
+
+    questions = settings.DISTRIBUTION["QUESTIONS"]
+
+    return [
+        questions["STATUS"],
+        questions["REQUEST"],
+        questions["ANCILLARY_CLAUSES"],
+        questions["REASON"],
+        questions["RECOMMENDATION"],
+        questions["HINT"],
+    ]
+
+
+def form_field_text(value):
+    text = json.dumps(value, ensure_ascii=False)
+
+    for regex, replacement in FORM_FIELD_REPLACEMENTS:
+        text = regex.sub(replacement, text)
+
+    return text
+
+
+def _form_field_entry(field):
+    if field.value is None:
+        return None
+
+    return InstanceSearchEntry(
+        instance_id=field.instance_id,
+        source=InstanceSearchEntry.SOURCE_FORM_FIELD,
+        key=field.name,
+        text=form_field_text(field.value),
+    )
+
+
+def _journal_entry_entry(journal_entry):
+    if not journal_entry.text:
+        return None
+
+    return InstanceSearchEntry(
+        instance_id=journal_entry.instance_id,
+        source=InstanceSearchEntry.SOURCE_JOURNAL_ENTRY,
+        key=str(journal_entry.pk),
+        text=journal_entry.text,
+        service_id=journal_entry.service_id,
+        visibility=journal_entry.visibility,
+    )
+
+
+def _issue_entry(issue):
+    if not issue.text:  # pragma: no cover
+        return None
+
+    return InstanceSearchEntry(
+        instance_id=issue.instance_id,
+        source=InstanceSearchEntry.SOURCE_ISSUE,
+        key=str(issue.pk),
+        text=issue.text,
+        service_id=issue.service_id,
+    )
+
+
+def _inquiry_entries(work_items):
+    """Entries of the given completed inquiries.
+
+    The work items need to be annotated with `search_instance_id`.
+    Selected options of the status question are stored with their labels
+    in all languages.
+    """
+    work_items = list(work_items)
+    status_question = settings.DISTRIBUTION["QUESTIONS"]["STATUS"]
+
+    answers = defaultdict(list)
+    options = set()
+    for answer in Answer.objects.filter(
+        document__case__parent_work_item__in=work_items,
+        question_id__in=_get_inquiry_questions(),
+        value__isnull=False,
+    ).annotate(work_item_id=F("document__case__parent_work_item")):
+        answers[answer.work_item_id].append(answer)
+
+        if answer.question_id == status_question:
+            options.add(answer.value)
+
+    labels = {
+        option.pk: " ".join(label for label in option.label.values() if label)
+        for option in Option.objects.filter(pk__in=options)
+    }
+
+    for work_item in work_items:
+        texts = [
+            (
+                labels.get(answer.value, answer.value)
+                if answer.question_id == status_question
+                else json.dumps(answer.value, ensure_ascii=False)
+            )
+            for answer in answers[work_item.pk]
+        ]
+
+        if work_item.search_instance_id and texts:
+            yield InstanceSearchEntry(
+                instance_id=work_item.search_instance_id,
+                source=InstanceSearchEntry.SOURCE_INQUIRY,
+                key=str(work_item.pk),
+                text="|".join(texts),
+                work_item_id=work_item.pk,
+            )
+
+
+def _inquiries(**filters):
+    return WorkItem.objects.filter(
+        task_id=settings.DISTRIBUTION["INQUIRY_TASK"],
+        status=WorkItem.STATUS_COMPLETED,
+        **filters,
+    ).annotate(search_instance_id=F("case__family__instance__pk"))
+
+
+def _save_entries(entries):
+    return InstanceSearchEntry.objects.bulk_create(
+        [entry for entry in entries if entry],
+        update_conflicts=True,
+        unique_fields=["instance", "source", "key"],
+        update_fields=UPDATE_FIELDS,
+    )
+
+
+def _delete_entry(source, key, **filters):
+    InstanceSearchEntry.objects.filter(source=source, key=str(key), **filters).delete()
+
+
+def update_issue_search_entries(issues):
+    """Update the entries of issues which were saved without signals."""
+    return _save_entries(map(_issue_entry, issues))
+
+
+@transaction.atomic
+def update_search_entries(instance_ids):
+    """Rebuild the search entries of the given instances."""
+    InstanceSearchEntry.objects.filter(instance__pk__in=instance_ids).delete()
+
+    entries = [
+        *map(
+            _form_field_entry, FormField.objects.filter(instance__pk__in=instance_ids)
+        ),
+        *map(
+            _journal_entry_entry,
+            JournalEntry.objects.filter(instance__pk__in=instance_ids),
+        ),
+        *map(_issue_entry, Issue.objects.filter(instance__pk__in=instance_ids)),
+    ]
+
+    if settings.DISTRIBUTION:
+        entries.extend(
+            _inquiry_entries(_inquiries(case__family__instance__pk__in=instance_ids))
+        )
+
+    return _save_entries(entries)
+
+
+@receiver(post_save, sender=FormField)
+def update_search_entry_for_form_field(sender, instance, **kwargs):
+    if kwargs.get("raw"):  # pragma: no cover
+        return
+
+    if entry := _form_field_entry(instance):
+        _save_entries([entry])
+    else:
+        _delete_entry(
+            InstanceSearchEntry.SOURCE_FORM_FIELD,
+            instance.name,
+            instance_id=instance.instance_id,
+        )
+
+
+@receiver(post_save, sender=JournalEntry)
+def update_search_entry_for_journal_entry(sender, instance, **kwargs):
+    if kwargs.get("raw"):  # pragma: no cover
+        return
+
+    if entry := _journal_entry_entry(instance):
+        _save_entries([entry])
+    else:
+        _delete_entry(InstanceSearchEntry.SOURCE_JOURNAL_ENTRY, instance.pk)
+
+
+@receiver(post_save, sender=Issue)
+def update_search_entry_for_issue(sender, instance, **kwargs):
+    if kwargs.get("raw"):  # pragma: no cover
+        return
+
+    if entry := _issue_entry(instance):
+        _save_entries([entry])
+    else:  # pragma: no cover
+        _delete_entry(InstanceSearchEntry.SOURCE_ISSUE, instance.pk)
+
+
+@receiver(post_delete, sender=FormField)
+@receiver(post_delete, sender=JournalEntry)
+@receiver(post_delete, sender=Issue)
+def delete_search_entry(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Instance):
+        # the entries are deleted together with the instance
+        return
+
+    if sender is FormField:
+        _delete_entry(
+            InstanceSearchEntry.SOURCE_FORM_FIELD,
+            instance.name,
+            instance_id=instance.instance_id,
+        )
+    elif sender is JournalEntry:
+        _delete_entry(InstanceSearchEntry.SOURCE_JOURNAL_ENTRY, instance.pk)
+    else:
+        _delete_entry(InstanceSearchEntry.SOURCE_ISSUE, instance.pk)
+
+
+@receiver(post_save, sender=WorkItem)
+def update_search_entry_for_inquiry(sender, instance, **kwargs):
+    if kwargs.get("raw") or not settings.DISTRIBUTION:  # pragma: no cover
+        return
+
+    if instance.task_id != settings.DISTRIBUTION["INQUIRY_TASK"]:
+        return
+
+    update_inquiry_search_entry(instance.pk)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def update_search_entry_for_inquiry_answer(sender, instance, **kwargs):
+    if kwargs.get("raw") or instance.question_id not in _get_inquiry_questions():
+        return
+
+    for work_item_id in WorkItem.objects.filter(
+        child_case__document=instance.document_id,
+        task_id=settings.DISTRIBUTION["INQUIRY_TASK"],
+    ).values_list("pk", flat=True):
+        update_inquiry_search_entry(work_item_id)
+
+
+def update_inquiry_search_entry(work_item_id):
+    _delete_entry(InstanceSearchEntry.SOURCE_INQUIRY, work_item_id)
+    _save_entries(_inquiry_entries(_inquiries(pk=work_item_id)))
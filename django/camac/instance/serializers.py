@@ -49,6 +49,7 @@ from camac.instance.domain_logic import link_instances
 from camac.instance.master_data import MasterData
 from camac.instance.mixins import InstanceEditableMixin, InstanceQuerysetMixin
 from camac.instance.models import Instance
+from camac.instance.projection import get_projection
 from camac.instance.utils import copy_instance, fill_ebau_number
 from camac.notification.utils import send_mail, send_mail_without_request
 from camac.permissions import api as permissions_api, events as permissions_events
@@ -594,11 +595,27 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
 
         return instance.rejection_feedback
 
+    def _get_option_label(self, slug):
+        """Get the label of a projected option, all options are loaded at once."""
+        if not hasattr(self, "_option_labels"):
+            questions = ["geschaeftstyp"]
+            if settings.DECISION:
+                questions.append(settings.DECISION["QUESTIONS"]["DECISION"])
+
+            self._option_labels = {
+                option.slug: option.label
+                for option in form_models.Option.objects.filter(
+                    questions__slug__in=questions
+                )
+            }
+
+        return self._option_labels.get(slug)
+
     def get_is_paper(self, instance):
-        return CalumaApi().is_paper(instance)
+        return get_projection(instance).is_paper
 
     def get_is_modification(self, instance):
-        return CalumaApi().is_modification(instance)
+        return get_projection(instance).is_modification
 
     def get_caluma_form(self, instance):
         return CalumaApi().get_form_slug(instance)
@@ -613,43 +630,16 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
         if not settings.DECISION:  # pragma: no cover
             return None
 
-        answer = (
-            form_models.Answer.objects.filter(
-                question_id=settings.DECISION["QUESTIONS"]["DECISION"],
-                document__work_item__task_id=settings.DECISION["TASK"],
-                document__work_item__status__in=[
-                    workflow_models.WorkItem.STATUS_COMPLETED,
-                    workflow_models.WorkItem.STATUS_SKIPPED,
-                ],
-                document__work_item__case__family__instance=instance,
-            )
-            .order_by("-document__work_item__closed_at")
-            .first()
-        )
+        decision = get_projection(instance).decision
+        label = self._get_option_label(decision) if decision else None
 
-        if not answer or not answer.selected_options:
-            return None
-
-        return str(answer.selected_options[0].label)
+        return str(label) if label else None
 
     def get_decision_date(self, instance):
         if not settings.DECISION:  # pragma: no cover
             return None
 
-        return (
-            form_models.Answer.objects.filter(
-                question_id=settings.DECISION["QUESTIONS"]["DATE"],
-                document__work_item__task_id=settings.DECISION["TASK"],
-                document__work_item__status__in=[
-                    workflow_models.WorkItem.STATUS_COMPLETED,
-                    workflow_models.WorkItem.STATUS_SKIPPED,
-                ],
-                document__work_item__case__family__instance=instance,
-            )
-            .order_by("-document__work_item__closed_at")
-            .values_list("date", flat=True)
-            .first()
-        )
+        return get_projection(instance).decision_date
 
     def get_involved_at(self, instance):
         service_id = self.context["request"].group.service_id
@@ -1044,24 +1034,23 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
 
     def get_name(self, instance):
         api = CalumaApi()
+        projection = get_projection(instance)
         name = api.get_form_name(instance)
         parts = []
 
         migrated = api.is_migrated(instance)  # from RSTA migration
         imported = api.is_imported(instance)  # from dossier import
-        paper = api.is_paper(instance)
-        modification = api.is_modification(instance)
-        is_kog = instance.instance_services.filter(
-            service__service_group__name="lead-service", active=1
-        )
+        paper = projection.is_paper
+        modification = projection.is_modification
+        is_kog = projection.is_coordinated
         ech = api.is_ech_submitted(instance)
 
         if migrated:
-            name = api.get_migration_type(instance)[1]
+            name = self._get_option_label(projection.migration_type)
             parts.append(_("migrated"))
 
         if imported:
-            _type = api.get_import_type(instance)
+            _type = projection.import_type
             if _type:
                 name = _type
                 parts.append(_("migrated"))
@@ -1261,13 +1250,8 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
 
 
 class CalumaInstanceSubmitSerializer(CalumaInstanceSerializer):
-    _master_data_cache = {}
-
     def get_master_data(self, case):
-        if case.pk not in self._master_data_cache:
-            self._master_data_cache[case.pk] = MasterData(case)
-
-        return self._master_data_cache[case.pk]
+        return MasterData.for_case(case)
 
     def _create_history_entry(self, text):
         create_history_entry(self.instance, self.context["request"].user, text)
@@ -1391,7 +1375,7 @@ class CalumaInstanceSubmitSerializer(CalumaInstanceSerializer):
                 )
 
                 history_text_data = {
-                    "dossier_number": MasterData(instance.case).dossier_number
+                    "dossier_number": MasterData.for_case(instance.case).dossier_number
                 }
 
                 create_history_entry(
@@ -2617,16 +2601,8 @@ class PublicCalumaInstanceSerializer(serializers.Serializer):  # pragma: no cove
     form_description = serializers.SerializerMethodField()
     authority = serializers.SerializerMethodField()
 
-    _master_data_cache = {}
-
     def get_master_data(self, case):
-        request = self.context["request"]
-        if not hasattr(request, "_master_data_cache"):
-            request._master_data_cache = {}
-        if case.pk not in request._master_data_cache:
-            request._master_data_cache[case.pk] = MasterData(case)
-
-        return request._master_data_cache[case.pk]
+        return MasterData.for_case(case)
 
     def get_municipality(self, case):
         municipality = self.get_master_data(case).municipality
@@ -1,4 +1,7 @@
 import locale
+import os
+import time
+import zipfile
 from datetime import datetime
 from pathlib import Path
 
@@ -9,6 +12,8 @@ from caluma.caluma_form.models import DynamicOption, Question
 from caluma.caluma_user.models import BaseUser
 from django.conf import settings
 from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.management import call_command
 from django.utils.timezone import make_aware
 from django.utils.translation import gettext as _
@@ -16,7 +21,12 @@ from rest_framework import exceptions, status
 
 from camac.utils import build_url
 
-from ..document_merge_service import DMSClient, DMSHandler, DMSVisitor
+from ..document_merge_service import (
+    DMSClient,
+    DMSHandler,
+    DMSVisitor,
+    generate_pdfs_task,
+)
 
 
 @pytest.fixture
@@ -133,6 +143,81 @@ def test_document_merge_service_client(db, requests_mock):
     assert result == expected
 
 
+def test_document_merge_service_client_merge_many(db, requests_mock, settings):
+    settings.DOCUMENT_MERGE_SERVICE_MAX_WORKERS = 2
+    templates = [f"template-{i}" for i in range(5)]
+
+    for template in templates:
+        requests_mock.register_uri(
+            "POST",
+            build_url(
+                settings.DOCUMENT_MERGE_SERVICE_URL,
+                f"/template/{template}/merge",
+                trailing=True,
+            ),
+            content=template.encode(),
+        )
+
+    result = DMSClient("some token").merge_many(
+        [{"data": {"foo": "some data"}, "template": t} for t in templates]
+    )
+
+    assert result == [template.encode() for template in templates]
+    assert requests_mock.call_count == len(templates)
+    assert all(
+        request.timeout == settings.DOCUMENT_MERGE_SERVICE_TIMEOUT
+        for request in requests_mock.request_history
+    )
+
+
+def test_generate_pdfs_task(
+    db, mocker, requests_mock, settings, tmp_path, admin_user, group
+):
+    settings.MEDIA_ROOT = tmp_path
+    requests_mock.post(
+        settings.KEYCLOAK_OIDC_TOKEN_URL, json={"access_token": "service-token"}
+    )
+    client = mocker.patch("camac.instance.document_merge_service.DMSClient")
+    client.return_value.merge_many.return_value = [b"pdf"]
+    get_merge_job = mocker.patch(
+        "camac.instance.document_merge_service.DMSHandler.get_merge_job",
+        return_value={"filename": "some.pdf", "template": "some"},
+    )
+
+    path = generate_pdfs_task([1], admin_user.pk, group.pk, template="some")
+
+    # the data is collected as the user and group which started the task
+    instance_id, caluma_user, job_group = get_merge_job.call_args.args
+    assert instance_id == 1
+    assert caluma_user.username == admin_user.username
+    assert caluma_user.group == group.service.pk
+    assert caluma_user.camac_group == group.pk
+    assert job_group == group
+    assert get_merge_job.call_args.kwargs == {"form_slug": None, "template": "some"}
+
+    client.assert_called_once_with("Bearer service-token")
+    with default_storage.open(path) as archive:
+        with zipfile.ZipFile(archive) as zip_file:
+            assert zip_file.read("some.pdf") == b"pdf"
+
+
+def test_clean_generated_pdfs(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+    # nothing has been generated yet
+    call_command("clean_generated_pdfs")
+
+    old = default_storage.save("generated-pdfs/old.zip", ContentFile(b"zip"))
+    new = default_storage.save("generated-pdfs/new.zip", ContentFile(b"zip"))
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(default_storage.path(old), (two_days_ago, two_days_ago))
+
+    call_command("clean_generated_pdfs")
+
+    assert not default_storage.exists(old)
+    assert default_storage.exists(new)
+
+
 @pytest.mark.freeze_time("2022-09-06 13:37")
 @pytest.mark.django_db(transaction=True, reset_sequences=True)
 def test_document_merge_service_cover_sheet_with_header_values(
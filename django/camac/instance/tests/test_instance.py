@@ -1547,16 +1547,17 @@ def test_instance_export_list(
     )
     add_field(name="bezeichnung", value="Bezeichnung")
 
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(3):
         response = admin_client.get(
             url,
             data={
                 "instance-state-ids": f"{instance_1.instance_state_id},{instance_2.instance_state_id}"
             },
         )
+        content = b"".join(response.streaming_content)
     assert response.status_code == status.HTTP_200_OK
 
-    book = pyexcel.get_book(file_content=response.content, file_type="xlsx")
+    book = pyexcel.get_book(file_content=content, file_type="xlsx")
     # bookdict is a dict of tuples(name, content)
     sheet = book.bookdict.popitem()[1]
     assert len(sheet) == len(instances)
@@ -1,4 +1,6 @@
+import io
 import itertools
+import zipfile
 from datetime import date, datetime
 from pathlib import Path
 
@@ -11,6 +13,8 @@ from caluma.caluma_form import (
 from caluma.caluma_form.api import save_answer
 from caluma.caluma_workflow import api as workflow_api, models as caluma_workflow_models
 from django.core import mail
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.urls import reverse
 from django.utils.timezone import make_aware
 from mock import call
@@ -2247,6 +2251,115 @@ def test_generate_pdf_action(
             assert fh.read() == content.decode("utf-8")
 
 
+@pytest.mark.parametrize("role__name,instance__user", [("Canton", lf("user"))])
+def test_generate_pdfs_action(
+    db,
+    mocker,
+    admin_client,
+    user,
+    be_instance,
+    instance_factory,
+    caluma_workflow_config_be,
+    dms_settings,
+    settings,
+):
+    client = mocker.patch(
+        "camac.instance.document_merge_service.DMSClient"
+    ).return_value
+    client.merge_many.side_effect = lambda jobs: [
+        f"pdf of {job['data']['caseId']}".encode() for job in jobs
+    ]
+    mocker.patch("camac.instance.document_merge_service.DMSVisitor.visit")
+
+    dms_settings["FORM"] = {"main-form": {"template": "some-template"}}
+
+    url = reverse("instance-generate-pdfs")
+
+    response = admin_client.get(url)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = admin_client.get(url, {"instance_id": be_instance.pk})
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/zip"
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        (name,) = archive.namelist()
+        assert name.startswith(str(be_instance.pk))
+        assert archive.read(name) == f"pdf of {be_instance.pk}".encode()
+
+    settings.DOCUMENT_MERGE_SERVICE_MAX_SYNC_PDFS = 0
+    response = admin_client.get(url, {"instance_id": be_instance.pk})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize("role__name", ["Canton"])
+def test_generate_pdfs_action_async(
+    db, mocker, admin_client, admin_user, group, be_instance, settings, tmp_path
+):
+    settings.MEDIA_ROOT = tmp_path
+    async_task = mocker.patch(
+        "camac.instance.document_merge_service.async_task", return_value="some-id"
+    )
+    fetch = mocker.patch("camac.instance.views.fetch", return_value=None)
+    queued = mocker.patch("camac.instance.views.OrmQ.objects.all", return_value=[])
+
+    url = reverse("instance-generate-pdfs")
+
+    response = admin_client.post(f"{url}?instance_id={be_instance.pk}")
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json() == {"task_id": "some-id"}
+
+    # only the IDs are passed to the task, no token or data of the user
+    assert async_task.call_args.args == (
+        "camac.instance.document_merge_service.generate_pdfs_task",
+        [be_instance.pk],
+        admin_user.pk,
+        group.pk,
+    )
+    assert async_task.call_args.kwargs["form_slug"] is None
+    assert async_task.call_args.kwargs["template"] is None
+    task_name = async_task.call_args.kwargs["task_name"]
+    assert task_name == f"generate-pdfs-{admin_user.pk}-{group.pk}"
+
+    # unknown tasks
+    response = admin_client.get(url, {"task-id": "some-id"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    queued.return_value = [
+        mocker.Mock(**{"task_id.return_value": "some-id", "name.return_value": name})
+        for name in ["other-task", task_name]
+    ]
+    response = admin_client.get(url, {"task-id": "some-id"})
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+    fetch.return_value = mocker.Mock(success=True)
+    fetch.return_value.configure_mock(
+        func="camac.instance.document_merge_service.generate_pdfs_task",
+        name=task_name,
+        result=default_storage.save("generated-pdfs/some.zip", ContentFile(b"zip")),
+    )
+    response = admin_client.get(url, {"task-id": "some-id"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b"zip"
+
+    # the archive can only be fetched once
+    assert not default_storage.exists(fetch.return_value.result)
+    fetch.return_value.delete.assert_called_once()
+
+    # tasks of other users or other tasks can't be fetched
+    for func, name in [
+        ("camac.instance.document_merge_service.generate_pdfs_task", "other-task"),
+        ("camac.dossier_import.domain_logic.perform_import", task_name),
+    ]:
+        fetch.return_value.configure_mock(func=func, name=name)
+        response = admin_client.get(url, {"task-id": "some-id"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    settings.DOCUMENT_MERGE_SERVICE_MAX_ASYNC_PDFS = 0
+    response = admin_client.post(f"{url}?instance_id={be_instance.pk}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.parametrize("role__name", ["Municipality"])
 @pytest.mark.parametrize(
     "patch_data,expected",
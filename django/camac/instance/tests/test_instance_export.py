@@ -135,12 +135,16 @@ def test_caluma_export_be(
         else:
             response = admin_client.get(url, {"instance_id": be_instance.pk})
 
+        # the export is rendered while streaming the response
+        if response.streaming:
+            content = b"".join(response.streaming_content)
+
     assert response.status_code == expected_status
     if expected_status == status.HTTP_200_OK:
-        book = pyexcel.get_book(file_content=response.content, file_type="xlsx")
-        assert len(book.get_dict()["pyexcel sheet"]) - 1 == expected_count
+        book = pyexcel.get_book(file_content=content, file_type="xlsx")
+        assert len(book.get_dict()["export"]) - 1 == expected_count
         if expected_count:
-            assert be_instance.pk in book.get_dict()["pyexcel sheet"][1]
+            assert be_instance.pk in book.get_dict()["export"][1]
 
 
 @pytest.mark.parametrize(
@@ -285,12 +289,16 @@ def test_caluma_export_sz(
         else:
             response = admin_client.get(url, {"instance_id": sz_instance.pk})
 
+        # the export is rendered while streaming the response
+        if response.streaming:
+            content = b"".join(response.streaming_content)
+
     assert response.status_code == expected_status
     if expected_status == status.HTTP_200_OK:
-        book = pyexcel.get_book(file_content=response.content, file_type="xlsx")
-        assert len(book.get_dict()["pyexcel sheet"]) - 1 == expected_count
+        book = pyexcel.get_book(file_content=content, file_type="xlsx")
+        assert len(book.get_dict()["export"]) - 1 == expected_count
         if expected_count:
-            data = book.get_dict()["pyexcel sheet"][1]
+            data = book.get_dict()["export"][1]
             assert sz_instance.identifier in data
             snapshot.assert_match(data)
 
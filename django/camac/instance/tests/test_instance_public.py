@@ -503,7 +503,7 @@ def test_public_caluma_instance_be(
 
     url = reverse("public-caluma-instance-list")
 
-    with django_assert_num_queries(9):
+    with django_assert_num_queries(8):
         response = admin_client.get(
             url, {"instance": be_instance.pk}, HTTP_X_CAMAC_PUBLIC_ACCESS=True
         )
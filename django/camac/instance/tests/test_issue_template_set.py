@@ -2,6 +2,8 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from camac.instance.models import InstanceSearchEntry, Issue
+
 
 @pytest.mark.parametrize(
     "role__name,size",
@@ -129,3 +131,34 @@ def test_issue_template_set_apply(
 
         json = response.json()
         assert len(json["data"]) == itsit.issuetemplateset.issue_templates.count()
+
+
+@pytest.mark.parametrize("role__name", ["Municipality"])
+def test_issue_template_set_apply_search_entries(
+    admin_client, issue_template_set_issue_templates, instance, activation
+):
+    itsit = issue_template_set_issue_templates
+    set_url = reverse("issue-template-set-apply", args=[itsit.issuetemplateset.pk])
+
+    response = admin_client.post(
+        set_url,
+        data={
+            "data": {
+                "type": "issue-template-sets-apply",
+                "id": None,
+                "relationships": {
+                    "instance": {"data": {"type": "instances", "id": instance.pk}}
+                },
+            }
+        },
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert Issue.objects.filter(instance=instance).exists()
+
+    assert set(
+        InstanceSearchEntry.objects.filter(
+            instance=instance, source=InstanceSearchEntry.SOURCE_ISSUE
+        ).values_list("key", "text")
+    ) == {
+        (str(issue.pk), issue.text) for issue in Issue.objects.filter(instance=instance)
+    }
@@ -13,7 +13,7 @@ from syrupy.filters import paths
 
 from camac.tests.data import so_personal_row_factory
 
-from ..master_data import MasterData
+from ..master_data import MasterData, master_data_scope
 
 
 def test_master_data_exceptions(
@@ -1003,3 +1003,52 @@ def test_disable_answer_visibility(
     md.disable_answer_visibility = disable_answer_visibility
 
     assert md.municipality
+
+
+def test_master_data_for_cases(
+    db, be_master_data_case, be_master_data_settings, django_assert_num_queries
+):
+    keys = ["dossier_number", "proposal", "applicants", "municipality"]
+    cases = caluma_workflow_models.Case.objects.filter(pk=be_master_data_case.pk)
+
+    (master_data,) = MasterData.for_cases(cases, keys)
+
+    # everything needed to resolve the keys is prefetched
+    with django_assert_num_queries(0):
+        resolved = {key: getattr(master_data, key) for key in keys}
+
+    assert resolved == {
+        key: getattr(MasterData(be_master_data_case), key) for key in keys
+    }
+
+    with pytest.raises(AttributeError):
+        MasterData.for_cases(cases, ["unconfigured"])
+
+
+def test_master_data_scope(
+    db, be_master_data_case, be_master_data_settings, django_assert_num_queries
+):
+    assert MasterData.for_case(be_master_data_case) is not MasterData.for_case(
+        be_master_data_case
+    )
+
+    with master_data_scope():
+        master_data = MasterData.for_case(be_master_data_case)
+        assert master_data.proposal == "Grosses Haus"
+
+        with master_data_scope():
+            assert MasterData.for_case(be_master_data_case) is master_data
+
+        # resolved keys are memoised
+        with django_assert_num_queries(0):
+            assert master_data.proposal == "Grosses Haus"
+
+        # writes invalidate the shared objects
+        answer = be_master_data_case.document.answers.get(
+            question_id="beschreibung-bauvorhaben"
+        )
+        answer.value = "Kleines Haus"
+        answer.save()
+
+        assert MasterData.for_case(be_master_data_case) is not master_data
+        assert MasterData.for_case(be_master_data_case).proposal == "Kleines Haus"
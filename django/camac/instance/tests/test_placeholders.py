@@ -15,6 +15,8 @@ from caluma.caluma_form.factories import AnswerFactory, DocumentFactory
 from caluma.caluma_form.models import Option, Question
 from caluma.caluma_workflow.factories import WorkItemFactory
 from caluma.caluma_workflow.models import WorkItem
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import make_aware
 from django.utils.translation import override
@@ -892,6 +894,35 @@ def test_dms_placeholders_empty(
     snapshot.assert_match(response.json())
 
 
+@pytest.mark.freeze_time("2021-08-30")
+@pytest.mark.parametrize("role__name", ["Municipality"])
+def test_dms_placeholders_selection(
+    db,
+    admin_client,
+    be_instance,
+    be_dms_config,
+    be_master_data_settings,
+):
+    url = reverse("instance-dms-placeholders", args=[be_instance.pk])
+
+    with CaptureQueriesContext(connection) as full_queries:
+        full = admin_client.get(url).json()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(
+            url, {"placeholders": "address,ALLE_GESUCHSTELLER[].NAME,UNKNOWN"}
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+
+    assert {"ADDRESS", "ALLE_GESUCHSTELLER"}.issubset(result)
+    assert "UNKNOWN" not in result
+    assert result == {key: full[key] for key in result}
+    assert len(result) < len(full)
+    assert len(queries) < len(full_queries)
+
+
 @pytest.mark.freeze_time("2023-01-24")
 @pytest.mark.parametrize(
     "language,expected",
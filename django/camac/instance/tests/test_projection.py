@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+
+from camac.instance.models import InstanceListProjection
+from camac.instance.projection import get_projection, update_projections
+
+
+@pytest.mark.parametrize("service_group__name", ["lead-service"])
+def test_projection_signals(db, be_instance, decision_factory, be_decision_settings):
+    projection = InstanceListProjection.objects.get(instance=be_instance)
+    assert not projection.is_paper
+    assert projection.is_coordinated
+    assert projection.decision is None
+
+    be_instance.case.document.answers.create(
+        question_id="is-paper", value="is-paper-yes"
+    )
+    be_instance.case.document.answers.create(
+        question_id="projektaenderung", value="projektaenderung-ja"
+    )
+    decision_factory(decision_date=date(2022, 11, 16))
+
+    projection.refresh_from_db()
+    assert projection.is_paper
+    assert projection.is_modification
+    assert projection.decision == "decision-decision-assessment-accepted"
+    assert projection.decision_date == date(2022, 11, 16)
+
+    be_instance.case.document.answers.filter(question_id="is-paper").delete()
+    be_instance.instance_services.update(active=0)
+    update_projections([be_instance.pk])
+
+    projection.refresh_from_db()
+    assert not projection.is_paper
+    assert not projection.is_coordinated
+
+
+def test_get_projection_fallback(db, be_instance):
+    InstanceListProjection.objects.all().delete()
+    be_instance.refresh_from_db()
+
+    assert get_projection(be_instance).is_coordinated is False
+    assert InstanceListProjection.objects.filter(instance=be_instance).exists()
+
+
+def test_update_instance_projections_command(db, instance_factory):
+    instances = instance_factory.create_batch(3)
+    InstanceListProjection.objects.filter(instance=instances[0]).delete()
+
+    call_command("update_instance_projections", "--missing", "--batch-size", "2")
+    assert InstanceListProjection.objects.count() == 3
+
+    call_command("update_instance_projections")
+    assert InstanceListProjection.objects.count() == 3
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import pytest
+from caluma.caluma_form.factories import AnswerFactory, DocumentFactory
+from caluma.caluma_workflow.factories import WorkItemFactory
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from camac.instance.models import PublicationIndexEntry
+
+
+@pytest.fixture
+def publication(db, caluma_publication, publication_settings):
+    publication_settings["BACKEND"] = "caluma"
+
+    def wrapper(instance, days=(-1, 12)):
+        document = DocumentFactory()
+        start_question, end_question = publication_settings["RANGE_QUESTIONS"][0]
+        AnswerFactory(
+            document=document,
+            question_id=start_question,
+            date=timezone.localdate() + timedelta(days=days[0]),
+        )
+        AnswerFactory(
+            document=document,
+            question_id=end_question,
+            date=timezone.localdate() + timedelta(days=days[1]),
+        )
+
+        return WorkItemFactory(
+            task_id="fill-publication",
+            status="completed",
+            document=document,
+            case=instance.case,
+            meta={"is-published": True},
+        )
+
+    return wrapper
+
+
+def test_publication_index(db, be_instance, publication, publication_settings):
+    work_item = publication(be_instance)
+
+    entry = PublicationIndexEntry.objects.get()
+    assert entry.instance == be_instance
+    assert entry.start_date == timezone.localdate() - timedelta(days=1)
+    assert entry.access_key is None
+    assert PublicationIndexEntry.objects.published().count() == 1
+
+    end_answer = work_item.document.answers.get(
+        question_id=publication_settings["RANGE_QUESTIONS"][0][1]
+    )
+    end_answer.date = timezone.localdate() - timedelta(days=1)
+    end_answer.save()
+
+    assert PublicationIndexEntry.objects.get().end_date == end_answer.date
+    assert not PublicationIndexEntry.objects.published().exists()
+
+    work_item.meta["is-published"] = False
+    work_item.save()
+
+    assert not PublicationIndexEntry.objects.exists()
+
+
+def test_update_publication_index_command(db, be_instance, publication):
+    publication(be_instance)
+    PublicationIndexEntry.objects.all().delete()
+
+    call_command("update_publication_index")
+
+    assert PublicationIndexEntry.objects.filter(instance=be_instance).count() == 1
+
+
+def test_public_list_cache(
+    db,
+    client,
+    settings,
+    instance_factory,
+    instance_with_case,
+    caluma_workflow_config_be,
+    publication,
+    django_capture_on_commit_callbacks,
+):
+    settings.APPLICATION_NAME = "kt_bern"
+    settings.PUBLICATION_CACHE_TIMEOUT = 60
+    url = reverse("public-caluma-instance-list")
+    instances = [
+        instance_with_case(instance) for instance in instance_factory.create_batch(2)
+    ]
+
+    publication(instances[0])
+
+    def get_count():
+        response = client.get(
+            url,
+            {"fields[public-caluma-instances]": "id"},
+            HTTP_X_CAMAC_PUBLIC_ACCESS=True,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return len(response.json()["data"])
+
+    assert get_count() == 1
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        publication(instances[1])
+
+    # the cached response is returned until the change is committed
+    assert get_count() == 1
+
+    for callback in callbacks:
+        callback()
+
+    assert get_count() == 2
@@ -0,0 +1,59 @@
+from django.core.management import call_command
+
+from camac.instance.models import InstanceSearchEntry
+from camac.instance.search import form_field_text
+
+
+def test_form_field_text():
+    assert (
+        form_field_text(
+            [
+                {
+                    "name": 'Muster "AG"',
+                    "uuid": "0f3c4a6e-9e2d-4b3b-8f0e-1f1f1f1f1f1f",
+                    "vorname": None,
+                }
+            ]
+        )
+        == '[{"Muster "AG"", ""}]'
+    )
+
+
+def test_search_entry_signals(db, instance, form_field_factory, journal_entry_factory):
+    field = form_field_factory(instance=instance, name="bezeichnung", value="Haus")
+    journal_entry = journal_entry_factory(
+        instance=instance, visibility="all", text="Notiz"
+    )
+
+    entries = InstanceSearchEntry.objects.filter(instance=instance)
+    assert set(entries.values_list("source", "text")) == {
+        (InstanceSearchEntry.SOURCE_FORM_FIELD, '"Haus"'),
+        (InstanceSearchEntry.SOURCE_JOURNAL_ENTRY, "Notiz"),
+    }
+    assert (
+        entries.get(source=InstanceSearchEntry.SOURCE_JOURNAL_ENTRY).visibility == "all"
+    )
+
+    field.value = "Scheune"
+    field.save()
+    journal_entry.delete()
+
+    assert list(entries.values_list("source", "text")) == [
+        (InstanceSearchEntry.SOURCE_FORM_FIELD, '"Scheune"')
+    ]
+
+
+def test_update_instance_search_entries_command(
+    db, instance_factory, form_field_factory
+):
+    instances = instance_factory.create_batch(3)
+    for instance in instances:
+        form_field_factory(instance=instance, name="bezeichnung", value="Haus")
+
+    InstanceSearchEntry.objects.filter(instance=instances[0]).delete()
+
+    call_command("update_instance_search_entries", "--missing", "--batch-size", "2")
+    assert InstanceSearchEntry.objects.count() == 3
+
+    call_command("update_instance_search_entries")
+    assert InstanceSearchEntry.objects.count() == 3
@@ -1,8 +1,10 @@
 import pytest
 from caluma.caluma_form.api import save_answer
 from caluma.caluma_form.models import Question
+from django.db.models import QuerySet
 
-from camac.instance.utils import set_construction_control
+from camac.instance.models import Instance
+from camac.instance.utils import set_construction_control, visible_instance_ids
 
 
 @pytest.mark.parametrize(
@@ -88,3 +90,31 @@ def test_set_construction_control(
         active=1,
         service=construction_control,
     ).exists()
+
+
+@pytest.mark.parametrize(
+    "optimisations_active,materialize,expect_subquery",
+    [(True, False, True), (True, True, False), (False, False, False)],
+)
+def test_visible_instance_ids(
+    db,
+    instance_factory,
+    application_settings,
+    django_assert_num_queries,
+    optimisations_active,
+    materialize,
+    expect_subquery,
+):
+    application_settings["VISIBILITY_PERFORMANCE_OPTIMISATIONS_ACTIVE"] = (
+        optimisations_active
+    )
+    instances = instance_factory.create_batch(3)
+
+    with django_assert_num_queries(0 if expect_subquery else 1):
+        ids = visible_instance_ids(
+            Instance.objects.filter(pk__in=[i.pk for i in instances[:2]]),
+            materialize=materialize,
+        )
+
+    assert isinstance(ids, QuerySet) == expect_subquery
+    assert set(Instance.objects.filter(pk__in=ids)) == set(instances[:2])
@@ -153,6 +153,36 @@ def test_form_data_validator_validate_deactivation(
     form_data_validator.validate()
 
 
+def test_compiled_form_config(
+    db, form_field_factory, form_factory, instance_factory, settings
+):
+    settings.FORM_CONFIG = FORM_CONFIG
+
+    compiled = validators.get_compiled_form_config()
+    order = compiled.get_order("form-a")
+
+    assert validators.get_compiled_form_config() is compiled
+    assert set(compiled.dependencies["question-4"]) == {"question-2", "question-3"}
+    assert set(order) == set(FORM_CONFIG["questions"])
+    assert order.index("question-0") < order.index("question-2")
+    assert order.index("question-3") < order.index("question-4")
+
+    for instance in instance_factory.create_batch(2, form=form_factory(name="form-a")):
+        form_field_factory(instance=instance, name="question-0", value="Yes")
+        validator = validators.FormDataValidator(instance)
+
+        assert validator.compiled_config is compiled
+        assert validator._check_question_active(
+            "question-2", FORM_CONFIG["questions"]["question-2"]
+        )
+
+    # every expression is parsed only once
+    assert len(compiled.jexl._parsed) == 3
+
+    settings.FORM_CONFIG = deepcopy(FORM_CONFIG)
+    assert validators.get_compiled_form_config() is not compiled
+
+
 DEFAULT_FORM_CONFIG = {
     "forms": {
         "form-a": [
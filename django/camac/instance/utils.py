@@ -6,6 +6,7 @@ from caluma.caluma_form.models import AnswerDocument, Option, Question
 from caluma.caluma_user.models import OIDCUser
 from caluma.caluma_workflow import models as workflow_models
 from caluma.caluma_workflow.api import complete_work_item, skip_work_item
+from django.conf import settings
 from django.db.models import Prefetch
 from django.db.models.query import QuerySet
 from django.utils.timezone import now
@@ -111,6 +112,26 @@ def set_construction_control(instance: Instance) -> Service:
     return construction_control
 
 
+def visible_instance_ids(queryset: QuerySet, materialize: bool = False):
+    """Return the IDs of the given instance queryset for use in `__in` filters.
+
+    If `VISIBILITY_PERFORMANCE_OPTIMISATIONS_ACTIVE` is enabled, the IDs are
+    returned as a lazy queryset, which ends up as subquery in the filtered
+    query. The database can then plan both together, and no (potentially
+    huge) list of IDs needs to be fetched, kept in memory and sent back as
+    query parameters for every filtered model.
+
+    Otherwise, or if `materialize` is set (e.g. if the queryset is known to
+    only return very few instances), the IDs are fetched and returned as list.
+    """
+    if materialize or not settings.APPLICATION.get(
+        "VISIBILITY_PERFORMANCE_OPTIMISATIONS_ACTIVE"
+    ):
+        return list(queryset.values_list("pk", flat=True))
+
+    return queryset.values("pk")
+
+
 def build_document_prefetch_statements(prefix="", prefetch_options=False):
     """Build needed prefetch statements to performantly fetch a document.
 
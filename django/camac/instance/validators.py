@@ -1,15 +1,16 @@
 import sys
+from contextvars import ContextVar
 from functools import partial
+from graphlib import TopologicalSorter
 
 import inflection
 from django.conf import settings
 from django.utils.translation import gettext as _
-from pyjexl.jexl import JEXL
 from pyproj import CRS, Transformer
 from rest_framework import exceptions
 
 from camac.document.models import Attachment
-from camac.jexl import ExtractTransformSubjectAnalyzer
+from camac.jexl import CachedJEXL, ExtractTransformSubjectAnalyzer
 
 from . import models
 
@@ -36,30 +37,110 @@ def transform_coordinates(coordinates):
     return converted_values
 
 
+_field_value = ContextVar("form_field_value")
+
+
+class CompiledFormConfig:
+    """Active expressions of a form config, parsed once per process.
+
+    Holds the questions every active expression depends on and, per form,
+    the questions of the form with their dependencies in topological order.
+    Evaluating the active questions of an instance in this order is a single
+    pass over already parsed expressions.
+    """
+
+    def __init__(self, form_config):
+        self.form_config = form_config
+        self.jexl = CachedJEXL()
+        # field values of the instance which is currently evaluated
+        self.jexl.add_transform("value", lambda name: _field_value.get()(name))
+        self.jexl.add_transform("mapby", lambda arr, key: [obj[key] for obj in arr])
+        self.jexl.add_binary_operator(
+            "in", 20, lambda value, arr: value in arr if arr else False
+        )
+
+        self.expressions = {}
+        self.dependencies = {}
+        for question, question_def in form_config["questions"].items():
+            expression = question_def.get("active-expression")
+
+            if expression is not None:
+                self.expressions[question] = expression
+                self.dependencies[question] = tuple(
+                    self.jexl.analyze(
+                        expression,
+                        partial(ExtractTransformSubjectAnalyzer, transforms=["value"]),
+                    )
+                )
+
+        self._orders = {}
+
+    def get_order(self, form_name):
+        """Questions of the form and their dependencies in topological order."""
+        if form_name not in self._orders:
+            graph = {}
+            pending = [
+                question
+                for module in self.form_config["forms"].get(form_name, [])
+                for question in self.form_config["modules"][module]["questions"]
+            ]
+
+            while pending:
+                question = pending.pop()
+
+                if question not in graph:
+                    graph[question] = self.dependencies.get(question, ())
+                    pending.extend(graph[question])
+
+            self._orders[form_name] = list(TopologicalSorter(graph).static_order())
+
+        return self._orders[form_name]
+
+    def evaluate(self, question, context, get_field_value):
+        token = _field_value.set(get_field_value)
+
+        try:
+            return self.jexl.evaluate(self.expressions[question], context)
+        finally:
+            _field_value.reset(token)
+
+
+_compiled_form_config = None
+
+
+def get_compiled_form_config():
+    """Compiled `settings.FORM_CONFIG`, rebuilt only if the setting changes."""
+    global _compiled_form_config
+
+    if (
+        _compiled_form_config is None
+        or _compiled_form_config.form_config is not settings.FORM_CONFIG
+    ):
+        _compiled_form_config = CompiledFormConfig(settings.FORM_CONFIG)
+
+    return _compiled_form_config
+
+
 class FormDataValidator(object):
     def __init__(self, instance):
         self.forms_def = settings.FORM_CONFIG
         self.instance = instance
 
         attachments = {}
-        for attachment in Attachment.objects.filter(instance=instance):
-            if attachment.question not in attachments:
-                attachments[attachment.question] = []
-            attachments[attachment.question].append(attachment.name)
+        for question, name in Attachment.objects.filter(instance=instance).values_list(
+            "question", "name"
+        ):
+            attachments.setdefault(question, []).append(name)
         self.fields = {
-            **{
-                field.name: field.value
-                for field in models.FormField.objects.filter(instance=instance)
-            },
+            **dict(
+                models.FormField.objects.filter(instance=instance).values_list(
+                    "name", "value"
+                )
+            ),
             # handle attachments like fields
             **attachments,
         }
-        self.jexl = JEXL()
-        self.jexl.add_transform("value", self.get_field_value)
-        self.jexl.add_transform("mapby", lambda arr, key: [obj[key] for obj in arr])
-        self.jexl.add_binary_operator(
-            "in", 20, lambda value, arr: value in arr if arr else False
-        )
+        self.compiled_config = get_compiled_form_config()
         self.active_question_cache = {}
 
     def get_field_value(self, name):
@@ -164,29 +245,33 @@ class FormDataValidator(object):
     def _check_question_active(self, question, question_def):
         """Question is active when at least one dependend question is active as well."""
 
-        if question in self.active_question_cache:
-            return self.active_question_cache[question]
+        if question not in self.active_question_cache:
+            # evaluate all questions of the form at once, each question after
+            # the questions it depends on
+            for name in self.compiled_config.get_order(self.instance.form.name):
+                if name not in self.active_question_cache:
+                    self.active_question_cache[name] = self._evaluate_active(name)
 
-        expression = question_def.get("active-expression")
-        if expression is None:
-            self.active_question_cache[question] = True
+        if question not in self.active_question_cache:  # pragma: no cover
+            # question which is not part of the form
+            self.active_question_cache[question] = self._evaluate_active(question)
+
+        return self.active_question_cache[question]
+
+    def _evaluate_active(self, question):
+        if question not in self.compiled_config.expressions:
             return True
 
-        dep_questions = self.jexl.analyze(
-            expression, partial(ExtractTransformSubjectAnalyzer, transforms=["value"])
-        )
-        active = False
         try:
-            active = self._check_questions_active(dep_questions) and self.jexl.evaluate(
-                expression, {"form": self.instance.form.name}
+            return self._check_questions_active(
+                self.compiled_config.dependencies[question]
+            ) and self.compiled_config.evaluate(
+                question, {"form": self.instance.form.name}, self.get_field_value
             )
         except TypeError:
             # A TypeError is raised if a question is not filled. It then tries
             # to e.g compare None < 250 which can't work
-            pass
-
-        self.active_question_cache[question] = active
-        return active
+            return False
 
     def _check_question_required(self, question, question_def):
         if not question_def["required"]:
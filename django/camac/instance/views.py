@@ -1,11 +1,13 @@
 import mimetypes
+from collections import defaultdict
 from datetime import timedelta
 
-import django_excel
 from caluma.caluma_form import models as form_models
 from caluma.caluma_workflow import api as workflow_api, models as workflow_models
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files import File
+from django.core.files.storage import default_storage
 from django.db import transaction
 from django.db.models import CharField, F, OuterRef, Q, Subquery, Value
 from django.db.models.expressions import Func
@@ -15,6 +17,8 @@ from django.db.models.functions import Cast
 from django.http import HttpResponse
 from django.utils import timezone
 from django.utils.translation import gettext as _
+from django_q.models import OrmQ
+from django_q.tasks import fetch
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from generic_permissions.visibilities import VisibilityViewMixin
@@ -35,13 +39,17 @@ from camac.core.models import InstanceService, PublicationEntry, WorkflowEntry
 from camac.core.utils import canton_aware
 from camac.core.views import SendfileHttpResponse
 from camac.document.models import Attachment, AttachmentSection
+from camac.export import StreamingExportResponse, get_file_format, iterate_chunks
 from camac.instance.domain_logic import RejectionLogic, WithdrawalLogic
 from camac.instance.master_data import MasterData
 from camac.instance.models import FormField
+from camac.instance.publication import get_public_list_cache_key
+from camac.instance.search import update_issue_search_entries
 from camac.instance.utils import build_document_prefetch_statements
 from camac.notification.utils import send_mail
 from camac.permissions import api as permissions_api
 from camac.permissions.events import Trigger
+from camac.permissions.mixins import PrefetchPermissionsMixin
 from camac.permissions.models import InstanceACL
 from camac.permissions.switcher import permission_switching_method
 from camac.swagger.utils import get_operation_description, group_param
@@ -109,6 +117,7 @@ class FormConfigDownloadView(RetrieveAPIView):
 
 
 class InstanceView(
+    PrefetchPermissionsMixin,
     mixins.InstanceQuerysetMixin,
     mixins.InstanceEditableMixin,
     VisibilityViewMixin,
@@ -124,7 +133,9 @@ class InstanceView(
     def include_in_swagger(cls):
         return settings.APPLICATION_NAME == "kt_bern"
 
-    queryset = models.Instance.objects.select_related("group__service")
+    queryset = models.Instance.objects.select_related(
+        "group__service", "case__document", "list_projection"
+    )
     prefetch_for_includes = {
         "circulations": ["circulations__activations"],
         "active_service": ["services"],
@@ -558,12 +569,8 @@ class InstanceView(
 
         queryset = self.filter_queryset(queryset)
 
-        def applicant_names(instance):
-            overrides = models.FormField.objects.filter(
-                instance=instance, name="projektverfasser-planer-override"
-            ).values("value")
-
-            applicants = overrides if len(overrides) else (instance.applicants or [])
+        def applicant_names(instance, overrides):
+            applicants = overrides or instance.applicants or []
 
             return ", ".join(
                 [
@@ -572,24 +579,27 @@ class InstanceView(
                 ]
             )
 
-        content = [
-            [
-                instance.pk,
-                instance.identifier,
-                instance.form.description,
-                instance.location and instance.location.name,
-                applicant_names(instance),
-                instance.description,
-                instance.instance_state.name,
-                instance.instance_state.description,
-            ]
-            for instance in queryset
-        ]
-
-        sheet = django_excel.pe.Sheet(content)
-        return django_excel.make_response(
-            sheet, file_type="xlsx", file_name="list.xlsx"
-        )
+        def rows():
+            for chunk in iterate_chunks(queryset):
+                overrides = defaultdict(list)
+                for field in models.FormField.objects.filter(
+                    instance__in=chunk, name="projektverfasser-planer-override"
+                ).values("instance_id", "value"):
+                    overrides[field.pop("instance_id")].append(field)
+
+                for instance in chunk:
+                    yield [
+                        instance.pk,
+                        instance.identifier,
+                        instance.form.description,
+                        instance.location and instance.location.name,
+                        applicant_names(instance, overrides[instance.pk]),
+                        instance.description,
+                        instance.instance_state.name,
+                        instance.instance_state.description,
+                    ]
+
+        return StreamingExportResponse(rows(), file_format=get_file_format(request))
 
     def get_export_detail_data(self, instance, type):
         validator = validators.FormDataValidator(instance)
@@ -878,6 +888,92 @@ class InstanceView(
         )
         return response
 
+    @swagger_auto_schema(auto_schema=None)
+    @action(methods=["get", "post"], detail=False, url_path="generate-pdfs")
+    def generate_pdfs(self, request):
+        """Generate the PDFs of multiple instances as ZIP archive.
+
+        The instances are selected with the `instance_id` filter. A POST
+        request generates the PDFs in a background task whose ID is returned.
+        The archive can then be fetched once by passing `task-id` to a GET
+        request which responds with status 202 as long as the task is queued.
+        """
+        task_id = request.query_params.get("task-id")
+
+        if request.method == "GET" and task_id:
+            return self._get_generated_pdfs(task_id)
+
+        if not request.query_params.get("instance_id"):
+            raise ValidationError(_("Filter by instance_id is required."))
+
+        instance_ids = list(
+            self.filter_queryset(self.get_queryset()).values_list("pk", flat=True)
+        )
+        kwargs = {
+            "form_slug": request.query_params.get("form-slug"),
+            "template": request.query_params.get("template"),
+        }
+        handler = document_merge_service.DMSHandler()
+
+        if request.method == "POST":
+            if len(instance_ids) > settings.DOCUMENT_MERGE_SERVICE_MAX_ASYNC_PDFS:
+                raise ValidationError(_("Too many instances."))
+
+            task_id = handler.start_generate_pdfs(instance_ids, request, **kwargs)
+            return response.Response(
+                {"task_id": task_id}, status=status.HTTP_202_ACCEPTED
+            )
+
+        if len(instance_ids) > settings.DOCUMENT_MERGE_SERVICE_MAX_SYNC_PDFS:
+            raise ValidationError(
+                _("Too many instances, the PDFs need to be generated with POST.")
+            )
+
+        pdfs = handler.generate_pdfs(instance_ids, request, **kwargs)
+
+        return self._zip_response(
+            document_merge_service.zip_pdfs([(pdf.name, pdf.read()) for pdf in pdfs])
+        )
+
+    def _get_generated_pdfs(self, task_id):
+        task_name = document_merge_service.get_generate_pdfs_task_name(self.request)
+        task = fetch(task_id)
+
+        if task is None:
+            # the broker keeps tasks until they are finished
+            if any(
+                queued.task_id() == task_id and queued.name() == task_name
+                for queued in OrmQ.objects.all()
+            ):
+                return response.Response(status=status.HTTP_202_ACCEPTED)
+
+            raise NotFound()
+
+        if (
+            task.func != document_merge_service.GENERATE_PDFS_TASK
+            or task.name != task_name
+        ):
+            raise NotFound()
+
+        if not task.success:
+            raise ValidationError(_("Generating the PDFs failed."))
+
+        # the archive can only be fetched once, abandoned archives are deleted
+        # by the `clean_generated_pdfs` command
+        with default_storage.open(task.result) as archive:
+            content = archive.read()
+
+        default_storage.delete(task.result)
+        task.delete()
+
+        return self._zip_response(content)
+
+    def _zip_response(self, archive):
+        pdf_response = HttpResponse(archive, content_type="application/zip")
+        pdf_response["Content-Disposition"] = 'attachment; filename="pdfs.zip"'
+
+        return pdf_response
+
     @swagger_auto_schema(auto_schema=None)
     @action(methods=["post"], detail=True)
     def archive(self, request, pk=None):
@@ -901,7 +997,14 @@ class InstanceView(
         url_path="dms-placeholders",
     )
     def dms_placeholders(self, request, pk):
-        serializer = self.get_serializer(instance=self.get_object())
+        # a template only references a few placeholders, so the client can
+        # pass them to skip computing all the others
+        placeholders = request.query_params.get("placeholders")
+
+        serializer = self.get_serializer(
+            instance=self.get_object(),
+            placeholders=placeholders.split(",") if placeholders else None,
+        )
         return response.Response(serializer.data)
 
     @swagger_auto_schema(auto_schema=None)
@@ -967,7 +1070,7 @@ class InstanceView(
         manager = permissions_api.PermissionManager.from_request(request)
 
         if request.method == "POST":
-            municipality = MasterData(instance.case).municipality
+            municipality = MasterData.for_case(instance.case).municipality
 
             if not municipality:  # pragma: no cover
                 raise ValidationError(_("Municipality must be set to grant access"))
@@ -1403,6 +1506,8 @@ class IssueTemplateSetView(views.ModelViewSet):
                 )
             )
         models.Issue.objects.bulk_create(issues)
+        # `bulk_create` doesn't send the signals which update the search entries
+        update_issue_search_entries(issues)
 
         return response.Response([], 204)
 
@@ -1433,8 +1538,31 @@ class PublicCalumaInstanceView(
         manual_parameters=[group_param],
     )
     def list(self, request, *args, **kwargs):
+        self.cache_key = get_public_list_cache_key(request)
+
+        if self.cache_key and (cached := cache.get(self.cache_key)):
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
         return super().list(request, *args, **kwargs)
 
+    def finalize_response(self, request, *args, **kwargs):
+        result = super().finalize_response(request, *args, **kwargs)
+
+        if (
+            getattr(self, "cache_key", None)
+            and isinstance(result, response.Response)
+            and result.status_code == status.HTTP_200_OK
+        ):
+            result.render()
+            cache.set(
+                self.cache_key,
+                (result.content, result["Content-Type"]),
+                settings.PUBLICATION_CACHE_TIMEOUT,
+            )
+
+        return result
+
     @permission_aware
     def get_queryset(self):
         return super().get_queryset().none()
@@ -1,4 +1,5 @@
 from pyjexl.analysis import ValidatingAnalyzer
+from pyjexl.jexl import JEXL
 
 
 class ExtractTransformSubjectAnalyzer(ValidatingAnalyzer):
@@ -17,3 +18,20 @@ class ExtractTransformSubjectAnalyzer(ValidatingAnalyzer):
             yield transform.subject.value
 
         yield from self.generic_visit(transform)
+
+
+class CachedJEXL(JEXL):
+    """JEXL which parses every expression only once.
+
+    Operators need to be added before the first expression is parsed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._parsed = {}
+
+    def parse(self, expression):
+        if expression not in self._parsed:
+            self._parsed[expression] = super().parse(expression)
+
+        return self._parsed[expression]
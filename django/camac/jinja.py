@@ -1,8 +1,15 @@
+from functools import lru_cache
+
+import jinja2
+import jinja2.meta
 from babel.dates import format_date
 from dateutil.parser import parse
 from django.conf import settings
 from jinja2.sandbox import SandboxedEnvironment
 
+# Number of distinct template sources kept compiled per process
+TEMPLATE_CACHE_SIZE = 512
+
 
 def dateformat(value, format="medium"):
     if value is None:
@@ -30,3 +37,30 @@ def get_jinja_env():
     jinja_env.filters["date"] = dateformat
     jinja_env.filters["getwithdefault"] = getwithdefault
     return jinja_env
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_template(source: str) -> jinja2.Template:
+    """Compile the given template source, or return it from the cache.
+
+    The cache is keyed by the source itself, so a modified template (or a
+    different translation of it) is compiled anew, while outdated versions
+    are evicted once they are the least recently used.
+    """
+    return jinja2.Template(source)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_placeholders(source: str) -> frozenset:
+    """Return the (lowercase) names of all variables used in the template.
+
+    As the template is parsed without any context, all used variables are
+    "undeclared variables". The result is cached the same way as in
+    `get_template()`.
+    """
+    ast = SandboxedEnvironment().parse(source)
+
+    return frozenset(
+        placeholder.lower()
+        for placeholder in jinja2.meta.find_undeclared_variables(ast)
+    )
@@ -1,12 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
 from django.core import mail
 from django.core.management.base import BaseCommand
-from django.db.models import Q
-
-from camac.user.models import Service, User
+from django.db import connection
+from django.db.models import BooleanField, ExpressionWrapper, Prefetch, Q
+
+from camac.user.models import Service, ServiceT, User
+
+# Count the overdue and not viewed work items per entry of the given array
+# column. `%(work_items)s` is the SQL of the annotated work item queryset.
+COUNT_PER_RECIPIENT_SQL = """
+    SELECT
+        %(kind)s,
+        recipient,
+        COUNT(DISTINCT work_items.id) FILTER (WHERE work_items.is_overdue),
+        COUNT(DISTINCT work_items.id) FILTER (WHERE work_items.is_not_viewed)
+    FROM (%(work_items)s) AS work_items
+    CROSS JOIN LATERAL UNNEST(work_items.%(column)s) AS recipient
+    GROUP BY recipient
+"""
 
 
 def get_task_trans(count, lang, controlling=False):
@@ -24,11 +39,19 @@ def get_task_trans(count, lang, controlling=False):
     return translations[lang]["singular" if count == 1 else "plural"]
 
 
+def get_service_name(service, language):
+    # uses the prefetched translations if available
+    return next(
+        (trans.name for trans in service.trans.all() if trans.language == language),
+        None,
+    )
+
+
 def render_service_template(
     addressed_overdue, addressed_not_viewed, controlling_overdue, service
 ):
     if settings.APPLICATION.get("IS_MULTILINGUAL"):
-        name = service.trans.filter(language="de").first().name
+        name = get_service_name(service, "de")
     else:
         name = service.name
 
@@ -46,7 +69,7 @@ Diese E-Mail wurde automatisch generiert, bitte antworten Sie nicht darauf.
 """
 
     if settings.APPLICATION.get("IS_MULTILINGUAL", False):
-        name_fr = service.trans.filter(language="fr").first().name
+        name_fr = get_service_name(service, "fr")
         text = (
             text
             + f"""
@@ -108,6 +131,21 @@ Ce message a été généré automatiquement, veuillez ne pas y répondre.
 class Command(BaseCommand):
     help = "Send reminders for unread or overdue work items."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of parallel SMTP connections",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            dest="batch_size",
+            help="Number of emails sent over one SMTP connection",
+        )
+
     def handle(self, *args, **options):
         subject = "Erinnerung an Aufgaben"
         if settings.APPLICATION.get("IS_MULTILINGUAL", False):
@@ -124,28 +162,36 @@ class Command(BaseCommand):
             )
             .filter(deadline__isnull=False)
             .filter(is_overdue | is_not_viewed)
-            .order_by("deadline", "name")
+            .annotate(
+                is_overdue=ExpressionWrapper(is_overdue, output_field=BooleanField()),
+                is_not_viewed=ExpressionWrapper(
+                    is_not_viewed, output_field=BooleanField()
+                ),
+            )
+            .order_by()
+            .values(
+                "id",
+                "assigned_users",
+                "addressed_groups",
+                "controlling_groups",
+                "is_overdue",
+                "is_not_viewed",
+            )
         )
 
+        counts = self._count_per_recipient(work_items)
+
         emails = []
 
         # assigned_users
-        all_assigned_usernames = set(
-            username
-            for item in work_items.values_list("assigned_users", flat=True)
-            for username in item
-        )
         all_assigned_users = (
             User.objects.exclude(disabled=1)
-            .filter(username__in=all_assigned_usernames)
+            .filter(username__in=counts["assigned_users"].keys())
             .order_by("username")
         )
 
         for user in all_assigned_users:
-            user_items = work_items.filter(assigned_users__contains=[user.username])
-
-            not_viewed_items = user_items.filter(is_not_viewed).count()
-            overdue_items = user_items.filter(is_overdue).count()
+            overdue_items, not_viewed_items = counts["assigned_users"][user.username]
 
             if not_viewed_items + overdue_items > 0:
                 emails.append(
@@ -157,17 +203,15 @@ class Command(BaseCommand):
                     )
                 )
 
-        all_services = self._get_addressed_and_controlling_services(work_items)
+        all_services = self._get_addressed_and_controlling_services(counts)
 
         for service in all_services:
-            addressed = work_items.filter(addressed_groups__contains=[str(service.pk)])
-            controlling = work_items.filter(
-                controlling_groups__contains=[str(service.pk)]
+            addressed_overdue, addressed_not_viewed = counts["addressed_groups"].get(
+                str(service.pk), (0, 0)
+            )
+            controlling_overdue, _ = counts["controlling_groups"].get(
+                str(service.pk), (0, 0)
             )
-
-            addressed_overdue = addressed.filter(is_overdue).count()
-            addressed_not_viewed = addressed.filter(is_not_viewed).count()
-            controlling_overdue = controlling.filter(is_overdue).count()
 
             if addressed_overdue + addressed_not_viewed + controlling_overdue > 0:
                 for to_email in service.email.split(","):
@@ -188,39 +232,86 @@ class Command(BaseCommand):
         print(f"sending {len(emails)} reminders")
 
         if emails:
-            # We could also invoke connection.send_messages() with all emails at
-            # once, but exceptions would cause the sending to be aborted halfway
-            # through, so we do the looping (and exception handling) here
-            # instead.
-            connection = mail.get_connection()
-            connection.open()
-            nsent = 0
-            nfailed = 0
+            self._send(emails, options["workers"], options["batch_size"])
+
+    def _count_per_recipient(self, work_items):
+        """Count overdue and not viewed work items per user and service.
+
+        Returns a dict with the keys `assigned_users`, `addressed_groups` and
+        `controlling_groups`, each mapping the recipient to a tuple of the
+        number of overdue and not viewed work items.
+        """
+        columns = ["assigned_users", "addressed_groups", "controlling_groups"]
+        work_items_sql, work_items_params = work_items.query.sql_with_params()
+
+        sql = " UNION ALL ".join(
+            COUNT_PER_RECIPIENT_SQL
+            % {"kind": "%s", "work_items": work_items_sql, "column": column}
+            for column in columns
+        )
+        params = [param for column in columns for param in [column, *work_items_params]]
+
+        counts = {column: {} for column in columns}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for column, recipient, overdue, not_viewed in cursor.fetchall():
+                counts[column][recipient] = (overdue, not_viewed)
+
+        return counts
+
+    def _send(self, emails, workers, batch_size):
+        # We could also invoke connection.send_messages() with all emails of a
+        # batch at once, but exceptions would cause the sending to be aborted
+        # halfway through, so we do the looping (and exception handling) in
+        # `_send_batch` instead.
+        batches = [
+            emails[offset : offset + batch_size]
+            for offset in range(0, len(emails), batch_size)
+        ]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._send_batch, batches))
+
+        nsent = sum(sent for sent, _ in results)
+        nfailed = sum(failed for _, failed in results)
+        print(f"ok: {nsent}, failed: {nfailed}")
+
+    def _send_batch(self, emails):
+        # every batch uses its own connection as they are not thread safe
+        smtp_connection = mail.get_connection()
+        smtp_connection.open()
+        nsent = 0
+        nfailed = 0
+        try:
             for email in emails:
                 try:
-                    connection.send_messages([email])
+                    smtp_connection.send_messages([email])
                     nsent += 1
                 except Exception as e:  # pragma: no cover
                     print(e)
                     nfailed += 1
-            print(f"ok: {nsent}, failed: {nfailed}")
-            connection.close()
+        finally:
+            smtp_connection.close()
+
+        return nsent, nfailed
 
-    def _get_addressed_and_controlling_services(self, work_items):
+    def _get_addressed_and_controlling_services(self, counts):
         all_service_ids = set()
-        for item in work_items.values("addressed_groups", "controlling_groups"):
-            for group in item["addressed_groups"] + item["controlling_groups"]:
-                try:
-                    int(group)
-                except ValueError:
-                    continue
+        for group in [*counts["addressed_groups"], *counts["controlling_groups"]]:
+            try:
+                int(group)
+            except ValueError:
+                continue
 
-                all_service_ids.add(group)
+            all_service_ids.add(group)
 
         return (
             Service.objects.exclude(
                 Q(disabled=1) | Q(notification=0) | Q(email__isnull=True)
             )
             .filter(pk__in=all_service_ids)
+            .prefetch_related(
+                Prefetch("trans", queryset=ServiceT.objects.order_by("pk"))
+            )
             .order_by("pk")
         )
@@ -21,17 +21,16 @@ from django.db.models import (
     OuterRef,
     Q,
     Subquery,
-    Sum,
     When,
 )
 from django.db.models.functions import Cast
 from django.utils import timezone, translation
 from django.utils.text import slugify
-from jinja2.sandbox import SandboxedEnvironment
 from rest_framework import exceptions
 from rest_framework_json_api import serializers
 
 from camac.billing.models import BillingV2Entry
+from camac.billing.utils import get_totals
 from camac.caluma.api import CalumaApi
 from camac.caluma.utils import find_answer, get_answer_display_value
 from camac.communications.models import CommunicationsMessage
@@ -52,6 +51,7 @@ from camac.instance.utils import (
     geometer_cadastral_survey_necessary_answer,
 )
 from camac.instance.validators import transform_coordinates
+from camac.jinja import get_placeholders, get_template
 from camac.lookups import Any
 from camac.permissions.models import InstanceACL
 from camac.user.models import Group, Role, Service, User
@@ -283,7 +283,7 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
         super().__init__(instance=instance, *args, **kwargs)
 
         if instance:
-            instance._master_data = MasterData(instance.case)
+            instance._master_data = MasterData.for_case(instance.case)
         self.service = (
             self.context["request"].group.service if "request" in self.context else None
         )
@@ -638,57 +638,34 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
             )
         return "---"
 
+    def _get_billing_totals(self, instance):
+        if not hasattr(self, "_billing_totals"):
+            self._billing_totals = {}
+
+        if instance.pk not in self._billing_totals:
+            self._billing_totals[instance.pk] = get_totals(
+                BillingV2Entry.objects.filter(instance=instance)
+            )
+
+        return self._billing_totals[instance.pk]
+
     def get_billing_total_kommunal(self, instance):
-        return (
-            BillingV2Entry.objects.filter(
-                instance=instance, organization=BillingV2Entry.MUNICIPAL
-            ).aggregate(total=Sum("final_rate"))["total"]
-            or "0.00"
-        )
+        return self._get_billing_totals(instance)[BillingV2Entry.MUNICIPAL]["total"]
 
     def get_billing_total_kanton(self, instance):
-        return (
-            BillingV2Entry.objects.filter(
-                instance=instance, organization=BillingV2Entry.CANTONAL
-            ).aggregate(total=Sum("final_rate"))["total"]
-            or "0.00"
-        )
+        return self._get_billing_totals(instance)[BillingV2Entry.CANTONAL]["total"]
 
     def get_billing_total(self, instance):
-        return (
-            BillingV2Entry.objects.filter(instance=instance).aggregate(
-                total=Sum("final_rate")
-            )["total"]
-            or "0.00"
-        )
+        return self._get_billing_totals(instance)["all"]["total"]
 
     def get_billing_total_uncharged(self, instance):
-        return (
-            BillingV2Entry.objects.filter(
-                instance=instance, date_charged__isnull=True
-            ).aggregate(total=Sum("final_rate"))["total"]
-            or "0.00"
-        )
+        return self._get_billing_totals(instance)["all"]["uncharged"]
 
     def get_billing_total_uncharged_kommunal(self, instance):
-        return (
-            BillingV2Entry.objects.filter(
-                instance=instance,
-                organization=BillingV2Entry.MUNICIPAL,
-                date_charged__isnull=True,
-            ).aggregate(total=Sum("final_rate"))["total"]
-            or "0.00"
-        )
+        return self._get_billing_totals(instance)[BillingV2Entry.MUNICIPAL]["uncharged"]
 
     def get_billing_total_uncharged_kanton(self, instance):
-        return (
-            BillingV2Entry.objects.filter(
-                instance=instance,
-                organization=BillingV2Entry.CANTONAL,
-                date_charged__isnull=True,
-            ).aggregate(total=Sum("final_rate"))["total"]
-            or "0.00"
-        )
+        return self._get_billing_totals(instance)[BillingV2Entry.CANTONAL]["uncharged"]
 
     def _get_inquiries(self, instance):
         if not settings.DISTRIBUTION:
@@ -1045,23 +1022,13 @@ class NotificationTemplateMergeSerializer(
     body = serializers.CharField(required=False)
 
     def _merge(self, value, data):
-        value_template = jinja2.Template(value)
-
-        return value_template.render(data)
+        # Templates are compiled once per process and version, as mass
+        # notifications render the same template over and over again
+        return get_template(value).render(data)
 
     def _get_used_placeholders(self, subject, body):
         try:
-            content = subject + body
-            env = SandboxedEnvironment()
-            ast = env.parse(content)
-
-            return [
-                placeholder.lower()
-                # Find all variables that are used in the notification template.
-                # Since we parsed the template with jinja without adding any
-                # context (variables) those will be "undeclared variables"
-                for placeholder in jinja2.meta.find_undeclared_variables(ast)
-            ]
+            return get_placeholders(subject + body)
         except jinja2.TemplateError as e:
             raise exceptions.ValidationError(str(e))
 
@@ -93,3 +93,37 @@ def test_dont_send_reminders_caluma(db, user, service, work_item_factory, mailou
     )
     call_command("send_work_item_reminders")
     assert len(mailoutbox) == 0
+
+
+@pytest.mark.freeze_time("2020-08-10")
+def test_send_work_item_reminders_batched(
+    db,
+    application_settings,
+    mailoutbox,
+    work_item_factory,
+    service_factory,
+    user_factory,
+    django_assert_max_num_queries,
+):
+    application_settings["IS_MULTILINGUAL"] = True
+    users = user_factory.create_batch(3)
+    services = service_factory.create_batch(10)
+
+    for i, service in enumerate(services):
+        work_item_factory(
+            status="ready",
+            meta={"not-viewed": i % 2 == 0},
+            deadline=timezone.now() - timedelta(days=i % 3),
+            assigned_users=[users[i % 3].username],
+            addressed_groups=[str(service.pk)],
+            controlling_groups=[str(services[0].pk)],
+        )
+
+    # the number of queries doesn't depend on the number of recipients
+    with django_assert_max_num_queries(4):
+        call_command("send_work_item_reminders", "--workers", "2", "--batch-size", "3")
+
+    assert len(mailoutbox) == 13
+    assert sorted(to for mail in mailoutbox for to in mail.to) == sorted(
+        [user.email for user in users] + [service.email for service in services]
+    )
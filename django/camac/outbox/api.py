@@ -0,0 +1,162 @@
+"""Transactional outbox for side effects of workflow events.
+
+Side effects like sending notifications or eCH-0211 messages are slow and
+must not hold the transaction of the triggering request open. Instead, they
+are written as `OutboxMessage` in the same transaction and executed by a
+worker after the transaction was committed:
+
+    from camac.outbox import api as outbox
+
+    outbox.enqueue(
+        "camac.notification.utils.send_mail_without_request",
+        {"slug": "some-template", "instance": {"id": 1, "type": "instances"}},
+        instance=instance,
+    )
+
+The handler is called with the payload as keyword arguments, so the payload
+must be JSON serializable. Messages of the same instance are processed in the
+order they were created. A failing message is retried with an exponential
+backoff and blocks the following messages of its instance until it succeeds
+or ultimately fails.
+
+Processing is triggered as django-q task after the commit. Additionally, the
+`process-outbox` schedule drains the outbox every minute, which picks up
+retries and messages whose task got lost.
+
+A message is claimed in a short transaction before its handler runs, so no
+lock is held while the handler does its (slow) work. The claim expires after
+`OUTBOX_CLAIM_TIMEOUT` seconds, after which a message of a crashed worker is
+processed again. Side effects are thus delivered at least once.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, Min, OuterRef
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django_q.tasks import async_task
+
+from camac.outbox.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(handler, payload, instance=None):
+    """Execute the handler after the current transaction was committed.
+
+    `instance` is only used to process the messages of an instance in order.
+    """
+    if not settings.OUTBOX_ENABLED:
+        return import_string(handler)(**payload)
+
+    OutboxMessage.objects.create(handler=handler, instance=instance, payload=payload)
+
+    transaction.on_commit(_schedule_processing)
+
+
+def _schedule_processing():
+    async_task("camac.outbox.api.process")
+
+
+def _next_message():
+    """Lock and return the next message which may be processed.
+
+    A message may only be processed if there is no older pending message of
+    the same instance. Messages locked by another worker are skipped.
+    """
+    older_pending = OutboxMessage.objects.pending().filter(
+        instance=OuterRef("instance"), pk__lt=OuterRef("pk")
+    )
+
+    return (
+        OutboxMessage.objects.pending()
+        .filter(available_at__lte=timezone.now())
+        .exclude(Exists(older_pending))
+        .select_for_update(skip_locked=True)
+        .order_by("pk")
+        .first()
+    )
+
+
+def _claim_next():
+    """Claim the next message for `OUTBOX_CLAIM_TIMEOUT` seconds."""
+    with transaction.atomic():
+        message = _next_message()
+
+        if message:
+            message.available_at = timezone.now() + timedelta(
+                seconds=settings.OUTBOX_CLAIM_TIMEOUT
+            )
+            message.save(update_fields=["available_at"])
+
+        return message
+
+
+def process_next():
+    """Process the next message and return it, or `None` if there is none."""
+    message = _claim_next()
+
+    if not message:
+        return None
+
+    try:
+        # the changes of a failing handler are rolled back
+        with transaction.atomic():
+            import_string(message.handler)(**message.payload)
+    except Exception as e:
+        message.attempts += 1
+        message.last_error = repr(e)
+
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            message.failed_at = timezone.now()
+            logger.exception(f"Outbox message {message.pk} failed ultimately")
+        else:
+            message.available_at = timezone.now() + timedelta(
+                seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (message.attempts - 1)
+            )
+            logger.warning(
+                f"Outbox message {message.pk} failed, retrying at "
+                f"{message.available_at}: {message.last_error}"
+            )
+    else:
+        message.processed_at = timezone.now()
+
+    message.save()
+
+    return message
+
+
+def process(limit=None):
+    """Process messages until there are none left or `limit` is reached.
+
+    Returns the number of processed and failed messages.
+    """
+    processed = 0
+    failed = 0
+
+    while limit is None or processed + failed < limit:
+        message = process_next()
+
+        if not message:
+            break
+
+        if message.processed_at:
+            processed += 1
+        else:
+            failed += 1
+
+    logger.info(f"Outbox lag: {get_lag().total_seconds()}s")
+
+    return processed, failed
+
+
+def get_lag():
+    """Age of the oldest pending message, the queue lag."""
+    oldest = OutboxMessage.objects.pending().aggregate(oldest=Min("created_at"))[
+        "oldest"
+    ]
+
+    return timezone.now() - oldest if oldest else timedelta(0)
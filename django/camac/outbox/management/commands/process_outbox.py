@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from camac.outbox import api
+from camac.outbox.models import OutboxMessage
+
+
+class Command(BaseCommand):
+    help = (
+        "Process pending outbox messages. Messages are usually processed by "
+        "django-q right after they were created and retried by the "
+        "`process-outbox` schedule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of messages to process",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            default=False,
+            help="Only output the state of the queue",
+        )
+
+    def handle(self, *args, **options):
+        if not options["status"]:
+            processed, failed = api.process(options["limit"])
+            self.stdout.write(f"Processed {processed} messages, {failed} failed")
+
+        self.stdout.write(
+            f"Pending: {OutboxMessage.objects.pending().count()}, "
+            f"failed: {OutboxMessage.objects.filter(failed_at__isnull=False).count()}, "
+            f"lag: {api.get_lag().total_seconds()}s"
+        )
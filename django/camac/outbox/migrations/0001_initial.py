@@ -0,0 +1,87 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("instance", "0039_instance_rejection_feedback"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "handler",
+                    models.CharField(
+                        help_text="Dotted path to the function to call",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Keyword arguments passed to the handler",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="The message is not processed before",
+                    ),
+                ),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "failed_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Set when all attempts have failed",
+                        null=True,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                (
+                    "instance",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Messages of the same instance are processed in order",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="outbox_messages",
+                        to="instance.instance",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["pk"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="outboxmessage",
+            index=models.Index(
+                condition=models.Q(
+                    ("failed_at__isnull", True), ("processed_at__isnull", True)
+                ),
+                fields=["instance", "id"],
+                name="outbox_pending_idx",
+            ),
+        ),
+    ]
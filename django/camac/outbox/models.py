@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessageQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(processed_at__isnull=True, failed_at__isnull=True)
+
+
+class OutboxMessage(models.Model):
+    """Side effect which is executed after the transaction that caused it.
+
+    The message is written in the same transaction as the change it belongs
+    to and executed by a worker afterwards (see `camac.outbox.api`).
+    """
+
+    instance = models.ForeignKey(
+        "instance.Instance",
+        models.CASCADE,
+        related_name="outbox_messages",
+        null=True,
+        blank=True,
+        help_text="Messages of the same instance are processed in order",
+    )
+    handler = models.CharField(
+        max_length=255, help_text="Dotted path to the function to call"
+    )
+    payload = models.JSONField(
+        default=dict, help_text="Keyword arguments passed to the handler"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(
+        default=timezone.now, help_text="The message is not processed before"
+    )
+    processed_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(
+        null=True, blank=True, help_text="Set when all attempts have failed"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    objects = OutboxMessageQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["pk"]
+        indexes = [
+            models.Index(
+                fields=["instance", "id"],
+                name="outbox_pending_idx",
+                condition=models.Q(processed_at__isnull=True, failed_at__isnull=True),
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.handler} ({self.pk})"
@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from camac.outbox import api
+from camac.outbox.models import OutboxMessage
+
+HANDLER = "camac.outbox.tests.test_api.handler"
+
+
+def handler(**kwargs):  # pragma: no cover
+    pass
+
+
+@pytest.fixture
+def handler_mock(mocker):
+    return mocker.patch("camac.outbox.tests.test_api.handler")
+
+
+def test_enqueue(db, instance, handler_mock):
+    # processing is triggered on commit which is executed immediately in tests
+    api.enqueue(HANDLER, {"foo": "bar"}, instance=instance)
+
+    handler_mock.assert_called_once_with(foo="bar")
+
+    message = OutboxMessage.objects.get()
+    assert message.instance == instance
+    assert message.processed_at
+    assert message.attempts == 0
+
+
+def test_enqueue_disabled(db, settings, handler_mock):
+    settings.OUTBOX_ENABLED = False
+
+    api.enqueue(HANDLER, {"foo": "bar"})
+
+    handler_mock.assert_called_once_with(foo="bar")
+    assert not OutboxMessage.objects.exists()
+
+
+def test_process_order(db, instance_factory, handler_mock):
+    instance, other_instance = instance_factory.create_batch(2)
+
+    first = OutboxMessage.objects.create(
+        handler=HANDLER,
+        instance=instance,
+        payload={"i": 1},
+        available_at=timezone.now() + timedelta(minutes=5),
+    )
+    OutboxMessage.objects.create(handler=HANDLER, instance=instance, payload={"i": 2})
+    OutboxMessage.objects.create(
+        handler=HANDLER, instance=other_instance, payload={"i": 3}
+    )
+
+    # the second message of the instance is blocked by the first one which
+    # isn't available yet
+    assert api.process() == (1, 0)
+    handler_mock.assert_called_once_with(i=3)
+
+    first.available_at = timezone.now()
+    first.save()
+
+    assert api.process() == (2, 0)
+    assert [call.kwargs for call in handler_mock.call_args_list[1:]] == [
+        {"i": 1},
+        {"i": 2},
+    ]
+    assert not OutboxMessage.objects.pending().exists()
+
+
+def test_process_retry(db, instance, settings, handler_mock, freezer):
+    settings.OUTBOX_MAX_ATTEMPTS = 3
+    settings.OUTBOX_RETRY_DELAY = 60
+    handler_mock.side_effect = ValueError("smtp down")
+
+    message = OutboxMessage.objects.create(handler=HANDLER, instance=instance)
+
+    for attempt, delay in [(1, 60), (2, 120)]:
+        assert api.process() == (0, 1)
+
+        message.refresh_from_db()
+        assert message.attempts == attempt
+        assert message.available_at == timezone.now() + timedelta(seconds=delay)
+        assert "smtp down" in message.last_error
+
+        # not due yet
+        assert api.process() == (0, 0)
+
+        freezer.tick(timedelta(seconds=delay))
+
+    assert api.process() == (0, 1)
+
+    message.refresh_from_db()
+    assert message.attempts == 3
+    assert message.failed_at
+    assert not OutboxMessage.objects.pending().exists()
+
+
+def test_process_outbox_command(db, instance, handler_mock, freezer):
+    OutboxMessage.objects.create(handler=HANDLER, instance=instance)
+    OutboxMessage.objects.create(handler=HANDLER, instance=instance)
+
+    freezer.tick(timedelta(seconds=30))
+
+    call_command("process_outbox", "--status")
+    assert api.get_lag() == timedelta(seconds=30)
+    assert not handler_mock.called
+
+    call_command("process_outbox", "--limit", "1")
+    assert handler_mock.call_count == 1
+
+    call_command("process_outbox")
+    assert handler_mock.call_count == 2
+    assert api.get_lag() == timedelta(0)
+
+
+def test_process_claim(db, instance, settings, handler_mock, freezer):
+    settings.OUTBOX_CLAIM_TIMEOUT = 600
+
+    OutboxMessage.objects.create(handler=HANDLER, instance=instance)
+
+    # the message is claimed while its handler runs
+    handler_mock.side_effect = lambda: api.process_next()
+    assert api.process() == (1, 0)
+    assert handler_mock.call_count == 1
+
+    # a claim of a crashed worker expires
+    handler_mock.side_effect = None
+    message = OutboxMessage.objects.create(handler=HANDLER, instance=instance)
+    assert api._claim_next() == message
+    assert api.process() == (0, 0)
+
+    freezer.tick(timedelta(seconds=600))
+
+    assert api.process() == (1, 0)
+    assert handler_mock.call_count == 2
@@ -1,6 +1,8 @@
+import time
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from django.conf import ImproperlyConfigured, settings
 from django.core.cache import cache
@@ -75,7 +77,7 @@ class ACLUserInfo:
             "role": self.role,
         }
 
-    def to_cache_key(self, instance: Union[Instance, str, int]):
+    def to_cache_key(self, instance: Union[Instance, str, int], generation: int):
         user = self.user.pk if self.user else "-"
         service = self.service.pk if self.service else "-"
         token = self.token.pk if self.token else "-"
@@ -86,16 +88,24 @@ class ACLUserInfo:
             str(instance.pk) if isinstance(instance, Instance) else str(instance)
         )
 
-        # The instance is first, so we can match better when revoking permissions
-        return f"permissions:i={instance_id},r={role},u={user},s={service},t={token}"
+        # The generation is bumped whenever the ACLs of the instance change,
+        # so entries cached for an older generation are simply never read
+        # again (see `_clear_cache_for_acl()`)
+        return (
+            f"permissions:i={instance_id},g={generation},"
+            f"r={role},u={user},s={service},t={token}"
+        )
 
 
 class PermissionManager:
     userinfo: ACLUserInfo
     default_event: Optional[str] = None
 
-    def __init__(self, userinfo: ACLUserInfo):
+    def __init__(self, userinfo: ACLUserInfo, prefetched: Optional[dict] = None):
         self.userinfo = userinfo
+        # Permissions already evaluated via `get_permissions_bulk()`, keyed
+        # by instance ID
+        self._prefetched = {} if prefetched is None else prefetched
 
     @classmethod
     def for_anonymous(cls) -> "PermissionManager":
@@ -112,7 +122,13 @@ class PermissionManager:
         # TODO: Token ACL is not specified yet, so
         # this part is always unset
         userinfo = ACLUserInfo.from_request(request)
-        return cls(userinfo=userinfo)
+
+        # Bulk-evaluated permissions are shared between all managers of the
+        # same request, as they are usually created per call site
+        if not hasattr(request, "_permissions_prefetched"):
+            request._permissions_prefetched = {}
+
+        return cls(userinfo=userinfo, prefetched=request._permissions_prefetched)
 
     def get_permissions(self, instance: Union[Instance, str, int]) -> List[str]:
         # We can globally disable the cache. By default, caching is enabled,
@@ -120,9 +136,15 @@ class PermissionManager:
         # won't be kept around
         enable_cache = settings.PERMISSIONS.get("ENABLE_CACHE", True)
 
+        instance_id = instance.pk if isinstance(instance, Instance) else int(instance)
+        if instance_id in self._prefetched:
+            return self._prefetched[instance_id]
+
         if not isinstance(instance, Instance):  # pragma: no cover
             instance = Instance.objects.get(pk=instance)
-        cache_key = self.userinfo.to_cache_key(instance)
+        cache_key = self.userinfo.to_cache_key(
+            instance, _get_cache_generations([instance.pk])[instance.pk]
+        )
 
         cached_result = cache.get(cache_key)
         if enable_cache and cached_result:
@@ -136,7 +158,90 @@ class PermissionManager:
             .select_related("access_level")
         )
 
+        permissions, allow_caching, expiry = self._evaluate_acls(instance, acls)
+
+        if enable_cache and allow_caching:
+            cache_duration = expiry - timezone.now()
+            cache.set(cache_key, permissions, cache_duration.total_seconds())
+        return permissions
+
+    def get_permissions_bulk(
+        self, instances: Iterable[Union[Instance, str, int]]
+    ) -> Dict[int, List[str]]:
+        """Return the permissions for many instances at once.
+
+        This is equivalent to calling `get_permissions()` for every given
+        instance, but the cache is queried with a single `get_many()` call,
+        and the ACLs of all uncached instances are fetched in a single query.
+
+        The result is a dict mapping instance IDs to the sorted list of
+        permissions. It is also remembered on the manager (and shared with
+        all other managers of the same request, see `from_request()`), so
+        subsequent `get_permissions()` calls for those instances are free.
+        """
+        enable_cache = settings.PERMISSIONS.get("ENABLE_CACHE", True)
+
+        instances_by_id = _instances_by_id(instances)
+        result = {
+            pk: self._prefetched[pk] for pk in instances_by_id if pk in self._prefetched
+        }
+        to_evaluate = {
+            pk: instance for pk, instance in instances_by_id.items() if pk not in result
+        }
+
+        cache_keys = {}
+        if enable_cache and to_evaluate:
+            generations = _get_cache_generations(to_evaluate.keys())
+            cache_keys = {
+                self.userinfo.to_cache_key(pk, generations[pk]): pk
+                for pk in to_evaluate.keys()
+            }
+            for cache_key, cached_result in cache.get_many(cache_keys.keys()).items():
+                if cached_result:
+                    result[cache_keys[cache_key]] = cached_result
+                    del to_evaluate[cache_keys[cache_key]]
+
+        acls_by_instance = defaultdict(list)
+        if to_evaluate:
+            acls = (
+                models.InstanceACL.for_current_user(**self.userinfo.to_kwargs())
+                .filter(instance_id__in=to_evaluate.keys())
+                .select_related("access_level")
+            )
+            for acl in acls:
+                acls_by_instance[acl.instance_id].append(acl)
+
+        # `set_many()` only supports a single timeout, so we group the new
+        # cache entries by their expiry
+        to_cache = defaultdict(dict)
+        cache_keys_by_pk = {pk: key for key, pk in cache_keys.items()}
+        now = timezone.now()
+        for pk, instance in to_evaluate.items():
+            permissions, allow_caching, expiry = self._evaluate_acls(
+                instance, acls_by_instance[pk]
+            )
+            result[pk] = permissions
+
+            if enable_cache and allow_caching:
+                timeout = int((expiry - now).total_seconds())
+                to_cache[timeout][cache_keys_by_pk[pk]] = permissions
+
+        for timeout, entries in to_cache.items():
+            cache.set_many(entries, timeout)
+
+        self._prefetched.update(result)
+        return result
+
+    def _evaluate_acls(
+        self, instance: Instance, acls: Iterable[InstanceACL]
+    ) -> Tuple[List[str], bool, datetime]:
+        """Evaluate the permissions granted by the given ACLs on an instance.
+
+        Return a tuple of the sorted permissions, whether the result may be
+        cached, and the time until which the result stays valid.
+        """
         granted_permissions = set()
+        allow_caching = True
         # We try to cache rather long
         expiry = timezone.now() + timedelta(days=10)
 
@@ -149,7 +254,7 @@ class PermissionManager:
             for perm, condition in self._access_level_config(access_level.slug):
                 # Cache gets disabled on the first condition that doesn't
                 # allow caching
-                enable_cache = enable_cache and getattr(
+                allow_caching = allow_caching and getattr(
                     condition, "allow_caching", False
                 )
 
@@ -171,11 +276,7 @@ class PermissionManager:
                         f"permission {perm}"
                     )
 
-        permissions_sorted = sorted(granted_permissions)
-        if enable_cache:
-            cache_duration = expiry - timezone.now()
-            cache.set(cache_key, permissions_sorted, cache_duration.total_seconds())
-        return permissions_sorted
+        return sorted(granted_permissions), allow_caching, expiry
 
     def has_any(self, instance, required_permissions: Union[str, List[str]]):
         """Return True if user has at least one of the required permissions."""
@@ -282,6 +383,11 @@ class PermissionManager:
             revoked_by_user=self.userinfo.user if ends_at else None,
             **additional_attrs,
         )
+        # Granting may extend the permissions of an undefined set of users
+        # as well, so we need to invalidate the cache in the same way as
+        # when revoking
+        _clear_cache_for_acl(new_acl)
+        self._prefetched.pop(instance.pk, None)
         return new_acl
 
     def revoke(
@@ -299,6 +405,7 @@ class PermissionManager:
 
         acl.revoke(ends_at)
         acl.save()
+        self._prefetched.pop(acl.instance_id, None)
         # Any revocation clears the permissions cache for the affected instance.
         # We must clear the cache *after* the ACL has been revoked to avoid any
         # race condition (ACL gets re-cached before it's in the DB, thus it's
@@ -421,25 +528,75 @@ def _validate_grant(  # noqa: C901
         )
 
 
+def _instances_by_id(
+    instances: Iterable[Union[Instance, str, int]],
+) -> Dict[int, Instance]:
+    """Map the given instances (objects or IDs) by their ID.
+
+    Instances passed as ID are fetched in a single query.
+    """
+    instances_by_id = {}
+    missing_ids = set()
+    for instance in instances:
+        if isinstance(instance, Instance):
+            instances_by_id[instance.pk] = instance
+        else:
+            missing_ids.add(int(instance))
+
+    missing_ids -= instances_by_id.keys()
+    if missing_ids:
+        # Conditions usually look at the instance state and the case, so
+        # we fetch them along in the same query
+        instances_by_id.update(
+            Instance.objects.filter(pk__in=missing_ids)
+            .select_related("instance_state", "case__document")
+            .in_bulk()
+        )
+
+    return instances_by_id
+
+
+def _cache_generation_key(instance_id) -> str:
+    return f"permissions-generation:i={instance_id}"
+
+
+def _get_cache_generations(instance_ids: Iterable[int]) -> Dict[int, int]:
+    """Return the current permissions cache generation of the given instances.
+
+    A generation that doesn't exist yet (or has been evicted from the cache)
+    is initialized with the current time. This way, it will never match a
+    generation that has been used for previously cached entries.
+    """
+    keys = {_cache_generation_key(pk): pk for pk in instance_ids}
+    generations = cache.get_many(keys.keys())
+
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        initial = time.time_ns()
+        for key in missing:
+            # `add()` won't overwrite a generation that has been set
+            # concurrently in the meantime
+            cache.add(key, initial, timeout=None)
+        generations.update(cache.get_many(missing))
+
+    return {keys[key]: generation for key, generation in generations.items()}
+
+
 def _clear_cache_for_acl(acl):
     """Clear cache for the instance affected by this ACL.
 
-    This is required, because when revoking an ACL, this may affect an undefined
-    set of user's access to that instance. We "naively" evict any related cache
-    to ensure the next permissions check actually checks the new situation.
+    This is required, because when granting or revoking an ACL, this may
+    affect an undefined set of user's access to that instance.
+
+    Instead of searching and deleting the affected keys (which most cache
+    backends, memcached included, don't support), we bump the instance's
+    cache generation. All entries cached for the previous generation are
+    not used anymore and expire on their own, while the cached permissions
+    of all other instances stay untouched.
     """
-    # Not sure we should keep this.. but it's the only way found (till now)
-    # Note we cannot check for 'key startswith prefix', as the LocmemCache
-    # does the versioning by prefixing our key with the version, which we don't
-    # use
-    actual_cache = cache._connections["default"]
-    if hasattr(actual_cache, "keys"):  # pragma: no cover
-        # REDIS, MEMCACHE etc have this.
-        # TODO: Maybe we can mock a "proper" cache to test these lines?
-        revoke_keys = actual_cache.keys(f"permissions:i={acl.instance_id},.*")
-        cache.delete_many(keys=revoke_keys)
-    else:
-        # LocmemCache - we can't reliably find keys with given
-        # prefix, so we just evict all. This should only happen in testing,
-        # as we normally do have a Memcache instance connected
-        cache.clear()
+    key = _cache_generation_key(acl.instance_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Generation not set (or evicted): Starting a new one is just as good
+        cache.add(key, time.time_ns(), timeout=None)
@@ -1,5 +1,7 @@
 from typing import Optional
 
+from django.conf import settings
+
 from .api import PermissionManager
 
 
@@ -28,3 +30,31 @@ class PermissionVisibilityMixin:
         # Need to be distinct() because multiple ACLs could be effective
         # for the same user/instance combo
         return qs.distinct()
+
+
+class PrefetchPermissionsMixin:
+    """Mixin to evaluate the permissions of all listed instances at once.
+
+    Serializers of list views often need the permissions of every row (for
+    example to render per-instance actions). Instead of evaluating them one
+    by one, the permissions of all instances in the (paginated) list are
+    fetched upfront via `PermissionManager.get_permissions_bulk()`. Any
+    later `get_permissions()` call within the same request is then served
+    from the prefetched result.
+
+    The mixin needs to be applied to a viewset whose list action returns
+    instances.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if (
+            settings.PERMISSIONS.get("ENABLED")
+            and kwargs.get("many")
+            and args
+            and self.action == "list"
+        ):
+            instances = list(args[0])
+            PermissionManager.from_request(self.request).get_permissions_bulk(instances)
+            args = (instances, *args[1:])
+
+        return super().get_serializer(*args, **kwargs)
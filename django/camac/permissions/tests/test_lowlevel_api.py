@@ -279,6 +279,128 @@ def test_cache_eviction(
     assert permissions == []
 
 
+@pytest.mark.parametrize("enable_cache", [True, False])
+def test_get_permissions_bulk(
+    db,
+    user,
+    permissions_settings,
+    access_level,
+    instance_factory,
+    django_assert_num_queries,
+    clear_cache,
+    enable_cache,
+):
+    permissions_settings["ACCESS_LEVELS"] = {
+        access_level.pk: [
+            ("foo", conditions.Always()),
+            ("bar", conditions.Never()),
+        ]
+    }
+    permissions_settings["ENABLE_CACHE"] = enable_cache
+
+    instances = instance_factory.create_batch(5)
+    for instance in instances[:3]:
+        api.grant(
+            instance,
+            grant_type="USER",
+            access_level=access_level,
+            user=user,
+        )
+
+    manager = api.PermissionManager(api.ACLUserInfo(user=user))
+
+    # A single query for all ACLs, regardless of the number of instances
+    with django_assert_num_queries(1):
+        permissions = manager.get_permissions_bulk(instances)
+
+    assert permissions == {
+        instance.pk: (["foo"] if instance in instances[:3] else [])
+        for instance in instances
+    }
+
+    # Subsequent single lookups are served from the prefetched result
+    with django_assert_num_queries(0):
+        for instance in instances:
+            assert manager.get_permissions(instance) == permissions[instance.pk]
+
+    # Other managers use the cache (if enabled) instead of the DB
+    other_manager = api.PermissionManager(api.ACLUserInfo(user=user))
+    with django_assert_num_queries(0 if enable_cache else 1):
+        assert other_manager.get_permissions_bulk(instances[:3]) == {
+            instance.pk: ["foo"] for instance in instances[:3]
+        }
+
+    # Passing IDs works as well, and must yield the same result
+    assert (
+        api.PermissionManager(api.ACLUserInfo(user=user)).get_permissions_bulk(
+            [instance.pk for instance in instances]
+        )
+        == permissions
+    )
+
+
+def test_cache_hit_rate_with_frequent_acl_changes(
+    db,
+    user,
+    service_factory,
+    permissions_settings,
+    access_level,
+    instance_factory,
+    clear_cache,
+):
+    """Simulate a distribution workflow with lots of grants and revocations.
+
+    Every grant or revocation must only invalidate the cached permissions
+    of the affected instance, so the permissions of all other instances
+    are still served from the cache.
+    """
+    evaluations = {"count": 0}
+
+    def count_evaluation():
+        evaluations["count"] += 1
+        return True
+
+    permissions_settings["ACCESS_LEVELS"] = {
+        access_level.pk: [
+            ("foo", conditions.Callback(count_evaluation, allow_caching=True)),
+        ]
+    }
+    permissions_settings["ENABLE_CACHE"] = True
+
+    instances = instance_factory.create_batch(10)
+    for instance in instances:
+        api.grant(instance, grant_type="USER", access_level=access_level, user=user)
+
+    def lookup_all():
+        manager = api.PermissionManager(api.ACLUserInfo(user=user))
+        for instance in instances:
+            assert manager.get_permissions(instance) == ["foo"]
+
+    # warm up the cache
+    lookup_all()
+    evaluations["count"] = 0
+
+    rounds = 20
+    for i in range(rounds):
+        # Invite a service to an inquiry, and revoke its access again
+        acl = api.grant(
+            instances[i % len(instances)],
+            grant_type="SERVICE",
+            access_level=access_level,
+            service=service_factory(),
+        )
+        lookup_all()
+        api.revoke(acl)
+        lookup_all()
+
+    lookups = rounds * 2 * len(instances)
+    hit_rate = 1 - evaluations["count"] / lookups
+
+    # Only the affected instance is re-evaluated after each change
+    assert evaluations["count"] == rounds * 2
+    assert hit_rate == 0.9
+
+
 MSG_USER = "Grant type USER must have only the `user` value set"
 MSG_SERVICE = "Grant type SERVICE must have only the `service` value set"
 MSG_TOKEN = "Grant type TOKEN must have only the `token` value set"
@@ -206,7 +206,9 @@ class InstanceACLViewset(InstanceQuerysetMixin, ModelViewSet):
 
 
 class InstancePermissionsViewset(
-    mixins.PermissionVisibilityMixin, ReadOnlyModelViewSet
+    mixins.PrefetchPermissionsMixin,
+    mixins.PermissionVisibilityMixin,
+    ReadOnlyModelViewSet,
 ):
     filterset_class = instance_filters.InstanceFilterSet
     serializer_class = serializers.InstancePermissionSerializer
@@ -106,6 +106,7 @@ INSTALLED_APPS = [
     "camac.permissions.apps.PermissionsConfig",
     "camac.gis.apps.GisConfig",
     "camac.billing.apps.BillingConfig",
+    "camac.outbox.apps.OutboxConfig",
     "sorl.thumbnail",
     "django_clamd",
     "django_q",
@@ -145,6 +146,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "camac.user.middleware.GroupMiddleware",
     "camac.caluma.middleware.CalumaInfoMiddleware",
+    "camac.instance.middleware.MasterDataMiddleware",
     "camac.middleware.LoggingMiddleware",
     "reversion.middleware.RevisionMiddleware",
     "simple_history.middleware.HistoryRequestMiddleware",
@@ -2814,6 +2816,24 @@ KEYCLOAK_OIDC_TOKEN_URL = build_url(
 OIDC_BEARER_TOKEN_REVALIDATION_TIME = env.int(
     "OIDC_BEARER_TOKEN_REVALIDATION_TIME", default=10
 )
+# Seconds the groups resolved for users are cached (see camac.user.utils.GroupCache)
+GROUP_CACHE_TIMEOUT = env.int("DJANGO_GROUP_CACHE_TIMEOUT", default=default(0, 60))
+
+# Verify tokens locally against the (cached) JWKS of the realm and build the
+# user from the token claims instead of calling the userinfo endpoint. The
+# realm must map all synced user attributes into the access token.
+OIDC_OFFLINE_VERIFICATION = env.bool("OIDC_OFFLINE_VERIFICATION", default=False)
+OIDC_JWKS_REFRESH_INTERVAL = env.int("OIDC_JWKS_REFRESH_INTERVAL", default=300)
+# Only access tokens issued by the realm for one of these clients (`azp` or
+# `aud`) are accepted offline
+OIDC_OFFLINE_ISSUER = env.str(
+    "OIDC_OFFLINE_ISSUER", default=build_url(KEYCLOAK_URL, "realms", KEYCLOAK_REALM)
+)
+OIDC_OFFLINE_CLIENTS = env.list(
+    "OIDC_OFFLINE_CLIENTS", default=[KEYCLOAK_CLIENT, KEYCLOAK_PORTAL_CLIENT]
+)
+# How long the digest of the last synced claims of a user is remembered
+OIDC_USER_CLAIMS_CACHE_TIMEOUT = env.int("OIDC_USER_CLAIMS_CACHE_TIMEOUT", default=3600)
 REGISTRATION_URL = env.str(
     "DJANGO_REGISTRATION_URL",
     default=build_url(
@@ -2972,6 +2992,10 @@ BE_GIS_POLYGON_SERVICE_CODE = env.str(
 )
 
 GIS_REQUESTS_BATCH_SIZE = env.int("GIS_REQUESTS_BATCH_SIZE", default=4)
+# Number of GIS data sources which are queried in parallel
+GIS_MAX_WORKERS = env.int("GIS_MAX_WORKERS", default=4)
+# Time in seconds the output of a GIS data source is cached per parcel
+GIS_CACHE_TIMEOUT = env.int("GIS_CACHE_TIMEOUT", default=60 * 60)
 
 # GIS API (KT. GR)
 GR_GIS_BASE_URL = env.str("GR_GIS_BASE_URL", default="https://wps.geo.gr.ch")
@@ -3002,6 +3026,30 @@ AG_GIS_BASE_URL = env.str(
 DOCUMENT_MERGE_SERVICE_URL = build_url(
     env.str("DOCUMENT_MERGE_SERVICE_URL", "http://document-merge-service:8000/api/v1/")
 )
+# Timeout (in seconds) for a single request to the document merge service
+DOCUMENT_MERGE_SERVICE_TIMEOUT = env.int("DOCUMENT_MERGE_SERVICE_TIMEOUT", default=120)
+# Number of retries (with exponential backoff) on connection errors and 502-504
+DOCUMENT_MERGE_SERVICE_RETRIES = env.int("DOCUMENT_MERGE_SERVICE_RETRIES", default=3)
+# Maximum number of concurrent requests when merging multiple documents at once
+DOCUMENT_MERGE_SERVICE_MAX_WORKERS = env.int(
+    "DOCUMENT_MERGE_SERVICE_MAX_WORKERS", default=4
+)
+# Maximum number of instances whose PDFs are generated within the request,
+# more need to be generated asynchronously
+DOCUMENT_MERGE_SERVICE_MAX_SYNC_PDFS = env.int(
+    "DOCUMENT_MERGE_SERVICE_MAX_SYNC_PDFS", default=20
+)
+# Maximum number of instances whose PDFs are generated in a single task
+DOCUMENT_MERGE_SERVICE_MAX_ASYNC_PDFS = env.int(
+    "DOCUMENT_MERGE_SERVICE_MAX_ASYNC_PDFS", default=500
+)
+# Client used to authenticate asynchronous PDF generation against the DMS
+DOCUMENT_MERGE_SERVICE_CLIENT_ID = env.str(
+    "DOCUMENT_MERGE_SERVICE_CLIENT_ID", default="document-merge-service"
+)
+DOCUMENT_MERGE_SERVICE_CLIENT_SECRET = env.str(
+    "DOCUMENT_MERGE_SERVICE_CLIENT_SECRET", default=""
+)
 
 ECH_EXCLUDED_WORKFLOWS = ["internal"]
 ECH_EXCLUDED_FORMS = [
@@ -3021,6 +3069,8 @@ ECH_EXCLUDED_FORMS = [
     "benuetzung-oeffentlichem-terrain-meldung",
 ]
 ECH_THROTTLING_RATE = env.str("DJANGO_ECH_THROTTLING_RATE", default="1/min")
+# days after which acknowledged eCH-0211 messages are deleted
+ECH_MESSAGE_RETENTION_DAYS = env.int("DJANGO_ECH_MESSAGE_RETENTION_DAYS", default=90)
 
 # Swagger settings
 SWAGGER_SETTINGS = {
@@ -3191,6 +3241,12 @@ APPEAL = load_module_settings("appeal")
 DISTRIBUTION = load_module_settings("distribution")
 PARASHIFT = load_module_settings("parashift")
 PUBLICATION = load_module_settings("publication")
+# Seconds the public list of published instances is cached. The cache is
+# invalidated whenever a publication changes; the timeout only bounds how
+# long changes of the listed data itself (e.g. the address) take to show up.
+PUBLICATION_CACHE_TIMEOUT = env.int(
+    "DJANGO_PUBLICATION_CACHE_TIMEOUT", default=default(0, 300)
+)
 DECISION = load_module_settings("decision")
 ADDITIONAL_DEMAND = load_module_settings("additional_demand")
 DJANGO_ADMIN = load_module_settings("django_admin")
@@ -3242,3 +3298,12 @@ CELERY_TASK_ACKS_LATE = env.bool(
 CELERY_TASK_SOFT_TIME_LIMIT = env.int("CELERY_TASK_SOFT_TIME_LIMIT", default=60)
 # if unspecified, celery starts one worker process per CPU.
 CELERY_WORKER_CONCURRENCY = env.int("CELERY_WORKER_CONCURRENCY", default=None)
+
+# Outbox for side effects of workflow events, see camac.outbox.api
+OUTBOX_ENABLED = env.bool("OUTBOX_ENABLED", default=True)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=5)
+# Delay in seconds before the first retry, doubled for every further attempt
+OUTBOX_RETRY_DELAY = env.int("OUTBOX_RETRY_DELAY", default=60)
+# Seconds a message is reserved for the worker processing it. Afterwards, the
+# worker is assumed to have crashed and the message is processed again.
+OUTBOX_CLAIM_TIMEOUT = env.int("OUTBOX_CLAIM_TIMEOUT", default=600)
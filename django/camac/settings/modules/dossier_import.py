@@ -12,6 +12,8 @@ DOSSIER_IMPORT = {
         "USER": "service-account-camac-admin",
         "RESOURCE_ID_PATH": "/dossier-import",
         "DELETE_KEYWORD": "<LÖSCHEN>",
+        # number of dossiers imported in parallel
+        "WORKERS": env.int("DJANGO_DOSSIER_IMPORT_WORKERS", default=1),
     },
     "kt_schwyz": {
         "ENABLED": True,
@@ -1,26 +1,185 @@
 import datetime
-from typing import Dict, List, Tuple
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from caluma.caluma_form.models import Answer, Document
+from caluma.caluma_form.models import Answer
 from caluma.caluma_workflow.models import WorkItem
-from django.db.models import Avg, Count, IntegerField, OuterRef, QuerySet, Subquery
+from dateutil.parser import ParserError, parse as dateutil_parse
+from django.db.models import (
+    Avg,
+    Count,
+    IntegerField,
+    Max,
+    OuterRef,
+    QuerySet,
+    Subquery,
+)
 from django.db.models.fields.json import KeyTextTransform
 from django.db.models.functions import Cast
 
-from camac.instance.master_data import MasterData
-from camac.instance.models import Instance
+from camac.instance.models import HistoryEntry, Instance
 
+REJECTION_HISTORY_TITLE = "Dossier zurückgewiesen"
+REQUEST_DATE_QUESTION = "nfd-tabelle-datum-anfrage"
+RESPONSE_DATE_QUESTION = "nfd-tabelle-datum-antwort"
 
-def _get_previously_rejected_instance(instance: Instance):
-    return Instance.objects.filter(
-        case__document=instance.case.document.source,
-        instance_state__name="finished",
-        previous_instance_state__name="rejected",
-    ).first()
 
+def _parse_date(value: Optional[str]) -> Optional[datetime.date]:
+    try:
+        return dateutil_parse(value).date() if value else None
+    except ParserError:  # pragma: no cover
+        return None
+
+
+def _load_submit_dates(instance_ids: Iterable[int]) -> Dict[int, datetime.date]:
+    """Load the (paper) submit date of all given instances from the case meta."""
+    rows = (
+        Instance.objects.filter(pk__in=instance_ids)
+        .annotate(
+            paper_submit_date=KeyTextTransform("paper-submit-date", "case__meta"),
+            submit_date=KeyTextTransform("submit-date", "case__meta"),
+        )
+        .values_list("pk", "paper_submit_date", "submit_date")
+    )
+
+    return {
+        pk: _parse_date(paper_submit_date or submit_date)
+        for pk, paper_submit_date, submit_date in rows
+        if paper_submit_date or submit_date
+    }
+
+
+def _load_decision_dates(
+    instance_ids: Iterable[int],
+) -> Tuple[Dict[int, datetime.date], Dict[int, datetime.date]]:
+    """Load the decision date of all given instances.
+
+    Returns two dicts: The decision date regardless of the state of the
+    decision work item and the decision date of completed decisions only.
+    """
+    answers = (
+        Answer.objects.filter(
+            question_id="decision-date",
+            document__work_item__task_id="decision",
+            document__work_item__case__instance__pk__in=instance_ids,
+        )
+        # the decision date of the newest work item wins
+        .order_by("document__work_item__created_at")
+        .values_list(
+            "document__work_item__case__instance__pk",
+            "date",
+            "document__work_item__status",
+        )
+    )
+
+    decision_dates = {}
+    completed_decision_dates = {}
+    for instance_id, date, work_item_status in answers:
+        decision_dates[instance_id] = date
+        if work_item_status == WorkItem.STATUS_COMPLETED:
+            completed_decision_dates[instance_id] = date
 
-def _get_rejected_instance_cycletime(rejected_instance: Instance) -> int:
+    return decision_dates, completed_decision_dates
+
+
+def _load_waiting_periods(
+    instance_ids: Iterable[int], completed_decision_dates: Dict[int, datetime.date]
+) -> Dict[int, List[Tuple[datetime.date, datetime.date]]]:
+    """
+    Load the waiting periods from the claims of all given instances.
+
+    A claim is an answer document in the answer table `nfd-tabelle`. Claims
+    without request or response date and claims which were answered after
+    the decision are ignored.
+    """
+    answers = Answer.objects.filter(
+        question_id__in=[REQUEST_DATE_QUESTION, RESPONSE_DATE_QUESTION],
+        date__isnull=False,
+        document__form_id="nfd-tabelle",
+        document__family__work_item__task_id="nfd",
+        document__family__work_item__case__instance__pk__in=instance_ids,
+    ).values_list(
+        "document__family__work_item__case__instance__pk",
+        "document_id",
+        "question_id",
+        "date",
+    )
+
+    rows = defaultdict(dict)
+    for instance_id, document_id, question_id, date in answers:
+        rows[(instance_id, document_id)][question_id] = date
+
+    waiting_periods = defaultdict(list)
+    for (instance_id, _), dates in rows.items():
+        request_date = dates.get(REQUEST_DATE_QUESTION)
+        response_date = dates.get(RESPONSE_DATE_QUESTION)
+        decision_date = completed_decision_dates.get(instance_id)
+
+        if request_date is None or response_date is None:
+            continue
+        if decision_date and response_date > decision_date:
+            continue
+
+        waiting_periods[instance_id].append((request_date, response_date))
+
+    return waiting_periods
+
+
+def _load_rejected_instances(instance_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """
+    Load the chain of previously rejected instances of all given instances.
+
+    A resubmitted instance is a copy of the rejected one, so the rejected
+    instance is the one whose root document is the source of the root document
+    of the resubmitted instance. The chains are resolved level by level with
+    one query per level instead of one query per instance.
     """
+    chains = {pk: [] for pk in instance_ids}
+    frontier = {
+        pk: source_id
+        for pk, source_id in Instance.objects.filter(pk__in=instance_ids).values_list(
+            "pk", "case__document__source_id"
+        )
+        if source_id
+    }
+
+    while frontier:
+        rejected = {}
+        for pk, document_id, source_id in (
+            Instance.objects.filter(
+                case__document__in=set(frontier.values()),
+                instance_state__name="finished",
+                previous_instance_state__name="rejected",
+            )
+            # if there are multiple, the one with the lowest ID wins
+            .order_by("-pk")
+            .values_list("pk", "case__document_id", "case__document__source_id")
+        ):
+            rejected[document_id] = (pk, source_id)
+
+        next_frontier = {}
+        for instance_id, document_id in frontier.items():
+            if document_id not in rejected:
+                continue
+
+            pk, source_id = rejected[document_id]
+            if pk in chains[instance_id]:  # pragma: no cover
+                # guard against cyclic sources
+                continue
+
+            chains[instance_id].append(pk)
+            if source_id:
+                next_frontier[instance_id] = source_id
+
+        frontier = next_frontier
+
+    return chains
+
+
+def _load_rejection_dates(instance_ids: Iterable[int]) -> Dict[int, datetime.date]:
+    """
+    Load the date on which the given instances were rejected.
+
     As of now there are two methods to get a previously rejected application's cycle time.
 
      a. from the InstanceLog that would require us to filter a potentially enourmous list of strings formed
@@ -30,152 +189,114 @@ def _get_rejected_instance_cycletime(rejected_instance: Instance) -> int:
      b. from the HistoryEntry that is created on rejection.
        Problems are that we rely on the exact phrasing of an entry's title that is also translated and potentially
        subject to change.
-
-    @param rejected_instance:
-    @return:
     """
-    end_date = (
-        rejected_instance.history.filter(
+    return {
+        instance_id: created_at.date()
+        for instance_id, created_at in HistoryEntry.objects.filter(
+            instance__in=instance_ids,
             # CAVEAT: when changing translation this must be updated to reflect the changes
             trans__language="de",
-            trans__title="Dossier zurückgewiesen",
+            trans__title=REJECTION_HISTORY_TITLE,
         )
-        .order_by("-created_at")
-        .first()
-    )
-    master_data = MasterData(rejected_instance.case)
-    submit_date = master_data.paper_submit_date or master_data.submit_date
-
-    if not submit_date:  # pragma: no cover
-        return 0
-
-    return (end_date or 0) and (end_date.created_at.date() - submit_date.date()).days
+        .values("instance_id")
+        .annotate(rejected_at=Max("created_at"))
+        .values_list("instance_id", "rejected_at")
+    }
 
 
 def _compute_total_idle_days(
-    sorted_durations: List[Tuple[datetime.datetime, datetime.datetime]],
+    durations: List[Tuple[datetime.date, datetime.date]],
 ) -> int:
     """
     Compute total idle days from a set of durations that may encompass and overlap one another.
 
     Overlaps should be counted only once.
 
-    The argument `sorted_durations` is a list of tuples holding a datetime object for the beginning and
-    the end of a duration respectively
+    The argument `durations` is a list of tuples holding a date object for the beginning and
+    the end of a duration respectively. The durations are merged in a single sweep after
+    sorting them by their beginning.
 
     Returns the total idle time in days as an integer
     """
+    total = 0
+    current_start = current_end = None
 
-    merged_ranges = []
-    elim = []
-    for i in range(len(sorted_durations)):
-        if i in elim:
+    for start, end in sorted(durations):
+        if current_end is not None and start < current_end:
+            current_end = max(current_end, end)
             continue
-        start, end = sorted_durations[i]
-        while True:
-            try:
-                next_start, next_end = sorted_durations[i + 1]
-            except IndexError:
-                break
-            if next_start < end:
-                if next_end < end:
-                    elim.append(i + 1)
-                    i += 1
-                else:
-                    end = next_end
-                    i += 1
-                    elim.append(i)
-            else:
-                # apparently this is not explicitly covered anymore but it still
-                # breaks the loop as expected, is this a change in python 3.8?
-                break  # pragma: no cover
-        merged_ranges.append((start, end))
-    return sum(map(lambda duration: (duration[1] - duration[0]).days, merged_ranges))
-
-
-def _retrieve_waiting_periods(
-    instance: Instance,
-) -> List[Tuple[datetime.datetime, datetime.datetime]]:
-    """
-    Retrieve a list of waiting periods from an Instance's claims.
 
-    A claim is an answer document in the answer table `nfd-tabelle`
+        if current_end is not None:
+            total += (current_end - current_start).days
 
-    Returns the list sorted ASC by start time of the duration
-    """
+        current_start, current_end = start, end
 
-    rows = Document.objects.filter(
-        form_id="nfd-tabelle",
-        family__work_item__task_id="nfd",
-        family__work_item__case=instance.case,
-    )
+    if current_end is not None:
+        total += (current_end - current_start).days
 
-    try:
-        decision_date = Answer.objects.get(
-            question_id="decision-date",
-            document__work_item__case__instance=instance,
-            document__work_item__status=WorkItem.STATUS_COMPLETED,
-        ).date
-    except Answer.DoesNotExist:
-        decision_date = None
-
-    results = []
-    for row in rows.iterator():
-        request_answer = row.answers.filter(
-            question_id="nfd-tabelle-datum-anfrage"
-        ).first()
-        response_answer = row.answers.filter(
-            question_id="nfd-tabelle-datum-antwort"
-        ).first()
-        if (request_answer and request_answer.date) is None or (
-            response_answer and response_answer.date
-        ) is None:
-            continue
-        if decision_date and response_answer.date > decision_date:
-            continue
-        results.append((request_answer.date, response_answer.date))
-    return sorted(results, key=lambda pair: pair[0])
+    return total
 
 
-def _get_cycle_time(instance: Instance) -> Tuple[int]:
-    extra_time = _get_rejected_instance_cycletime(instance)
-    # If predating instance has no duration it's pointless to calculate waiting periods
-    if not extra_time:
-        return 0, 0
-    idle_time = _compute_total_idle_days(_retrieve_waiting_periods(instance))
-    return extra_time, idle_time
+def compute_cycle_times(instance_ids: Iterable[int]) -> Dict[int, Dict]:
+    """
+    Compute the cycle times of all given instances at once.
 
+    All data needed (submit and decision dates, claims and previously rejected
+    instances) is loaded in a fixed number of queries per call, independent
+    of the number of instances.
 
-def _rejected_instances(instance) -> List[Instance]:
-    flat_list = []
-    previous_rejected = _get_previously_rejected_instance(instance)
-    while previous_rejected:
-        flat_list.append(previous_rejected)
-        previous_rejected = _get_previously_rejected_instance(previous_rejected)
-    return flat_list
+    Returns a dict with the cycle times per instance ID. Instances without
+    decision or submit date are mapped to an empty dict.
+    """
+    instance_ids = list(instance_ids)
+    chains = _load_rejected_instances(instance_ids)
+    rejected_ids = {pk for chain in chains.values() for pk in chain}
+    all_ids = set(instance_ids) | rejected_ids
+
+    submit_dates = _load_submit_dates(all_ids)
+    decision_dates, completed_decision_dates = _load_decision_dates(all_ids)
+    waiting_periods = _load_waiting_periods(all_ids, completed_decision_dates)
+    rejection_dates = _load_rejection_dates(rejected_ids)
+
+    cycle_times = {}
+    for instance_id in instance_ids:
+        cycle_start = submit_dates.get(instance_id)
+        decision_date = decision_dates.get(instance_id)
+
+        if not decision_date or not cycle_start or cycle_start > decision_date:
+            cycle_times[instance_id] = {}
+            continue
 
+        cumulated_extra_time = (decision_date - cycle_start).days
+        cumulated_idle_time = _compute_total_idle_days(waiting_periods[instance_id])
 
-def compute_cycle_time(instance: Instance) -> Dict:
-    master_data = MasterData(instance.case)
-    cycle_start = master_data.paper_submit_date or master_data.submit_date
-    decision_date = master_data.decision_date
+        for rejected_id in chains[instance_id]:
+            rejected_at = rejection_dates.get(rejected_id)
+            submitted_at = submit_dates.get(rejected_id)
 
-    if not decision_date or not cycle_start or cycle_start.date() > decision_date:
-        return {}
+            # If predating instance has no duration it's pointless to calculate waiting periods
+            if not rejected_at or not submitted_at:
+                continue
 
-    cumulated_extra_time = (decision_date - cycle_start.date()).days
+            extra_time = (rejected_at - submitted_at).days
+            if not extra_time:
+                continue
 
-    cumulated_idle_time = _compute_total_idle_days(_retrieve_waiting_periods(instance))
+            cumulated_extra_time += extra_time
+            cumulated_idle_time += _compute_total_idle_days(
+                waiting_periods[rejected_id]
+            )
 
-    for inst in _rejected_instances(instance):
-        extra_time, idle_time = _get_cycle_time(inst)
-        cumulated_extra_time += extra_time
-        cumulated_idle_time += idle_time
+        cycle_times[instance_id] = {
+            "total-cycle-time": cumulated_extra_time,
+            "net-cycle-time": cumulated_extra_time - cumulated_idle_time,
+        }
 
-    return {
-        "total-cycle-time": cumulated_extra_time,
-        "net-cycle-time": cumulated_extra_time - cumulated_idle_time,
-    }
+    return cycle_times
+
+
+def compute_cycle_time(instance: Instance) -> Dict:
+    return compute_cycle_times([instance.pk])[instance.pk]
 
 
 def aggregate_cycle_times(instances: QuerySet) -> Dict:
@@ -1,10 +1,9 @@
-from caluma.caluma_workflow.models import WorkItem
+from caluma.caluma_workflow.models import Case, WorkItem
 from django.core.management.base import BaseCommand
 from django.db.models import Exists, OuterRef
 
-from camac.instance.master_data import MasterData
 from camac.instance.models import Instance
-from camac.stats.cycle_time import compute_cycle_time
+from camac.stats.cycle_time import compute_cycle_times
 
 
 class Command(BaseCommand):
@@ -22,6 +21,13 @@ class Command(BaseCommand):
             action="store_true",
             dest="dry_run",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            dest="batch_size",
+            help="Number of instances to compute and update at once",
+        )
         parser.add_argument("instance", nargs="*", type=int)
 
     def handle(self, *args, **options):
@@ -43,19 +49,29 @@ class Command(BaseCommand):
         if options.get("no_recompute"):
             instances = instances.exclude(case__meta__has_key="total-cycle-time")
 
+        instance_ids = list(instances.order_by("pk").values_list("pk", flat=True))
+        total = len(instance_ids)
+        batch_size = options["batch_size"]
+
         success = 0
         self.stdout.write(
-            f"Starting update of instances' cycle time. {instances.count()} to process...\n"
+            f"Starting update of instances' cycle time. {total} to process...\n"
         )
-        for num, instance in enumerate(instances.iterator(), start=1):
-            md = MasterData(instance.case)
-            if not md.decision_date:
-                continue
-            cycle_time_dict = compute_cycle_time(instance)
-            instance.case.meta.update(cycle_time_dict)
+        for offset in range(0, total, batch_size):
+            batch = instance_ids[offset : offset + batch_size]
+            cycle_times = compute_cycle_times(batch)
+
+            cases = []
+            for instance in Instance.objects.filter(
+                pk__in=[pk for pk, cycle_time in cycle_times.items() if cycle_time]
+            ).select_related("case"):
+                instance.case.meta.update(cycle_times[instance.pk])
+                cases.append(instance.case)
+
             if not options.get("dry_run"):
-                instance.case.save()
-            success += 1
-            if num % 100 == 0:
-                self.stdout.write(f"[{num}/{instances.count()}]")
+                Case.objects.bulk_update(cases, ["meta"])
+
+            success += len(cases)
+            self.stdout.write(f"[{min(offset + batch_size, total)}/{total}]")
+
         self.stdout.write(f"Updated {success} instances' cycle times. Done.")
@@ -1,11 +1,18 @@
 import datetime
+from io import StringIO
 
 import pytest
 from caluma.caluma_core.events import send_event
 from caluma.caluma_workflow.events import post_complete_work_item
+from django.core.management import call_command
 
+from camac.instance.models import Instance
 from camac.instance.serializers import SUBMIT_DATE_FORMAT
-from camac.stats.cycle_time import _compute_total_idle_days, compute_cycle_time
+from camac.stats.cycle_time import (
+    _compute_total_idle_days,
+    compute_cycle_time,
+    compute_cycle_times,
+)
 
 
 @pytest.mark.parametrize("case_cycle_time", [45])
@@ -87,6 +94,8 @@ def test_overlapping_nfd_durations(
 )
 def test_compute_total_idle_days(sorted_durations, expected):
     assert _compute_total_idle_days(sorted_durations) == expected
+    assert _compute_total_idle_days(list(reversed(sorted_durations))) == expected
+    assert _compute_total_idle_days([]) == 0
 
 
 @pytest.mark.parametrize(
@@ -133,6 +142,43 @@ def test_total_cycle_time_with_previously_rejected(
     )
 
 
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_calculate_cycle_times_command(
+    db,
+    be_instance,
+    nest_rejected_applications,
+    decision_factory,
+    be_decision_settings,
+    django_assert_max_num_queries,
+    dry_run,
+):
+    decision_factory(
+        decision=be_decision_settings["ANSWERS"]["DECISION"]["APPROVED"],
+        decision_type=be_decision_settings["ANSWERS"]["APPROVAL_TYPE"][
+            "BUILDING_PERMIT_FREE"
+        ],
+        decision_date=be_instance.creation_date.date() + datetime.timedelta(days=15),
+    )
+    nest_rejected_applications(be_instance, [5, 4, 3])
+
+    # the number of queries depends on the depth of the rejection chain, not
+    # on the number of instances
+    with django_assert_max_num_queries(9):
+        cycle_times = compute_cycle_times(Instance.objects.values_list("pk", flat=True))
+
+    assert cycle_times[be_instance.pk] == {
+        "total-cycle-time": 27,
+        "net-cycle-time": 27,
+    }
+
+    call_command(
+        "calculate_cycle_times", *(["--dry-run"] if dry_run else []), stdout=StringIO()
+    )
+
+    be_instance.case.refresh_from_db()
+    assert be_instance.case.meta.get("total-cycle-time") == (None if dry_run else 27)
+
+
 @pytest.mark.parametrize("instance_state__name", ["finished"])
 @pytest.mark.parametrize("case_cycle_time", [5])
 def test_decision_completion_computes_cycle_time(
@@ -166,6 +166,11 @@ def test_callback(
         assert results == ["204 No Content"] * 5
         assert attachment.version_history.count() == 4
 
+    # Identical content is only stored once
+    assert models.AttachmentBlob.objects.count() == 2
+    for version in models.AttachmentVersion.objects.all():
+        assert Path(version.path.path).samefile(version.blob.path)
+
     # Get version via API
     url = reverse("attachmentversion-list")
     response = admin_client.get(url)
@@ -0,0 +1,78 @@
+import codecs
+import io
+from datetime import date, datetime
+
+import openpyxl
+import pytest
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from camac.export import (
+    StreamingExportResponse,
+    generate_csv,
+    generate_xlsx,
+    get_file_format,
+    iterate_chunks,
+)
+
+ROWS = [
+    ["ID", "Name", "Paper", "Date"],
+    [1, "Muster & <Sohn>\x0b", True, date(2023, 4, 1)],
+    [2, None, False, datetime(2023, 4, 1, 12, 30)],
+]
+
+
+def test_generate_xlsx():
+    chunks = list(generate_xlsx(iter(ROWS), sheet_name="Export"))
+
+    workbook = openpyxl.load_workbook(io.BytesIO(b"".join(chunks)))
+    rows = list(workbook["Export"].values)
+
+    assert rows == [
+        ("ID", "Name", "Paper", "Date"),
+        (1, "Muster & <Sohn>", True, datetime(2023, 4, 1)),
+        (2, None, False, datetime(2023, 4, 1, 12, 30)),
+    ]
+
+
+def test_generate_csv():
+    content = b"".join(generate_csv(iter(ROWS)))
+
+    assert content.startswith(codecs.BOM_UTF8)
+    assert content.decode("utf-8-sig").split("\r\n")[:-1] == [
+        "ID,Name,Paper,Date",
+        "1,Muster & <Sohn>\x0b,True,2023-04-01",
+        "2,,False,2023-04-01 12:30:00",
+    ]
+
+
+@pytest.mark.parametrize(
+    "params,expected",
+    [({}, "xlsx"), ({"file-format": "csv"}, "csv"), ({"file-format": "pdf"}, None)],
+)
+def test_get_file_format(params, expected):
+    request = Request(APIRequestFactory().get("/", params))
+
+    if expected:
+        assert get_file_format(request) == expected
+    else:
+        with pytest.raises(ValidationError):
+            get_file_format(request)
+
+
+def test_streaming_export_response():
+    response = StreamingExportResponse(iter(ROWS), filename="list", file_format="csv")
+
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert response["Content-Disposition"] == 'attachment; filename="list.csv"'
+    assert b"".join(response.streaming_content).count(b"\r\n") == len(ROWS)
+
+
+def test_iterate_chunks(db, instance_factory):
+    instance_factory.create_batch(5)
+
+    chunks = list(iterate_chunks(instance_factory._meta.model.objects.all(), 2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
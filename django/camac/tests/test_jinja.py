@@ -1,6 +1,6 @@
 import pytest
 
-from ..jinja import dateformat, getwithdefault
+from ..jinja import dateformat, get_placeholders, get_template, getwithdefault
 
 
 @pytest.mark.parametrize("inp,expected", [("2019-12-31", "31.12.2019"), (None, "")])
@@ -16,3 +16,19 @@ def test_dateformat(inp, expected):
 def test_getwithdefault(inp, default, expected):
     formatted = getwithdefault(inp, default=default)
     assert formatted == expected
+
+
+def test_get_template():
+    source = "Hallo {{ name }}"
+
+    assert get_template(source) is get_template(source)
+    assert get_template(source).render(name="Welt") == "Hallo Welt"
+    # modified templates are compiled anew
+    assert get_template(source + "!").render(name="Welt") == "Hallo Welt!"
+
+
+def test_get_placeholders():
+    source = "{{ DOSSIER_NR }} {% for a in activations %}{{ a.service }}{% endfor %}"
+
+    assert get_placeholders(source) == {"dossier_nr", "activations"}
+    assert get_placeholders(source) is get_placeholders(source)
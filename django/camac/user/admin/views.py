@@ -29,6 +29,7 @@ from camac.user.models import (
     User,
     UserGroup,
 )
+from camac.user.utils import group_cache
 
 
 def save_user_group_formset(request, formset):
@@ -127,10 +128,12 @@ class GroupAdmin(EbauAdminMixin, MultilingualAdminMixin, ModelAdmin):
     @action(description=_("Disable selected groups"))
     def disable(self, request, queryset):
         queryset.update(disabled=1)
+        transaction.on_commit(group_cache.clear)
 
     @action(description=_("Enable selected groups"))
     def enable(self, request, queryset):
         queryset.update(disabled=0)
+        transaction.on_commit(group_cache.clear)
 
 
 @register(Service)
@@ -175,22 +178,26 @@ class ServiceAdmin(EbauAdminMixin, MultilingualAdminMixin, ModelAdmin):
     def disable(self, request, queryset):
         queryset.update(disabled=1)
         Group.objects.filter(service__in=queryset).update(disabled=1)
+        transaction.on_commit(group_cache.clear)
 
     @action(description=_("Enable selected services"))
     @transaction.atomic
     def enable(self, request, queryset):
         queryset.update(disabled=0)
         Group.objects.filter(service__in=queryset).update(disabled=0)
+        transaction.on_commit(group_cache.clear)
 
     @action(description=_("Disable notifications for selected services"))
     @transaction.atomic
     def disable_notifications(self, request, queryset):
         queryset.update(notification=0)
+        transaction.on_commit(group_cache.clear)
 
     @action(description=_("Enable notifications for selected services"))
     @transaction.atomic
     def enable_notifications(self, request, queryset):
         queryset.update(notification=1)
+        transaction.on_commit(group_cache.clear)
 
     def save_model(self, request, obj, form, change):
         is_new = obj.pk is None
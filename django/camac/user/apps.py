@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class DefaultConfig(AppConfig):
     name = "camac.user"
     verbose_name = _("User management")
+
+    def ready(self):
+        import camac.user.signals  # noqa
@@ -1,6 +1,9 @@
 import functools
 import hashlib
+import json
 import logging
+import threading
+from time import monotonic
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -12,7 +15,8 @@ from django.utils import translation
 from django.utils.encoding import force_bytes, smart_str
 from django.utils.translation import gettext as _
 from jwcrypto.common import JWException
-from jwcrypto.jwt import JWTExpired
+from jwcrypto.jwk import JWKSet
+from jwcrypto.jwt import JWTExpired, JWTMissingKey
 from keycloak import KeycloakOpenID
 from keycloak.exceptions import KeycloakAuthenticationError, KeycloakGetError
 from mozilla_django_oidc.auth import OIDCAuthenticationBackend
@@ -29,6 +33,43 @@ from camac.utils import clean_join
 request_logger = logging.getLogger("django.request")
 
 
+class JWKSCache:
+    """Process wide cache of the public keys (JWKS) of the Keycloak realm.
+
+    The keys are refreshed after `OIDC_JWKS_REFRESH_INTERVAL` seconds or
+    when a token is signed with an unknown key (key rotation), but at most
+    once every `MIN_REFRESH_INTERVAL` seconds.
+    """
+
+    MIN_REFRESH_INTERVAL = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = None
+        self._fetched_at = None
+
+    def get(self, keycloak, force_refresh=False):
+        with self._lock:
+            age = monotonic() - self._fetched_at if self._keys else None
+
+            if (
+                age is None
+                or age > settings.OIDC_JWKS_REFRESH_INTERVAL
+                or (force_refresh and age > self.MIN_REFRESH_INTERVAL)
+            ):
+                self._keys = JWKSet.from_json(json.dumps(keycloak.certs()))
+                self._fetched_at = monotonic()
+
+            return self._keys
+
+    def clear(self):
+        with self._lock:
+            self._keys = None
+
+
+jwks_cache = JWKSCache()
+
+
 class JSONWebTokenKeycloakAuthentication(BaseAuthentication):
     def __init__(self):
         self.keycloak = KeycloakOpenID(
@@ -75,6 +116,9 @@ class JSONWebTokenKeycloakAuthentication(BaseAuthentication):
         )
 
     def _verify_token(self, jwt_value, accept_language_header):  # noqa: C901
+        if settings.OIDC_OFFLINE_VERIFICATION:
+            return self._verify_token_offline(jwt_value, accept_language_header)
+
         try:
             jwt_decoded = self.keycloak.decode_token(
                 jwt_value.decode(), check_claims={"exp": None}
@@ -99,6 +143,89 @@ class JSONWebTokenKeycloakAuthentication(BaseAuthentication):
         # TODO: don't use jwt token at all, once Middleware is refactored
         return self._build_user(resp, accept_language_header), jwt_decoded
 
+    def _decode_token_offline(self, token):
+        check_claims = {
+            "exp": None,
+            "typ": "Bearer",
+            "iss": settings.OIDC_OFFLINE_ISSUER,
+        }
+
+        try:
+            return self.keycloak.decode_token(
+                token, key=jwks_cache.get(self.keycloak), check_claims=check_claims
+            )
+        except JWTMissingKey:
+            # the realm keys might have been rotated since the last refresh
+            return self.keycloak.decode_token(
+                token,
+                key=jwks_cache.get(self.keycloak, force_refresh=True),
+                check_claims=check_claims,
+            )
+
+    def _is_allowed_client(self, claims):
+        audience = claims.get("aud") or []
+        if isinstance(audience, str):
+            audience = [audience]
+
+        clients = set(settings.OIDC_OFFLINE_CLIENTS)
+
+        return claims.get("azp") in clients or bool(clients.intersection(audience))
+
+    def _verify_token_offline(self, jwt_value, accept_language_header):
+        try:
+            jwt_decoded = self._decode_token_offline(jwt_value.decode())
+        except JWTExpired:
+            raise AuthenticationFailed(_("Signature has expired."))
+        except JWException:
+            raise AuthenticationFailed(_("Invalid token."))
+
+        if not self._is_allowed_client(jwt_decoded):
+            raise AuthenticationFailed(_("Invalid token."))
+
+        return self._get_user_from_claims(jwt_decoded, accept_language_header), (
+            jwt_decoded
+        )
+
+    def _get_user_from_claims(self, claims, accept_language_header):
+        """Get the user of the claims, only sync it if the claims changed.
+
+        The digest of the synced values is remembered per user. As long as it
+        matches, the user is only fetched instead of updated.
+        """
+        defaults = self._get_user_defaults(claims)
+        digest = hashlib.sha256(
+            force_bytes(
+                json.dumps(
+                    [defaults, bool(accept_language_header)],
+                    sort_keys=True,
+                    default=str,
+                )
+            )
+        ).hexdigest()
+        cache_key = "authentication.claims.%s" % (
+            hashlib.sha1(force_bytes(claims[settings.OIDC_USERNAME_CLAIM])).hexdigest()
+        )
+
+        cached = cache.get(cache_key)
+        if cached and cached[0] == digest:
+            user = get_user_model().objects.filter(pk=cached[1]).first()
+
+            if user:
+                if not user.is_active:
+                    raise AuthenticationFailed(_("User is deactivated."))
+
+                self._update_applicants(user)
+                return user
+
+        user = self._build_user(claims, accept_language_header)
+        cache.set(
+            cache_key,
+            (digest, user.pk),
+            timeout=settings.OIDC_USER_CLAIMS_CACHE_TIMEOUT,
+        )
+
+        return user
+
     def _update_or_create_user(self, defaults, accept_language_header):
         user_model = get_user_model()
         filter_condition = Q(username=defaults["username"])
@@ -111,7 +238,7 @@ class JSONWebTokenKeycloakAuthentication(BaseAuthentication):
             defaults["language"] = existing_users[0].language
         return existing_users.update_or_create(defaults=defaults)
 
-    def _build_user(self, data, accept_language_header):
+    def _get_user_defaults(self, data):
         language = translation.get_language()
 
         # Different customers use different claims as their username
@@ -152,11 +279,14 @@ class JSONWebTokenKeycloakAuthentication(BaseAuthentication):
         if username.startswith("service-account-") and not data.get("email"):
             all_defaults["email"] = f"{username}@placeholder.org"
 
-        defaults = {
+        return {
             key: all_defaults[key]
             for key in settings.APPLICATION.get("OIDC_SYNC_USER_ATTRIBUTES")
         }
 
+    def _build_user(self, data, accept_language_header):
+        defaults = self._get_user_defaults(data)
+
         user, created = self._update_or_create_user(defaults, accept_language_header)
 
         self._update_applicants(user)
@@ -0,0 +1,47 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from camac.user.authentication import JSONWebTokenKeycloakAuthentication, jwks_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the authentication overhead of a (not yet cached) token with "
+        "userinfo verification vs. offline verification"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("token", type=str, help="Valid access token")
+        parser.add_argument(
+            "--runs", type=int, default=20, help="Number of runs per measurement"
+        )
+
+    def handle(self, *args, **options):
+        token = options["token"].encode()
+        jwks_cache.clear()
+
+        for mode, offline in [("userinfo", False), ("offline", True)]:
+            timings = []
+            queries = []
+
+            with override_settings(OIDC_OFFLINE_VERIFICATION=offline):
+                authentication = JSONWebTokenKeycloakAuthentication()
+
+                for _ in range(options["runs"]):
+                    with CaptureQueriesContext(connection) as context:
+                        start = perf_counter()
+                        # bypass the token cache to measure a new token
+                        authentication._verify_token(token, None)
+                        timings.append(perf_counter() - start)
+
+                    queries.append(len(context.captured_queries))
+
+            self.stdout.write(
+                f"{mode:<10} median {median(timings) * 1000:8.1f} ms, "
+                f"max {max(timings) * 1000:8.1f} ms, "
+                f"median {median(queries):4.0f} queries"
+            )
@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
 from camac.user.models import Group
+from camac.user.utils import group_cache
 
 
 class Command(BaseCommand):
@@ -13,3 +15,4 @@ class Command(BaseCommand):
                 9,  # Publikation
             ]
         ).update(disabled=1)
+        transaction.on_commit(group_cache.clear)
@@ -1,7 +1,11 @@
+import logging
+
 from django.utils.functional import SimpleLazyObject
 
 from camac.user.utils import get_group
 
+request_logger = logging.getLogger("django.request")
+
 
 class GroupMiddleware(object):
     """Middleware to determine current group."""
@@ -10,7 +14,16 @@ class GroupMiddleware(object):
         self.get_response = get_response
 
     def __call__(self, request):
+        # shared with copies of the request (e.g. `CamacRequest`)
+        request.identity_stats = {"group_resolutions": 0}
         request.group = SimpleLazyObject(lambda: get_group(request))
 
         response = self.get_response(request)
+
+        request_logger.debug(
+            "path=%s group_resolutions=%s",
+            request.path,
+            request.identity_stats["group_resolutions"],
+        )
+
         return response
@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Group, Role, Service, ServiceGroup, UserGroup
+from .utils import group_cache
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_save, sender=Role)
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=ServiceGroup)
+@receiver(post_save, sender=UserGroup)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Role)
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=ServiceGroup)
+@receiver(post_delete, sender=UserGroup)
+def clear_group_cache(sender, **kwargs):
+    if not kwargs.get("raw"):
+        transaction.on_commit(group_cache.clear)
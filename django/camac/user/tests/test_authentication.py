@@ -1,6 +1,8 @@
 import json
+import time
 
 import pytest
+from jwcrypto import jwk, jwt
 from jwcrypto.common import JWException
 from jwcrypto.jwt import JWTExpired
 from mozilla_django_oidc.contrib.drf import OIDCAuthentication
@@ -8,7 +10,11 @@ from rest_framework import exceptions, status
 from rest_framework.exceptions import AuthenticationFailed
 
 from camac.applicants.models import Applicant
-from camac.user.authentication import JSONWebTokenKeycloakAuthentication
+from camac.user.authentication import (
+    JSONWebTokenKeycloakAuthentication,
+    JWKSCache,
+    jwks_cache,
+)
 
 
 def test_authenticate_no_headers(rf):
@@ -323,3 +329,119 @@ def test_authenticate_token_exchange_company_name(rf, mocker, settings, clear_ca
     user, _ = JSONWebTokenKeycloakAuthentication().authenticate(request)
 
     assert user.get_full_name() == "Acme Inc."
+
+
+def test_authenticate_offline(rf, admin_user, mocker, clear_cache, settings):
+    settings.OIDC_OFFLINE_VERIFICATION = True
+    jwks_cache.clear()
+    mocker.patch.object(JWKSCache, "MIN_REFRESH_INTERVAL", -1)
+
+    keys = jwk.JWKSet()
+    certs = mocker.patch("keycloak.KeycloakOpenID.certs")
+    certs.side_effect = lambda: json.loads(keys.export(private_keys=False))
+    userinfo = mocker.patch("keycloak.KeycloakOpenID.userinfo")
+    update_or_create_user = mocker.spy(
+        JSONWebTokenKeycloakAuthentication, "_update_or_create_user"
+    )
+
+    def authenticate(key, **claims):
+        token = jwt.JWT(
+            header={"alg": "RS256", "kid": key.key_id},
+            claims={
+                "sub": admin_user.username,
+                "email": admin_user.email,
+                "family_name": admin_user.surname,
+                "given_name": admin_user.name,
+                settings.OIDC_USERNAME_CLAIM: admin_user.username,
+                "exp": int(time.time()) + 60,
+                "typ": "Bearer",
+                "iss": settings.OIDC_OFFLINE_ISSUER,
+                "azp": settings.KEYCLOAK_CLIENT,
+                **claims,
+            },
+        )
+        token.make_signed_token(key)
+        request = rf.request(HTTP_AUTHORIZATION=f"Bearer {token.serialize()}")
+        return JSONWebTokenKeycloakAuthentication().authenticate(request)
+
+    key = jwk.JWK.generate(kty="RSA", size=2048, kid="first")
+    keys.add(key)
+
+    user, token = authenticate(key, jti="1")
+    assert user == admin_user
+    assert token["jti"] == "1"
+    assert update_or_create_user.call_count == 1
+
+    # unchanged claims don't update the user
+    assert authenticate(key, jti="2")[0] == admin_user
+    assert update_or_create_user.call_count == 1
+
+    authenticate(key, jti="3", email="changed@example.com")
+    assert update_or_create_user.call_count == 2
+    admin_user.refresh_from_db()
+    assert admin_user.email == "changed@example.com"
+
+    # rotated keys are fetched on demand
+    rotated_key = jwk.JWK.generate(kty="RSA", size=2048, kid="second")
+    keys.add(rotated_key)
+    assert authenticate(rotated_key, jti="4")[0] == admin_user
+    assert certs.call_count == 2
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(jwk.JWK.generate(kty="RSA", size=2048, kid="first"), jti="5")
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(key, jti="6", exp=int(time.time()) - 60)
+
+    # tokens for other clients are accepted if they are meant for us
+    user, token = authenticate(
+        key, jti="7", azp="other-client", aud=["account", settings.KEYCLOAK_CLIENT]
+    )
+    assert user == admin_user
+
+    assert not userinfo.called
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        # ID or refresh token
+        {"typ": "ID"},
+        {"typ": "Refresh"},
+        # token of another realm (signed with the same key)
+        {"iss": "http://ebau-keycloak.local/auth/realms/other"},
+        # token issued for another client of the realm
+        {"azp": "other-client"},
+        {"azp": "other-client", "aud": "account"},
+    ],
+)
+def test_authenticate_offline_invalid_claims(
+    rf, admin_user, mocker, clear_cache, settings, claims
+):
+    settings.OIDC_OFFLINE_VERIFICATION = True
+    jwks_cache.clear()
+
+    key = jwk.JWK.generate(kty="RSA", size=2048, kid="first")
+    keys = jwk.JWKSet()
+    keys.add(key)
+    mocker.patch(
+        "keycloak.KeycloakOpenID.certs",
+        return_value=json.loads(keys.export(private_keys=False)),
+    )
+
+    token = jwt.JWT(
+        header={"alg": "RS256", "kid": key.key_id},
+        claims={
+            settings.OIDC_USERNAME_CLAIM: admin_user.username,
+            "exp": int(time.time()) + 60,
+            "typ": "Bearer",
+            "iss": settings.OIDC_OFFLINE_ISSUER,
+            "azp": settings.KEYCLOAK_CLIENT,
+            **claims,
+        },
+    )
+    token.make_signed_token(key)
+    request = rf.request(HTTP_AUTHORIZATION=f"Bearer {token.serialize()}")
+
+    with pytest.raises(AuthenticationFailed):
+        JSONWebTokenKeycloakAuthentication().authenticate(request)
@@ -3,6 +3,8 @@ from django.urls import reverse
 from pytest_lazy_fixtures import lf
 from rest_framework import status
 
+from camac.user.utils import get_group, group_cache
+
 
 def test_group_list(admin_client, group, group_factory, service_factory):
     service_parent = service_factory()
@@ -153,3 +155,27 @@ def test_group_set_default(admin_client, admin_user, group_factory, user_group_f
 
     new_default.refresh_from_db()
     assert new_default.default_group
+
+
+def test_group_set_default_cache(
+    rf, admin_client, admin_user, group, group_factory, user_group_factory, settings
+):
+    settings.GROUP_CACHE_TIMEOUT = 60
+    group_cache.clear()
+    new_group = group_factory()
+    user_group_factory(user=admin_user, group=new_group, default_group=0)
+
+    request = rf.request()
+    request.user = admin_user
+    request.auth = None
+    assert get_group(request) == group
+
+    response = admin_client.post(
+        reverse("publicgroup-set-default", args=[new_group.pk])
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    # the bulk update doesn't send signals but clears the cache as well
+    assert get_group(request) == new_group
+
+    group_cache.clear()
@@ -1,4 +1,5 @@
 from camac.user import middleware
+from camac.user.utils import group_cache
 
 
 def test_get_group_default(rf, application_settings, admin_user, group, group_factory):
@@ -52,3 +53,80 @@ def test_get_group_header(rf, admin_user, user_group_factory):
 
     group = middleware.get_group(request)
     assert group == new_group
+
+
+def test_get_group_cache(
+    rf,
+    admin_user,
+    group,
+    user_group_factory,
+    role_factory,
+    settings,
+    django_assert_num_queries,
+):
+    settings.GROUP_CACHE_TIMEOUT = 60
+    group_cache.clear()
+    other_group = user_group_factory(user=admin_user).group
+
+    request = rf.request()
+    request.user = admin_user
+    request.auth = None
+
+    with django_assert_num_queries(1):
+        assert middleware.get_group(request) == group
+
+    with django_assert_num_queries(0):
+        assert middleware.get_group(request) == group
+
+    with django_assert_num_queries(1):
+        request = rf.get("/", HTTP_X_CAMAC_GROUP=other_group.pk)
+        request.user = admin_user
+        assert middleware.get_group(request) == other_group
+
+    with django_assert_num_queries(0):
+        assert middleware.get_group(request) == other_group
+
+    # groups the user isn't a member of are never returned, which is cached
+    request = rf.get("/", HTTP_X_CAMAC_GROUP=0)
+    request.user = admin_user
+    with django_assert_num_queries(1):
+        assert middleware.get_group(request) is None
+
+    with django_assert_num_queries(0):
+        assert middleware.get_group(request) is None
+
+    # every lookup gets its own instance
+    request = rf.get("/", HTTP_X_CAMAC_GROUP=other_group.pk)
+    request.user = admin_user
+    cached = middleware.get_group(request)
+    cached.name = "changed"
+    assert middleware.get_group(request).name != "changed"
+
+    # removed memberships take effect immediately
+    admin_user.user_groups.filter(group=other_group).delete()
+    with django_assert_num_queries(1):
+        assert middleware.get_group(request) is None
+
+    # so do changes of the group
+    group.role = role_factory()
+    group.save()
+    request = rf.request()
+    request.user = admin_user
+    request.auth = None
+    assert middleware.get_group(request).role == group.role
+
+    group_cache.clear()
+
+
+def test_group_middleware_stats(rf, admin_user, group):
+    def get_response(request):
+        assert request.group == group
+        assert request.group.role
+        return "response"
+
+    request = rf.request()
+    request.user = admin_user
+    request.auth = None
+
+    assert middleware.GroupMiddleware(get_response)(request) == "response"
+    assert request.identity_stats == {"group_resolutions": 1}
@@ -1,11 +1,14 @@
+import hashlib
 import logging
 from functools import reduce
+from uuid import uuid4
 
 from caluma.caluma_form.models import Answer, Question
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
 from django.db.models import Q
+from django.utils.encoding import force_bytes
 
 from camac.instance.validators import FormDataValidator
 from camac.user.models import Role
@@ -31,6 +34,45 @@ def unpack_service_emails(queryset):
         yield from emails.split(",")
 
 
+class GroupCache:
+    """Cache of the groups resolved for users.
+
+    The groups are cached with their role and service in the Django cache, so
+    every lookup returns its own instances. The keys contain a version which
+    is changed whenever a group, role, service or membership is saved or
+    deleted (see `camac.user.signals`) and must be cleared explicitly on bulk
+    updates which don't send signals. Entries expire after
+    `GROUP_CACHE_TIMEOUT` seconds, a timeout of 0 disables the cache.
+    """
+
+    VERSION_KEY = "group-cache-version"
+    # stored instead of `None` which some backends can't tell from a miss
+    NO_GROUP = "no-group"
+
+    def get_or_set(self, key, load):
+        timeout = settings.GROUP_CACHE_TIMEOUT
+        if not timeout:
+            return load()
+
+        version = cache.get_or_set(self.VERSION_KEY, lambda: uuid4().hex, None)
+        # the key contains the requested group which may be any string
+        key_hash = hashlib.sha1(force_bytes(":".join(map(str, key)))).hexdigest()
+
+        group = cache.get_or_set(
+            f"group-cache.{version}.{key_hash}",
+            lambda: load() or self.NO_GROUP,
+            timeout,
+        )
+
+        return None if group == self.NO_GROUP else group
+
+    def clear(self):
+        cache.set(self.VERSION_KEY, uuid4().hex, None)
+
+
+group_cache = GroupCache()
+
+
 def get_group(request):
     """
     Get group based on request.
@@ -41,34 +83,52 @@ def get_group(request):
     3. request header `X-CAMAC-GROUP`
     4. default group of client using `aud` claim
     5. user's default group
+
+    Every resolution is counted in `request.identity_stats` (set by the
+    `GroupMiddleware`) to detect code paths resolving the group repeatedly.
     """
 
     user = getattr(request, "user", None)
     if user is None or isinstance(user, AnonymousUser) or is_public_access(request):
         return None
 
+    stats = getattr(request, "identity_stats", None)
+    if stats is not None:
+        stats["group_resolutions"] += 1
+
     group_id = request.GET.get("group", request.META.get("HTTP_X_CAMAC_GROUP"))
 
     if group_id:
-        group = (
-            request.user.groups.filter(pk=group_id)
-            .select_related("role", "service")
-            .first()
+        group = group_cache.get_or_set(
+            ("group", user.pk, str(group_id)),
+            lambda: request.user.groups.filter(pk=group_id)
+            .select_related("role", "service", "service__service_group")
+            .first(),
         )
     else:
         group = _get_group_for_portal(request)
 
         # fallback, default group of user
         if group is None:
-            group_qs = models.UserGroup.objects.filter(user=user, default_group=1)
-            group_qs = group_qs.select_related("group", "group__role", "group__service")
-            user_group = group_qs.first()
-            group = user_group and user_group.group
+            group = group_cache.get_or_set(
+                ("default-group", user.pk), lambda: _get_default_group(user)
+            )
+
+    if request_logger.isEnabledFor(logging.DEBUG):
+        request_logger.debug(f"group: {group and group.get_name()}")
 
-    request_logger.debug(f"group: {group and group.get_name()}")
     return group
 
 
+def _get_default_group(user):
+    group_qs = models.UserGroup.objects.filter(user=user, default_group=1)
+    group_qs = group_qs.select_related(
+        "group", "group__role", "group__service", "group__service__service_group"
+    )
+    user_group = group_qs.first()
+    return user_group and user_group.group
+
+
 def is_portal_client(request):
     if not getattr(request, "auth"):
         return False
@@ -96,8 +156,11 @@ def _get_group_for_portal(request):
     ):
         return None
 
-    return models.Group.objects.select_related("role", "service").get(
-        pk=settings.APPLICATION["PORTAL_GROUP"]
+    return group_cache.get_or_set(
+        ("portal-group", settings.APPLICATION["PORTAL_GROUP"]),
+        lambda: models.Group.objects.select_related(
+            "role", "service", "service__service_group"
+        ).get(pk=settings.APPLICATION["PORTAL_GROUP"]),
     )
 
 
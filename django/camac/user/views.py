@@ -28,6 +28,7 @@ from camac.token_exchange.permissions import RequireLoT
 from camac.user.permissions import permission_aware
 
 from . import filters, models, serializers
+from .utils import group_cache
 
 
 class LocationView(MultilangMixin, ReadOnlyModelViewSet):
@@ -263,6 +264,7 @@ class PublicGroupView(MultilangMixin, ReadOnlyModelViewSet):
 
         user_groups.filter(default_group=1).update(default_group=0)
         user_groups.filter(group=self.get_object()).update(default_group=1)
+        transaction.on_commit(group_cache.clear)
 
         return response.Response(status=status.HTTP_204_NO_CONTENT)
 